@@ -1,13 +1,11 @@
 // Import manifest loader for dataset access
-import { fetchDataset, getDatasetUrl } from './manifest_loader.js';
+import { fetchBundled, fetchSeasonShards, getDatasetUrl } from './manifest_loader.js';
 
 // Games back line chart
 
 async function fetchData() {
   try {
-    const response = await d3.json(
-      await getDatasetUrl('standings_1958_present_optimized')
-    );
+    const response = await fetchBundled('standings_1958_present_optimized');
     // Group data by year, converting the year to a string for consistency
     const groupedByYear = d3.group(response, (d) => d.year.toString());
     renderChart(groupedByYear);
@@ -231,7 +229,7 @@ fetchData();
 
 async function fetchGameData() {
   try {
-    const response = await d3.json(await getDatasetUrl('wins_losses_current'));
+    const response = await fetchBundled('wins_losses_current');
     response.reverse(); // Reverse the array to start from the beginning of the season
     renderRunDiffChart(response);
   } catch (error) {
@@ -336,7 +334,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
   async function fetchCumulativeWinsData() {
       try {
-          const response = await d3.json(await getDatasetUrl('standings_1958_present'));
+          const response = await fetchBundled('standings_1958_present');
           // Group data by year (convert to string for consistency with other charts)
           groupedByYear = d3.group(response, (d) => d.year.toString());
           populateYearSelect(Array.from(groupedByYear.keys()));
@@ -623,9 +621,9 @@ document.addEventListener('DOMContentLoaded', function() {
     
       async function fetchData() {
         try {
-          const response = await d3.json(
-            await getDatasetUrl('historic_batting_gamelogs')
-          );
+          const response = await fetchBundled('historic_batting_gamelogs', () =>
+            fetchSeasonShards('historic_batting_gamelogs_index')
+              .catch(async () => d3.json(await getDatasetUrl('historic_batting_gamelogs'))));
           const groupedData = d3.group(response, (d) => d.year.toString());
           const maxVal = d3.max(response, d => Math.max(d['2b_cum'], d['hr_cum']));
           return { groupedData, maxVal };
@@ -817,9 +815,9 @@ document.addEventListener('DOMContentLoaded', function() {
 
   async function fetchData() {
     try {
-      const response = await d3.json(
-        await getDatasetUrl('historic_pitching_gamelogs')
-      );
+      const response = await fetchBundled('historic_pitching_gamelogs', () =>
+        fetchSeasonShards('historic_pitching_gamelogs_index')
+          .catch(async () => d3.json(await getDatasetUrl('historic_pitching_gamelogs'))));
       const groupedData = d3.group(response, (d) => d.year.toString());
       const maxVal = d3.max(response, d => Math.max(d['so_cum'], d['h_cum']));
       return { groupedData, maxVal };
@@ -993,9 +991,9 @@ document.addEventListener('DOMContentLoaded', function() {
 document.addEventListener('DOMContentLoaded', function() {
   async function fetchCumulativeERAData() {
     try {
-      const response = await d3.json(
-        await getDatasetUrl('historic_pitching_gamelogs')
-      );
+      const response = await fetchBundled('historic_pitching_gamelogs', () =>
+        fetchSeasonShards('historic_pitching_gamelogs_index')
+          .catch(async () => d3.json(await getDatasetUrl('historic_pitching_gamelogs'))));
       // Group data by year
       const groupedByYear = d3.group(response, (d) => d.year.toString());
       renderCumulativeERAChart(groupedByYear);
@@ -1191,8 +1189,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch(await getDatasetUrl('schedule_current'));
-      const games = await response.json();
+      const games = await fetchBundled('schedule_current');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -1210,12 +1207,9 @@ document.addEventListener('DOMContentLoaded', function () {
 
 
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('player_batting_current');
-
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('player_batting_current');
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -1303,12 +1297,9 @@ document.addEventListener('DOMContentLoaded', async function () {
 
 // Pitcher stats tables
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('pitcher_stats_current');
-
   const fetchDataAndRenderPitcherTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('pitcher_stats_current');
 
           renderPitcherTable(data, 'pitcher-table-1', ['player', 'role', 'era', 'whip', 'k9'], getColorScalePitchers);
           renderPitcherTable(data, 'pitcher-table-2', ['player', 'ip_rounded', 'bb9', 'kbb'], getColorScalePitchers);
@@ -1522,8 +1513,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch(await getDatasetUrl('schedule_current'));
-      const games = await response.json();
+      const games = await fetchBundled('schedule_current');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -1541,12 +1531,9 @@ document.addEventListener('DOMContentLoaded', function () {
 
 
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('player_batting_current');
-
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('player_batting_current');
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -1634,12 +1621,9 @@ document.addEventListener('DOMContentLoaded', async function () {
 
 // Pitcher stats tables
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('pitcher_stats_current');
-
   const fetchDataAndRenderPitcherTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('pitcher_stats_current');
 
           renderPitcherTable(data, 'pitcher-table-1', ['player', 'role', 'era', 'whip', 'k9'], getColorScalePitchers);
           renderPitcherTable(data, 'pitcher-table-2', ['player', 'ip_rounded', 'bb9', 'kbb'], getColorScalePitchers);
@@ -1853,8 +1837,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch(await getDatasetUrl('schedule_current'));
-      const games = await response.json();
+      const games = await fetchBundled('schedule_current');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -1872,12 +1855,9 @@ document.addEventListener('DOMContentLoaded', function () {
 
 
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('player_batting_current');
-
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('player_batting_current');
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -1965,12 +1945,9 @@ document.addEventListener('DOMContentLoaded', async function () {
 
 // Pitcher stats tables
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('pitcher_stats_current');
-
   const fetchDataAndRenderPitcherTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('pitcher_stats_current');
 
           renderPitcherTable(data, 'pitcher-table-1', ['player', 'role', 'era', 'whip', 'k9'], getColorScalePitchers);
           renderPitcherTable(data, 'pitcher-table-2', ['player', 'ip_rounded', 'bb9', 'kbb'], getColorScalePitchers);
@@ -2184,8 +2161,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch(await getDatasetUrl('schedule_current'));
-      const games = await response.json();
+      const games = await fetchBundled('schedule_current');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -2203,12 +2179,9 @@ document.addEventListener('DOMContentLoaded', function () {
 
 
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('player_batting_current');
-
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('player_batting_current');
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -2296,12 +2269,9 @@ document.addEventListener('DOMContentLoaded', async function () {
 
 // Pitcher stats tables
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('pitcher_stats_current');
-
   const fetchDataAndRenderPitcherTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('pitcher_stats_current');
 
           renderPitcherTable(data, 'pitcher-table-1', ['player', 'role', 'era', 'whip', 'k9'], getColorScalePitchers);
           renderPitcherTable(data, 'pitcher-table-2', ['player', 'ip_rounded', 'bb9', 'kbb'], getColorScalePitchers);
@@ -2515,8 +2485,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch(await getDatasetUrl('schedule_current'));
-      const games = await response.json();
+      const games = await fetchBundled('schedule_current');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -2534,12 +2503,9 @@ document.addEventListener('DOMContentLoaded', function () {
 
 
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('player_batting_current');
-
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('player_batting_current');
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -2627,12 +2593,9 @@ document.addEventListener('DOMContentLoaded', async function () {
 
 // Pitcher stats tables
 document.addEventListener('DOMContentLoaded', async function () {
-  const url = await getDatasetUrl('pitcher_stats_current');
-
   const fetchDataAndRenderPitcherTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await fetchBundled('pitcher_stats_current');
 
           renderPitcherTable(data, 'pitcher-table-1', ['player', 'role', 'era', 'whip', 'k9'], getColorScalePitchers);
           renderPitcherTable(data, 'pitcher-table-2', ['player', 'ip_rounded', 'bb9', 'kbb'], getColorScalePitchers);
@@ -2819,7 +2782,7 @@ document.addEventListener('DOMContentLoaded', async function () {
 document.addEventListener('DOMContentLoaded', function () {
   async function fetchTableData() {
     try {
-      const response = await d3.json(await getDatasetUrl('mlb_team_attendance'));
+      const response = await fetchBundled('mlb_team_attendance');
       renderTables(response);
       renderMaxAttendanceInfo(response);
     } catch (error) {
@@ -2919,7 +2882,7 @@ document.addEventListener('DOMContentLoaded', function () {
 // xwOBA charts
 async function fetchAndRenderXwoba() {
   try {
-    const data = await d3.json(await getDatasetUrl('xwoba_current'));
+    const data = await fetchBundled('xwoba_current');
     
     const playerGroups = d3.group(data, d => d.player_name);
     const players = Array.from(playerGroups.keys()).sort();
@@ -3099,6 +3062,10 @@ document.addEventListener('DOMContentLoaded', fetchAndRenderXwoba);
 // Shohei 50-50 watch charts
 
 document.addEventListener('DOMContentLoaded', function () {
+  if (!document.getElementById('shohei-homers-chart')) {
+    return;
+  }
+
   async function fetchShoheiData() {
     const hrUrl = await getDatasetUrl('shohei_home_runs');
     const sbUrl = await getDatasetUrl('shohei_stolen_bases');
@@ -3787,7 +3754,7 @@ if (document.readyState === 'loading') {
 (function () {
   async function fetchUmpireData() {
     try {
-      const response = await d3.json(await getDatasetUrl('umpire_summary'));
+      const response = await fetchBundled('umpire_summary');
       renderUmpireScorecard(response);
       } catch (error) {
       console.error('Failed to fetch umpire scorecard data:', error);
@@ -3943,7 +3910,7 @@ if (document.readyState === 'loading') {
 (function () {
   async function fetchUmpireDataPitching() {
     try {
-      const response = await d3.json(await getDatasetUrl('umpire_summary'));
+      const response = await fetchBundled('umpire_summary');
       renderUmpireScorecardPitching(response);
     } catch (error) {
       console.error('Failed to fetch umpire scorecard pitching data:', error);
@@ -4062,7 +4029,7 @@ if (document.readyState === 'loading') {
 (function () {
   async function fetchAbsChallenges() {
     try {
-      const data = await d3.json(await getDatasetUrl('abs_challenges'));
+      const data = await fetchBundled('abs_challenges');
       renderAbsChallenges(data);
     } catch (error) {
       console.error('Failed to fetch ABS challenge data:', error);
@@ -4829,9 +4796,7 @@ document.addEventListener('DOMContentLoaded', async function() {
 // Postseason Stats Functions
 async function fetchPostseasonStats() {
   try {
-    // Import manifest loader dynamically
-    const { fetchDataset } = await import('./manifest_loader.js');
-    return await fetchDataset('postseason_players_current');
+    return await fetchBundled('postseason_players_current');
   } catch (error) {
     console.error('Error fetching postseason stats:', error);
     return null;
@@ -4930,9 +4895,7 @@ async function initPostseasonStats() {
 // Playoff Journey Functions
 async function fetchPlayoffJourney() {
   try {
-    // Import manifest loader dynamically
-    const { fetchDataset } = await import('./manifest_loader.js');
-    return await fetchDataset('postseason_series_current');
+    return await fetchBundled('postseason_series_current');
   } catch (error) {
     console.error('Error fetching playoff journey:', error);
     return null;
@@ -5042,7 +5005,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
     let data;
     try {
-      data = await d3.json(await getDatasetUrl('kalshi_world_series'));
+      data = await fetchBundled('kalshi_world_series');
     } catch (error) {
       console.error('Failed to load Kalshi World Series data:', error);
       return;
@@ -5117,7 +5080,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
     let data;
     try {
-      data = await d3.json(await getDatasetUrl('kalshi_nl_mvp'));
+      data = await fetchBundled('kalshi_nl_mvp');
     } catch (error) {
       console.error('Failed to load Kalshi NL MVP data:', error);
       return;
@@ -63,9 +63,12 @@ export async function getDatasetUrl(datasetId, preferLocal = true) {
     return urlPath;
   }
   
-  // Otherwise use the S3 URL with cache busting
+  // Otherwise use the S3 URL with cache busting; the content hash only
+  // changes when the data does, so unchanged datasets stay cached
   const url = new URL(dataset.url);
-  if (dataset.last_updated) {
+  if (dataset.hash) {
+    url.searchParams.set('v', dataset.hash.split(':').pop().slice(0, 12));
+  } else if (dataset.last_updated) {
     url.searchParams.set('v', dataset.last_updated);
   }
   return url.toString();
@@ -91,6 +94,109 @@ export async function fetchDataset(datasetId) {
   }
 }
 
+const seasonShardCache = new Map();
+
+/**
+ * Fetch rows from a per-season sharded dataset (see scripts/gamelog_shards.py)
+ *
+ * Reads the dataset's index, then fetches the listed season shards in
+ * parallel. Finished seasons have content-hashed file names and are cached
+ * by the browser, so repeat visits only download the index and the
+ * current season.
+ * @param {string} indexId - Dataset ID of the shard index
+ * @param {number[]|null} years - Seasons to load (default: all)
+ * @returns {Promise<Object[]>} Row objects, as in the combined JSON
+ */
+export async function fetchSeasonShards(indexId, years = null) {
+  const cacheKey = `${indexId}:${years ? years.join(',') : 'all'}`;
+  if (!seasonShardCache.has(cacheKey)) {
+    const load = (async () => {
+      const indexUrl = new URL(await getDatasetUrl(indexId), window.location.href);
+      const response = await fetch(indexUrl);
+      if (!response.ok) {
+        throw new Error(`Failed to fetch shard index ${indexId}: ${response.status}`);
+      }
+      const index = await response.json();
+      const wanted = years ? new Set(years.map(Number)) : null;
+      const seasons = index.seasons.filter(s => !wanted || wanted.has(s.year));
+      const shards = await Promise.all(seasons.map(async (season) => {
+        const shardResponse = await fetch(new URL(season.file, indexUrl));
+        if (!shardResponse.ok) {
+          throw new Error(`Failed to fetch ${season.year} shard of ${indexId}: ${shardResponse.status}`);
+        }
+        const { columns, data } = await shardResponse.json();
+        return data.map(row => Object.fromEntries(columns.map((column, i) => [column, row[i]])));
+      }));
+      return shards.flat();
+    })();
+    load.catch(() => seasonShardCache.delete(cacheKey));
+    seasonShardCache.set(cacheKey, load);
+  }
+  return seasonShardCache.get(cacheKey);
+}
+
+const bundleCache = new Map();
+const directCache = new Map();
+
+async function loadBundle(url) {
+  if (!bundleCache.has(url)) {
+    const load = (async () => {
+      const response = await fetch(url);
+      if (!response.ok) {
+        throw new Error(`Failed to fetch bundle ${url}: ${response.status}`);
+      }
+      return response.json();
+    })();
+    load.catch(() => bundleCache.delete(url));
+    bundleCache.set(url, load);
+  }
+  return bundleCache.get(url);
+}
+
+function unpackBundled(entry) {
+  if (entry.columns) {
+    return entry.data.map(row => Object.fromEntries(entry.columns.map((column, i) => [column, row[i]])));
+  }
+  return structuredClone(entry.data);
+}
+
+/**
+ * Fetch a dataset from the dashboard bundles (see scripts/33_build_dashboard_bundle.py)
+ *
+ * The first call loads the bundle listed in the manifest, which holds the
+ * charts near the top of the page; datasets it lists as lazy come from a
+ * second bundle, loaded on first use. Datasets that aren't bundled (or
+ * any, if the bundle can't be loaded) come from `fallback`, once per page.
+ * Each call returns its own copy, so callers can sort or reverse it.
+ * @param {string} datasetId - The dataset identifier
+ * @param {Function} fallback - Loader used when the dataset isn't bundled
+ * @returns {Promise<Object>} The dataset, as its own URL would return it
+ */
+export async function fetchBundled(datasetId, fallback = () => fetchDataset(datasetId)) {
+  try {
+    const bundleUrl = new URL(await getDatasetUrl('dashboard_bundle'), window.location.href);
+    const bundle = await loadBundle(bundleUrl.toString());
+    if (bundle.datasets[datasetId]) {
+      return unpackBundled(bundle.datasets[datasetId]);
+    }
+    if (bundle.lazy && bundle.lazy.datasets.includes(datasetId)) {
+      const lazy = await loadBundle(new URL(bundle.lazy.file, bundleUrl).toString());
+      if (lazy.datasets[datasetId]) {
+        return unpackBundled(lazy.datasets[datasetId]);
+      }
+    }
+  } catch (error) {
+    console.warn(`Dashboard bundle unavailable, fetching ${datasetId} directly:`, error);
+  }
+
+  if (!directCache.has(datasetId)) {
+    const load = Promise.resolve().then(fallback);
+    load.catch(() => directCache.delete(datasetId));
+    directCache.set(datasetId, load);
+  }
+  return structuredClone(await directCache.get(datasetId));
+}
+
 /**
  * Check if postseason section should be visible
  * @returns {Promise<boolean>}
@@ -8,6 +8,7 @@ Saves the data locally as a JSON list of dictionaries and uploads to S3.
 
 import os
 import requests
+import http_client
 import boto3
 import logging
 from datetime import datetime
@@ -108,7 +109,7 @@ def get_all_teams_standings_metrics() -> Optional[List[Dict[str, Any]]]:
     )
     all_teams_data = []
     try:
-        response = requests.get(url, headers=HEADERS)
+        response = http_client.get(url, headers=HEADERS)
         response.raise_for_status()
         data = response.json()
 
@@ -3,7 +3,7 @@ import os
 from urllib.parse import urlparse, parse_qs
 
 import pandas as pd
-import requests
+import http_client
 from bs4 import BeautifulSoup
 
 
@@ -14,7 +14,7 @@ GAME_LOGS_URL = (
 
 
 def fetch_game_logs_html(url: str) -> str:
-    response = requests.get(url, timeout=30)
+    response = http_client.get(url, timeout=30)
     response.raise_for_status()
     return response.text
 
@@ -67,7 +67,7 @@ def parse_game_rows(table: BeautifulSoup) -> pd.DataFrame:
 def fetch_and_save_gamefeed(game_pk: int, out_dir: str) -> str:
     os.makedirs(out_dir, exist_ok=True)
     url = f"https://baseballsavant.mlb.com/gf?game_pk={game_pk}"
-    response = requests.get(url, timeout=30)
+    response = http_client.get(url, timeout=30)
     response.raise_for_status()
     data = response.json()
     out_path = os.path.join(out_dir, f"{game_pk}.json")
@@ -1,20 +1,16 @@
 import argparse
-import json
 import os
 from datetime import datetime, timedelta
 from typing import List, Optional
 from urllib.parse import urlparse, parse_qs
 
-import boto3
-from botocore.exceptions import ClientError
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 from zoneinfo import ZoneInfo
-import time
 import logging
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from boxscores_archive import load_archive, upsert_games
+from fetch_engine import fetch_json, fetch_text, fetch_all, map_concurrent
 
 # Configure logging
 logging.basicConfig(
@@ -25,160 +21,6 @@ logging.basicConfig(
 DODGERS_TEAM_ID = 119
 # Days of MLB schedule to backfill (in addition to today) to cover Savant lag.
 SCHEDULE_LOOKBACK_DAYS = 3
-BUCKET = "stilesdata.com"
-ARCHIVE_KEY_JSON = "dodgers/data/standings/dodgers_boxscores.json"
-ARCHIVE_KEY_CSV = "dodgers/data/standings/dodgers_boxscores.csv"  # legacy fallback
-LOCAL_ARCHIVE_JSON = os.path.join("data", "standings", "dodgers_boxscores.json")
-LOCAL_ARCHIVE_CSV = os.path.join("data", "standings", "dodgers_boxscores.csv")
-
-
-def get_s3_client(profile_name: Optional[str] = None):
-    """Return an S3 client with sensible local/CI behavior.
-
-    Priority:
-    1) Explicit CLI profile
-    2) If running in GitHub Actions, use default chain (env/role)
-    3) AWS_PROFILE env var
-    4) Local fallback profile 'haekeo'
-    """
-    if profile_name:
-        session = boto3.session.Session(profile_name=profile_name)
-        return session.client("s3")
-
-    if os.environ.get("GITHUB_ACTIONS") == "true":
-        return boto3.client("s3")
-
-    env_profile = os.environ.get("AWS_PROFILE")
-    resolved = env_profile or "haekeo"
-    session = boto3.session.Session(profile_name=resolved)
-    return session.client("s3")
-
-
-def create_session_with_retries():
-    """Create a requests session with retry strategy for resilience."""
-    session = requests.Session()
-    
-    # Define retry strategy
-    retry_strategy = Retry(
-        total=3,  # Total number of retries
-        backoff_factor=2,  # Wait time between retries (2, 4, 8 seconds)
-        status_forcelist=[500, 502, 503, 504, 429],  # HTTP status codes to retry
-        allowed_methods=["GET"]  # Only retry GET requests
-    )
-    
-    # Mount adapter with retry strategy
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    return session
-
-
-USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-)
-
-
-def fetch_text(url: str, max_retries: int = 3, base_delay: float = 1.0) -> Optional[str]:
-    """
-    Fetch text from URL with retry logic and exponential backoff.
-    
-    Args:
-        url: URL to fetch
-        max_retries: Maximum number of retry attempts
-        base_delay: Base delay between retries (exponentially increased)
-    
-    Returns:
-        Response text or None if all retries failed
-    """
-    session = create_session_with_retries()
-    headers = {"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"}
-    
-    for attempt in range(max_retries + 1):
-        try:
-            response = session.get(url, timeout=30, headers=headers)
-            response.raise_for_status()
-            return response.text
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code in [500, 502, 503, 504]:
-                if attempt < max_retries:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff
-                    logging.warning(f"Server error {e.response.status_code} for {url}. Retrying in {delay} seconds... (attempt {attempt + 1}/{max_retries + 1})")
-                    time.sleep(delay)
-                    continue
-                else:
-                    logging.error(f"Server error {e.response.status_code} for {url}. All retries exhausted.")
-                    return None
-            else:
-                # For non-server errors (4xx), don't retry
-                logging.error(f"Client error {e.response.status_code} for {url}: {e}")
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries:
-                delay = base_delay * (2 ** attempt)
-                logging.warning(f"Request failed for {url}: {e}. Retrying in {delay} seconds... (attempt {attempt + 1}/{max_retries + 1})")
-                time.sleep(delay)
-                continue
-            else:
-                logging.error(f"Request failed for {url} after all retries: {e}")
-                return None
-    
-    return None
-
-
-def fetch_json(url: str, max_retries: int = 3, base_delay: float = 1.0) -> Optional[dict]:
-    """
-    Fetch JSON from URL with retry logic and exponential backoff.
-    
-    Args:
-        url: URL to fetch
-        max_retries: Maximum number of retry attempts
-        base_delay: Base delay between retries (exponentially increased)
-    
-    Returns:
-        Parsed JSON as dict or None if all retries failed
-    """
-    session = create_session_with_retries()
-    
-    for attempt in range(max_retries + 1):
-        try:
-            response = session.get(url, timeout=30)
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code in [500, 502, 503, 504]:
-                if attempt < max_retries:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff
-                    logging.warning(f"Server error {e.response.status_code} for {url}. Retrying in {delay} seconds... (attempt {attempt + 1}/{max_retries + 1})")
-                    time.sleep(delay)
-                    continue
-                else:
-                    logging.error(f"Server error {e.response.status_code} for {url}. All retries exhausted.")
-                    return None
-            else:
-                # For non-server errors (4xx), don't retry
-                logging.error(f"Client error {e.response.status_code} for {url}: {e}")
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries:
-                delay = base_delay * (2 ** attempt)
-                logging.warning(f"Request failed for {url}: {e}. Retrying in {delay} seconds... (attempt {attempt + 1}/{max_retries + 1})")
-                time.sleep(delay)
-                continue
-            else:
-                logging.error(f"Request failed for {url} after all retries: {e}")
-                return None
-                
-        except ValueError as e:  # JSON decode error
-            logging.error(f"Invalid JSON response from {url}: {e}")
-            return None
-    
-    return None
 
 
 def find_gamelog_table(html: str) -> BeautifulSoup:
@@ -338,48 +180,6 @@ def build_boxscore_row(gamefeed: dict) -> Optional[dict]:
         return None
 
 
-def load_archive(profile_name: Optional[str] = None) -> pd.DataFrame:
-    s3 = get_s3_client(profile_name)
-    try:
-        obj = s3.get_object(Bucket=BUCKET, Key=ARCHIVE_KEY_JSON)
-        text = obj["Body"].read().decode("utf-8")
-        return pd.DataFrame(json.loads(text))
-    except ClientError as e:
-        if e.response.get("Error", {}).get("Code") == "NoSuchKey":
-            # Legacy CSV fallback in S3
-            try:
-                obj = s3.get_object(Bucket=BUCKET, Key=ARCHIVE_KEY_CSV)
-                return pd.read_csv(obj["Body"])
-            except Exception:
-                pass
-    except Exception:
-        pass
-    # Fallback to local archive if S3 is unavailable
-    try:
-        if os.path.exists(LOCAL_ARCHIVE_JSON):
-            with open(LOCAL_ARCHIVE_JSON, "r", encoding="utf-8") as f:
-                return pd.DataFrame(json.load(f))
-        if os.path.exists(LOCAL_ARCHIVE_CSV):
-            return pd.read_csv(LOCAL_ARCHIVE_CSV)
-    except Exception:
-        pass
-    return pd.DataFrame()
-
-
-def save_archive(df: pd.DataFrame, profile_name: Optional[str] = None) -> None:
-    s3 = get_s3_client(profile_name)
-    json_bytes = json.dumps(df.to_dict(orient="records"), ensure_ascii=False, indent=2).encode("utf-8")
-    try:
-        s3.put_object(Bucket=BUCKET, Key=ARCHIVE_KEY_JSON, Body=json_bytes, ContentType="application/json")
-        print(f"Uploaded archive -> s3://{BUCKET}/{ARCHIVE_KEY_JSON}")
-    except Exception as exc:
-        # Write locally as a fallback
-        os.makedirs(os.path.dirname(LOCAL_ARCHIVE_JSON), exist_ok=True)
-        with open(LOCAL_ARCHIVE_JSON, "wb") as f:
-            f.write(json_bytes)
-        print(f"S3 upload failed ({exc}). Saved locally -> {LOCAL_ARCHIVE_JSON}")
-
-
 def main() -> None:
     parser = argparse.ArgumentParser(description="Update Dodgers boxscore archive from Baseball Savant")
     parser.add_argument(
@@ -412,7 +212,7 @@ def main() -> None:
 
     logs_df = parse_game_log_rows(table)
 
-    archive_df = load_archive(args.profile)
+    archive_df = load_archive(args.profile, columns=["game_pk", "is_final"])
     existing_pks = set(archive_df["game_pk"].astype(int).tolist()) if not archive_df.empty else set()
 
     new_rows = []
@@ -424,9 +224,12 @@ def main() -> None:
     # silently drop a prior day's game. The MLB Stats API is authoritative and
     # immediate, so backfill a short lookback window to cover that lag.
     la_today = datetime.now(ZoneInfo("America/Los_Angeles")).date()
-    for delta in range(SCHEDULE_LOOKBACK_DAYS + 1):
-        day_iso = (la_today - timedelta(days=delta)).strftime("%Y-%m-%d")
-        candidate_pks.update(get_dodgers_final_gamepks_for_date(day_iso))
+    lookback_days = [
+        (la_today - timedelta(days=delta)).strftime("%Y-%m-%d")
+        for delta in range(SCHEDULE_LOOKBACK_DAYS + 1)
+    ]
+    for day_pks in map_concurrent(get_dodgers_final_gamepks_for_date, lookback_days):
+        candidate_pks.update(day_pks or [])
 
     # Re-fetch any archived games still marked as not final
     stale_pks = set()
@@ -439,26 +242,16 @@ def main() -> None:
         if stale_pks:
             logging.info(f"Re-fetching {len(stale_pks)} non-final games: {sorted(stale_pks)}")
 
-    for game_pk in sorted(candidate_pks):
-        if game_pk in existing_pks and game_pk not in stale_pks:
-            continue
-        gf_url = f"https://baseballsavant.mlb.com/gf?game_pk={game_pk}"
-        gf = fetch_json(gf_url)
-        row = build_boxscore_row(gf)
+    to_fetch = [pk for pk in sorted(candidate_pks) if pk not in existing_pks or pk in stale_pks]
+    gamefeeds = fetch_all(f"https://baseballsavant.mlb.com/gf?game_pk={game_pk}" for game_pk in to_fetch)
+    for gf in gamefeeds:
+        row = build_boxscore_row(gf) if gf is not None else None
         if row is not None:
             new_rows.append(row)
 
     if new_rows:
-        new_df = pd.DataFrame(new_rows)
-        combined = (
-            pd.concat([archive_df, new_df], ignore_index=True)
-            .drop_duplicates(subset=["game_pk"], keep="last")
-        )
-        # Normalize date and sort for convenience
-        if "date" in combined.columns:
-            combined["date"] = pd.to_datetime(combined["date"]).dt.strftime("%Y-%m-%d")
-        combined = combined.sort_values(["date", "game_pk"]).reset_index(drop=True)
-        save_archive(combined, args.profile)
+        # Upsert by game_pk: only the seasons these games belong to are rewritten
+        combined = upsert_games(pd.DataFrame(new_rows), args.profile)
         print(f"Archive now contains {len(combined)} games")
     else:
         print("No new games to add. Archive unchanged.")
@@ -9,6 +9,7 @@ Saves the data locally and uploads to S3.
 import os
 import pandas as pd
 import requests
+import http_client
 from bs4 import BeautifulSoup
 import boto3
 from io import StringIO, BytesIO
@@ -82,7 +83,7 @@ def get_team_rank_for_stat(stat_name: str, stat_group: str, team_name_query: str
         f'&limit=30&offset=0'
     )
     try:
-        response = requests.get(url, headers=HEADERS)
+        response = http_client.get(url, headers=HEADERS)
         response.raise_for_status()  # Raises an exception for 4XX/5XX errors
         data = response.json()
         if "stats" in data:
@@ -152,8 +153,11 @@ def main():
 
     # Save locally
     try:
-        with open(local_file_path, 'w') as f:
+        # Write to a temp file and rename, so readers never see a partial file
+        tmp_path = f"{local_file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(dodgers_ranks, f, indent=4)
+        os.replace(tmp_path, local_file_path)
         logging.info(f"Successfully saved ranks to {local_file_path}")
     except IOError as e:
         logging.error(f"Failed to save ranks locally to {local_file_path}: {e}")
@@ -7,130 +7,69 @@ Replaces Baseball Reference scraping with archive-based processing
 """
 
 import os
+import numpy as np
 import pandas as pd
-import boto3
-import json
 import logging
-import requests
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+
+import publisher
+from archive_cache import read_archive
+from boxscores_archive import load_archive, regular_season_games
+from schedule_service import query_games
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Configuration
 BUCKET = "stilesdata.com"
-BOXES_KEY_JSON = "dodgers/data/standings/dodgers_boxscores.json"
-LOCAL_BOXES_JSON = os.path.join("data", "standings", "dodgers_boxscores.json")
 HISTORIC_ARCHIVE = "https://stilesdata.com/dodgers/data/standings/archive/dodgers_standings_1958_2025.parquet"
 
 output_dir = "data/standings"
 year = datetime.now().year  # Keep as int to match historical data
 
+DODGERS_TEAM_ID = 119
+NL_WEST_TEAMS = {
+    119: 'Los Angeles Dodgers',
+    109: 'Arizona Diamondbacks',
+    137: 'San Francisco Giants',
+    135: 'San Diego Padres',
+    115: 'Colorado Rockies'
+}
 
-def get_s3_client(profile_name: Optional[str] = None):
-    """Get S3 client with local/CI fallback"""
-    if profile_name:
-        session = boto3.session.Session(profile_name=profile_name)
-        return session.client("s3")
-    
-    if os.environ.get("GITHUB_ACTIONS") == "true":
-        return boto3.client("s3")
-    
-    env_profile = os.environ.get("AWS_PROFILE")
-    resolved = env_profile or "haekeo"
-    session = boto3.session.Session(profile_name=resolved)
-    return session.client("s3")
 
+def fetch_team_games(season: int, team_ids: Optional[Dict[int, str]] = None) -> pd.DataFrame:
+    """
+    Fetch one row per team per completed regular season game
 
-def load_boxscores(profile_name: Optional[str] = None) -> pd.DataFrame:
-    """Load boxscores archive from S3 or local"""
-    # Try S3 first
+    Reads the shared league-wide schedule (schedule_service); pass `team_ids`
+    (id -> name) to keep a subset such as one division.
+    """
     try:
-        s3 = get_s3_client(profile_name)
-        obj = s3.get_object(Bucket=BUCKET, Key=BOXES_KEY_JSON)
-        text = obj["Body"].read().decode("utf-8")
-        logging.info(f"Loaded boxscores from S3: {BOXES_KEY_JSON}")
-        return pd.DataFrame(json.loads(text))
+        games = query_games(season, game_types=['R'], completed=True)
     except Exception as e:
-        logging.warning(f"Could not load from S3: {e}")
-    
-    # Try local
-    if os.path.exists(LOCAL_BOXES_JSON):
-        with open(LOCAL_BOXES_JSON, "r", encoding="utf-8") as f:
-            logging.info(f"Loaded boxscores from local: {LOCAL_BOXES_JSON}")
-            return pd.DataFrame(json.load(f))
-    
-    raise FileNotFoundError("Boxscores archive not found in S3 or local")
-
-
-def fetch_nl_west_standings(season: int) -> pd.DataFrame:
-    """Fetch game-by-game standings for all NL West teams"""
-    import requests
-    
-    # NL West team IDs
-    NL_WEST_TEAMS = {
-        119: 'Los Angeles Dodgers',
-        109: 'Arizona Diamondbacks',
-        137: 'San Francisco Giants',
-        135: 'San Diego Padres',
-        115: 'Colorado Rockies'
-    }
+        logging.error(f"Failed to fetch {season} schedule: {e}")
+        return pd.DataFrame()
     
     all_games = []
-    
-    for team_id, team_name in NL_WEST_TEAMS.items():
-        logging.info(f"Fetching schedule for {team_name}")
-        
-        url = "https://statsapi.mlb.com/api/v1/schedule"
-        params = {
-            'sportId': 1,
-            'teamId': team_id,
-            'season': season,
-            'gameType': 'R',  # Regular season only
-            'hydrate': 'team,linescore'
-        }
-        
-        try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            for date_entry in data.get('dates', []):
-                for game in date_entry.get('games', []):
-                    if game.get('status', {}).get('abstractGameState') != 'Final':
-                        continue
-                    # Postponed/cancelled games report abstractGameState 'Final' but have no result
-                    if game.get('status', {}).get('detailedState', '') in ('Postponed', 'Cancelled'):
-                        continue
-                    
-                    game_date = pd.to_datetime(game.get('gameDate')).strftime('%Y-%m-%d')
-                    teams = game.get('teams', {})
-                    home_team_id = teams.get('home', {}).get('team', {}).get('id')
-                    away_team_id = teams.get('away', {}).get('team', {}).get('id')
-                    
-                    # Determine if this team won
-                    if home_team_id == team_id:
-                        team_score = teams.get('home', {}).get('score', 0)
-                        opp_score = teams.get('away', {}).get('score', 0)
-                    else:
-                        team_score = teams.get('away', {}).get('score', 0)
-                        opp_score = teams.get('home', {}).get('score', 0)
-                    
-                    won = team_score > opp_score
-                    
-                    all_games.append({
-                        'team_id': team_id,
-                        'team_name': team_name,
-                        'game_date': game_date,
-                        'won': won
-                    })
-        
-        except Exception as e:
-            logging.error(f"Failed to fetch schedule for {team_name}: {e}")
-            continue
+    for game in games:
+        # Local (official) date, so records line up with the boxscores archive
+        game_date = game.get('officialDate')
+        teams = game.get('teams', {})
+        for side, other in (('home', 'away'), ('away', 'home')):
+            team = teams.get(side, {}).get('team', {})
+            team_id = team.get('id')
+            if team_ids is not None and team_id not in team_ids:
+                continue
+            all_games.append({
+                'team_id': team_id,
+                'team_name': team_ids[team_id] if team_ids else team.get('name'),
+                'division_id': team.get('division', {}).get('id'),
+                'game_date': game_date,
+                'won': teams.get(side, {}).get('score', 0) > teams.get(other, {}).get('score', 0)
+            })
     
     if not all_games:
-        logging.warning("No NL West games fetched")
+        logging.warning(f"No completed games fetched for {season}")
         return pd.DataFrame()
     
     df = pd.DataFrame(all_games)
@@ -142,55 +81,116 @@ def fetch_nl_west_standings(season: int) -> pd.DataFrame:
     df['games'] = df.groupby('team_id').cumcount() + 1
     df['losses'] = df['games'] - df['wins']
     
-    logging.info(f"Fetched {len(df)} total NL West games")
+    logging.info(f"Fetched {len(df)} team games for {df['team_id'].nunique()} teams")
     return df
 
 
-def calculate_games_back(dodgers_standings: pd.DataFrame, nl_west_df: pd.DataFrame) -> pd.DataFrame:
+def fetch_nl_west_standings(season: int) -> pd.DataFrame:
+    """Fetch game-by-game standings for all NL West teams"""
+    return fetch_team_games(season, NL_WEST_TEAMS)
+
+
+def records_as_of(games_df: pd.DataFrame):
+    """
+    Every team's record as of every date, in one pass
+
+    Daily wins and games are pivoted into a date x team matrix and summed
+    down the date axis, so row i holds each team's record after all games
+    on dates[i].
+
+    Returns:
+        (dates, team_ids, wins, losses) with wins/losses as 2D int arrays
+    """
+    daily = games_df.assign(game_date=pd.to_datetime(games_df['game_date']).dt.normalize())
+    daily = daily.assign(won=daily['won'].astype(int), played=1)
+    wins = daily.pivot_table(index='game_date', columns='team_id', values='won', aggfunc='sum', fill_value=0)
+    played = daily.pivot_table(index='game_date', columns='team_id', values='played', aggfunc='sum', fill_value=0)
+    wins = wins.sort_index().cumsum()
+    played = played.reindex(index=wins.index, columns=wins.columns).cumsum()
+    return wins.index, wins.columns.to_numpy(), wins.to_numpy(), (played - wins).to_numpy()
+
+
+def _games_back_block(dates, team_ids, wins, losses) -> pd.DataFrame:
+    """Games back for one group of teams (e.g. a division) from as-of matrices"""
+    games = wins + losses
+    with np.errstate(invalid='ignore', divide='ignore'):
+        win_pct = np.where(games > 0, wins / np.maximum(games, 1), 0.0)
+    
+    # Rank by wins, then win %; teams yet to play are not in the race
+    key = np.where(games > 0, wins + win_pct * 0.999, -np.inf)
+    order = np.argsort(-key, axis=1, kind='stable')
+    rows = np.arange(len(dates))[:, None]
+    rank = np.empty_like(order)
+    rank[rows, order] = np.arange(1, order.shape[1] + 1)
+    
+    # Compare each team to the leader, or to second place when it leads
+    first, second = order[:, 0], order[:, 1] if order.shape[1] > 1 else order[:, 0]
+    ref = np.where(rank == 1, second[:, None], first[:, None])
+    ref_valid = np.isfinite(key[rows, ref]) & (ref != np.arange(len(team_ids))[None, :])
+    ref_wins = np.where(ref_valid, wins[rows, ref], wins)
+    ref_losses = np.where(ref_valid, losses[rows, ref], losses)
+    
+    # GB = ((Ref Wins - Team Wins) + (Team Losses - Ref Losses)) / 2, negative = games up
+    gb = ((ref_wins - wins) + (losses - ref_losses)) / 2.0
+    
+    shape = wins.shape
+    return pd.DataFrame({
+        'game_date': np.repeat(dates.to_numpy(), shape[1]),
+        'team_id': np.tile(team_ids, shape[0]),
+        'wins': wins.ravel(),
+        'losses': losses.ravel(),
+        'ref_wins': ref_wins.ravel(),
+        'ref_losses': ref_losses.ravel(),
+        'gb': gb.ravel(),
+        'rank': rank.ravel(),
+    })
+
+
+def games_back_history(games_df: pd.DataFrame, group_col: Optional[str] = None) -> pd.DataFrame:
+    """
+    Games back for every team as of every date with games
+    
+    Args:
+        games_df: Rows from fetch_team_games (team_id, game_date, won)
+        group_col: Column that splits teams into races (e.g. 'division_id');
+            None treats all teams in games_df as one race
+    
+    Returns:
+        Long frame of game_date, team_id, wins, losses, gb, rank plus the
+        record each team is measured against (ref_wins/ref_losses)
+    """
+    if games_df.empty:
+        return pd.DataFrame()
+    groups = [games_df] if group_col is None else [g for _, g in games_df.groupby(group_col)]
+    history = pd.concat([_games_back_block(*records_as_of(g)) for g in groups], ignore_index=True)
+    return history.sort_values(['game_date', 'team_id']).reset_index(drop=True)
+
+
+def calculate_games_back(dodgers_standings: pd.DataFrame, nl_west_df: pd.DataFrame,
+                         team_id: int = DODGERS_TEAM_ID) -> pd.DataFrame:
     """Calculate game-by-game games back/up for Dodgers"""
     dodgers_standings = dodgers_standings.copy()
     dodgers_standings['game_date'] = pd.to_datetime(dodgers_standings['game_date'])
     
-    gb_values = []
+    history = games_back_history(nl_west_df)
+    team_history = history[history['team_id'] == team_id] if not history.empty else history
     
-    for idx, row in dodgers_standings.iterrows():
-        game_date = row['game_date']
-        dodgers_wins = row['wins']
-        dodgers_losses = row['losses']
-        
-        # Get all NL West teams' records as of this date
-        teams_as_of_date = nl_west_df[nl_west_df['game_date'] <= game_date].copy()
-        
-        if teams_as_of_date.empty:
-            gb_values.append(0.0)
-            continue
-        
-        # Get latest record for each team as of this date
-        latest_records = teams_as_of_date.groupby('team_id').tail(1).copy()
-        
-        # Find division leader (most wins, best win %)
-        latest_records = latest_records.copy()
-        latest_records['win_pct'] = latest_records['wins'] / (latest_records['wins'] + latest_records['losses'])
-        leader = latest_records.sort_values(['wins', 'win_pct'], ascending=False).iloc[0]
-        
-        leader_wins = leader['wins']
-        leader_losses = leader['losses']
-        
-        # Calculate games back/up
-        # GB = ((Leader Wins - Team Wins) + (Team Losses - Leader Losses)) / 2
-        gb = ((leader_wins - dodgers_wins) + (dodgers_losses - leader_losses)) / 2.0
-        
-        # If Dodgers are the leader, negate to show games UP
-        if leader['team_id'] == 119:  # Dodgers team ID
-            # Find second place team
-            other_teams = latest_records[latest_records['team_id'] != 119]
-            if not other_teams.empty:
-                second_place = other_teams.sort_values(['wins', 'win_pct'], ascending=False).iloc[0]
-                gb = -((dodgers_wins - second_place['wins']) + (second_place['losses'] - dodgers_losses)) / 2.0
-        
-        gb_values.append(gb)
+    if team_history.empty:
+        dodgers_standings['gb'] = 0.0
+    else:
+        # Division picture as of each Dodgers game date
+        as_of = pd.merge_asof(
+            dodgers_standings[['game_date']].reset_index(),
+            team_history[['game_date', 'ref_wins', 'ref_losses']],
+            on='game_date',
+            direction='backward',
+        ).set_index('index')
+        gb = (
+            (as_of['ref_wins'] - dodgers_standings['wins'])
+            + (dodgers_standings['losses'] - as_of['ref_losses'])
+        ) / 2.0
+        dodgers_standings['gb'] = gb.fillna(0.0)
     
-    dodgers_standings['gb'] = gb_values
     dodgers_standings['game_date'] = dodgers_standings['game_date'].dt.strftime('%Y-%m-%d')
     
     return dodgers_standings
@@ -198,25 +198,9 @@ def calculate_games_back(dodgers_standings: pd.DataFrame, nl_west_df: pd.DataFra
 
 def build_standings_from_boxscores(df: pd.DataFrame, season: int) -> pd.DataFrame:
     """Build game-by-game standings from boxscores archive"""
-    df = df.copy()
-    
-    # Filter for final games only and current season
-    if "is_final" in df.columns:
-        df = df[df["is_final"] == True]
-    
-    # Normalize date
-    df["game_date"] = pd.to_datetime(df.get("date", df.get("game_date")))
-    df = df[df["game_date"].dt.year == season]
-    
-    # Exclude spring training exhibitions (Angels games in March)
-    march_angels = (
-        (df["game_date"].dt.month == 3) & 
-        (df["opponent_name"].str.contains("Angels", na=False))
-    )
-    df = df[~march_angels]
-    
-    # Sort by date
-    df = df.sort_values("game_date").reset_index(drop=True)
+    # Final games for the season, exhibitions removed, sorted by date
+    df = regular_season_games(season, df)
+    df["game_date"] = df["date"]
     
     if df.empty:
         logging.warning(f"No games found for season {season}")
@@ -299,28 +283,11 @@ def save_dataframe_formats(df: pd.DataFrame, base_path: str, formats: list):
 
 
 def upload_to_s3(df: pd.DataFrame, s3_key: str, profile_name: Optional[str] = None):
-    """Upload DataFrame to S3 in multiple formats"""
-    try:
-        s3 = get_s3_client(profile_name)
-        
-        # CSV
-        csv_buffer = df.to_csv(index=False).encode("utf-8")
-        s3.put_object(Bucket=BUCKET, Key=f"{s3_key}.csv", Body=csv_buffer, ContentType="text/csv")
-        logging.info(f"Uploaded to S3: {s3_key}.csv")
-        
-        # JSON
-        json_buffer = df.to_json(orient="records", indent=2).encode("utf-8")
-        s3.put_object(Bucket=BUCKET, Key=f"{s3_key}.json", Body=json_buffer, ContentType="application/json")
-        logging.info(f"Uploaded to S3: {s3_key}.json")
-        
-        # Parquet
-        parquet_buffer = df.to_parquet(index=False)
-        s3.put_object(Bucket=BUCKET, Key=f"{s3_key}.parquet", Body=parquet_buffer, ContentType="application/octet-stream")
-        logging.info(f"Uploaded to S3: {s3_key}.parquet")
-        
-    except Exception as e:
-        logging.error(f"S3 upload failed: {e}")
-        raise
+    """Upload DataFrame to S3 in multiple formats (CSV/JSON gzipped by the publisher)"""
+    results = publisher.publish_dataframe(df, s3_key, ["csv", "json", "parquet"], profile_name=profile_name)
+    failed = [r["key"] for r in results if r.get("method") == "error"]
+    if failed:
+        raise RuntimeError(f"S3 upload failed for {', '.join(failed)}")
 
 
 def main():
@@ -331,7 +298,9 @@ def main():
         logging.info(f"Building standings for season {year} from boxscores archive")
         
         # Load boxscores archive
-        boxscores_df = load_boxscores(profile_name)
+        boxscores_df = load_archive(profile_name)
+        if boxscores_df.empty:
+            raise FileNotFoundError("Boxscores archive not found in S3 or local")
         logging.info(f"Loaded {len(boxscores_df)} total boxscore records")
         
         # Build current season standings
@@ -354,7 +323,7 @@ def main():
         # Load historical archive (1958-2025)
         logging.info("Loading historical standings archive")
         try:
-            historic_df = pd.read_parquet(HISTORIC_ARCHIVE)
+            historic_df = read_archive(HISTORIC_ARCHIVE)
             logging.info(f"Loaded {len(historic_df)} historical records")
         except Exception as e:
             logging.error(f"Failed to load historical archive: {e}", exc_info=True)
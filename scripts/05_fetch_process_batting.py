@@ -7,13 +7,15 @@ This replaces Baseball Reference with the much faster MLB Stats API.
 """
 
 import os
-import boto3
 import pandas as pd
-import requests
+import http_client
+import publisher
 import logging
-from io import BytesIO
 from datetime import datetime
 
+from archive_cache import read_archive
+from fetch_engine import fetch_all
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -39,7 +41,7 @@ def fetch_team_batting_stats():
     }
     
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=30)
+        response = http_client.get(url, params=params, headers=HEADERS, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -96,30 +98,34 @@ def fetch_player_batting_stats():
     }
     
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=30)
+        response = http_client.get(url, params=params, headers=HEADERS, timeout=30)
         response.raise_for_status()
         roster_data = response.json()
         
         player_stats = []
         
+        # Fetch individual player stats concurrently (results in roster order)
+        roster = roster_data.get('roster', [])
+        stats_params = {
+            'stats': 'season',
+            'group': 'hitting',
+            'season': year
+        }
+        roster_stats = fetch_all(
+            [f"https://statsapi.mlb.com/api/v1/people/{p['person']['id']}/stats" for p in roster],
+            params=stats_params,
+            headers=HEADERS,
+            timeout=10,
+        )
+        
         # Get stats for each player on the roster
-        for player in roster_data.get('roster', []):
-            player_id = player['person']['id']
+        for player, stats_data in zip(roster, roster_stats):
             player_name = player['person']['fullName']
             position = player.get('position', {}).get('abbreviation', 'Unknown')
             
-            # Fetch individual player stats
-            stats_url = f"https://statsapi.mlb.com/api/v1/people/{player_id}/stats"
-            stats_params = {
-                'stats': 'season',
-                'group': 'hitting',
-                'season': year
-            }
-            
             try:
-                stats_response = requests.get(stats_url, params=stats_params, headers=HEADERS, timeout=10)
-                stats_response.raise_for_status()
-                stats_data = stats_response.json()
+                if stats_data is None:
+                    raise ValueError("no response from stats API")
                 
                 if stats_data.get('stats') and len(stats_data['stats']) > 0:
                     if stats_data['stats'][0].get('splits') and len(stats_data['stats'][0]['splits']) > 0:
@@ -187,41 +193,20 @@ def save_dataframe(df, path_without_extension, formats):
             df.to_parquet(file_path, index=False)
 
 
-def save_to_s3(df, base_path, s3_bucket, formats=["csv", "json", "parquet"]):
-    """Save Pandas DataFrame in specified formats and upload to S3 bucket"""
-    # Use environment variables if available (GitHub Actions), otherwise use local profile
-    if os.getenv('AWS_ACCESS_KEY_ID') and os.getenv('AWS_SECRET_ACCESS_KEY'):
-        session = boto3.Session(
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name='us-west-1'  
-        )
-        logging.info("Using AWS credentials from environment variables")
-    else:
-        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
-        session = boto3.Session(profile_name=profile_name, region_name='us-west-1')
-        logging.info(f"Using AWS profile: {profile_name}")
-    
-    s3_resource = session.resource("s3")
-
+def save_to_s3(df, base_path, formats=["csv", "json", "parquet"]):
+    """Save Pandas DataFrame in specified formats to S3 (CSV/JSON gzipped by the publisher)"""
+    items = []
     for fmt in formats:
-        file_path = f"{base_path}.{fmt}"
-        buffer = BytesIO()
-        if fmt == "csv":
-            df.to_csv(buffer, index=False)
-            content_type = "text/csv"
-        elif fmt == "json":
-            df.to_json(buffer, orient="records", lines=True)
-            content_type = "application/json"
-        elif fmt == "parquet":
-            df.to_parquet(buffer, index=False)
-            content_type = "application/octet-stream"
-
-        buffer.seek(0)
-        s3_resource.Bucket(s3_bucket).put_object(
-            Key=file_path, Body=buffer, ContentType=content_type
-        )
-        logging.info(f"Uploaded {fmt} to {s3_bucket}/{file_path}")
+        # JSON stays line-delimited, like the local copy
+        if fmt == "json":
+            body = df.to_json(orient="records", lines=True).encode("utf-8")
+        else:
+            body = publisher.serialize(df, fmt)
+        items.append({"key": f"{base_path}.{fmt}", "body": body, "content_type": publisher.CONTENT_TYPES[fmt]})
+    results = publisher.publish(items)
+    failed = [r["key"] for r in results if r.get("method") == "error"]
+    if failed:
+        raise RuntimeError(f"S3 upload failed for {', '.join(failed)}")
 
 
 def main():
@@ -234,11 +219,11 @@ def main():
     
     # Load historical archives
     logging.info("Loading historical batting archives")
-    player_totals_archive_df = pd.read_parquet(
+    player_totals_archive_df = read_archive(
         "https://stilesdata.com/dodgers/data/batting/archive/dodgers_player_batting_statistics_1958_2024.parquet"
     )
     
-    team_totals_archive_df = pd.read_parquet(
+    team_totals_archive_df = read_archive(
         "https://stilesdata.com/dodgers/data/batting/archive/dodgers_team_batting_statistics_1958_2024.parquet"
     )
     
@@ -282,7 +267,7 @@ def main():
     # They're now fetched by script 03_scrape_league_ranks.py
     # We'll just load the historical ranks for archival purposes
     try:
-        team_ranks_archive_df = pd.read_parquet(
+        team_ranks_archive_df = read_archive(
             "https://stilesdata.com/dodgers/data/batting/archive/dodgers_team_batting_rankings_1958_2024.parquet"
         )
         team_ranks_full_df = team_ranks_archive_df.copy()
@@ -319,18 +304,15 @@ def main():
     save_to_s3(
         players_full_df,
         "dodgers/data/batting/dodgers_player_batting_1958_present",
-        "stilesdata.com",
     )
     save_to_s3(
         team_full_df,
         "dodgers/data/batting/dodgers_team_batting_1958_present",
-        "stilesdata.com",
     )
     if not team_ranks_full_df.empty:
         save_to_s3(
             team_ranks_full_df,
             "dodgers/data/batting/dodgers_team_batting_ranks_1958_present",
-            "stilesdata.com",
         )
     
     logging.info("Batting data fetch and processing complete!")
@@ -7,11 +7,10 @@ This replaces Baseball Reference with the faster MLB Stats API for current seaso
 """
 
 import os
-import boto3
 import pandas as pd
-import requests
+import http_client
+import publisher
 import logging
-from io import BytesIO
 from datetime import datetime
 
 # Configure logging
@@ -36,7 +35,7 @@ def fetch_team_pitching_stats():
     }
     
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=30)
+        response = http_client.get(url, params=params, headers=HEADERS, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -100,45 +99,12 @@ def save_dataframe(df, path_without_extension, formats):
             logging.warning(f"Unsupported format: {file_format}")
 
 
-def save_to_s3(df, base_path, s3_bucket, formats=["csv", "json", "parquet"]):
-    """Save Pandas DataFrame in specified formats and upload to S3 bucket"""
-    # Use environment variables if available (GitHub Actions), otherwise use local profile
-    if os.getenv('AWS_ACCESS_KEY_ID') and os.getenv('AWS_SECRET_ACCESS_KEY'):
-        session = boto3.Session(
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name='us-west-1'
-        )
-        logging.info("Using AWS credentials from environment variables")
-    else:
-        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
-        session = boto3.Session(profile_name=profile_name, region_name='us-west-1')
-        logging.info(f"Using AWS profile: {profile_name}")
-    
-    s3_resource = session.resource("s3")
-
-    for fmt in formats:
-        file_path = f"{base_path}.{fmt}"
-        buffer = BytesIO()
-        if fmt == "csv":
-            df.to_csv(buffer, index=False)
-            content_type = "text/csv"
-        elif fmt == "json":
-            df.to_json(buffer, indent=4, orient="records")
-            content_type = "application/json"
-        elif fmt == "parquet":
-            df.to_parquet(buffer, index=False)
-            content_type = "application/vnd.apache.parquet"
-        
-        buffer.seek(0)
-        try:
-            s3_resource.Bucket(s3_bucket).put_object(
-                Key=file_path, Body=buffer, ContentType=content_type
-            )
-            logging.info(f"Uploaded {fmt} to {s3_bucket}/{file_path}")
-        except Exception as e:
-            logging.error(f"Failed to upload {fmt} to {s3_bucket}/{file_path}: {e}")
-            raise
+def save_to_s3(df, base_path, formats=["csv", "json", "parquet"]):
+    """Save Pandas DataFrame in specified formats to S3 (CSV/JSON gzipped by the publisher)"""
+    results = publisher.publish_dataframe(df, base_path, formats, json_indent=4)
+    failed = [r["key"] for r in results if r.get("method") == "error"]
+    if failed:
+        raise RuntimeError(f"S3 upload failed for {', '.join(failed)}")
 
 
 def main():
@@ -168,13 +134,11 @@ def main():
     save_to_s3(
         totals,
         "dodgers/data/pitching/dodgers_pitching_totals_current",
-        "stilesdata.com",
     )
     # Don't upload empty ranks file
     # save_to_s3(
     #     ranks,
     #     "dodgers/data/pitching/dodgers_pitching_ranks_current",
-    #     "stilesdata.com",
     # )
     
     logging.info("Pitching data fetch and processing complete!")
@@ -10,12 +10,13 @@ This notebook extracts key statistics from the project's processed tables for di
 import os
 from typing import Union
 import pandas as pd
-import boto3
-from io import BytesIO
 import logging
 from datetime import datetime, timezone, timedelta, date
 import json
 import requests
+import http_client
+import publisher
+from dataset_registry import read_dataset
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -53,14 +54,12 @@ def get_pacific_date():
 # Store the update date
 update_date = get_pacific_date()
 
-def read_parquet_s3(url, sort_by=None):
-    """Read a Parquet file from the S3 URL.
+def read_parquet_s3(url, sort_by=None, columns=None, filters=None):
+    """Read a Parquet file from the S3 URL (cached locally by dataset_registry).
+    Only the given columns and rows matching filters are decoded.
     Only sort the dataframe if a sort column is provided.
     Batting doesn't have game dates because it's annual totals."""
-    df = pd.read_parquet(url)
-    if sort_by and sort_by in df.columns:
-        df.sort_values(sort_by, ascending=False, inplace=True)
-    return df
+    return read_dataset(url, columns=columns, filters=filters, sort_by=sort_by)
 
 def to_ordinal(n):
     # Ensure n is an integer before performing modulo and dictionary lookup
@@ -185,13 +184,17 @@ except json.JSONDecodeError:
 
 
 # Standings
-standings = read_parquet_s3(standings_url, sort_by='game_date').query(f"year == {year}")
+standings = read_parquet_s3(standings_url, sort_by='game_date', filters=[('year', '==', int(year))])
 # Remove "-wo" suffix if present (walkoff wins/losses)
 standings['result'] = standings['result'].str.replace('-wo', '', regex=False)
 standings['opp_name'] = standings['opp'].map(mlb_teams)
 # Create result_clean column
 standings['result_clean'] = standings['result'].map({'W': 'win', 'L': 'loss', 'T': 'tie'})
-standings_past = read_parquet_s3(standings_url, sort_by='game_date').query(f"year == {last_year}")
+standings_past = read_parquet_s3(
+    standings_url, sort_by='game_date',
+    columns=['gm', 'year', 'game_date', 'wins', 'losses', 'record', 'win_pct', 'r', 'ra'],
+    filters=[('year', '==', int(last_year))],
+)
 # Get most recent game (standings is sorted by game_date descending, so first row is latest)
 standings_now = standings.iloc[[0]].copy() if not standings.empty else pd.DataFrame()
 # Prefer local _data standings file (same one the site tables use); fallback to remote
@@ -207,7 +210,7 @@ try:
             else:
                 standings_live = pd.DataFrame(data)
     else:
-        response = requests.get(standings_live_url)
+        response = http_client.get(standings_live_url)
         data = response.json()
         # Handle new metadata structure
         if isinstance(data, dict) and 'teams' in data:
@@ -215,7 +218,7 @@ try:
         else:
             standings_live = pd.DataFrame(data)
 except Exception:
-    response = requests.get(standings_live_url)
+    response = http_client.get(standings_live_url)
     data = response.json()
     # Handle new metadata structure
     if isinstance(data, dict) and 'teams' in data:
@@ -275,7 +278,7 @@ if isinstance(games_up_back_value, (int, float)):
 # Note: Removed problematic secondary fallback that was overriding correct 0 values for ties
 
 # Batting
-batting = read_parquet_s3(batting_url)
+batting = read_parquet_s3(batting_url, columns=['season', 'g', 'hr', 'ba', 'obp', 'slg', 'ops', '2b', 'sb'])
 batting_past = batting.query(f"season != '{year}'").copy()
 batting_now = batting.query(f"season == '{year}'").copy()
 # batting_ranks = read_parquet_s3(batting_ranks_url, sort_by='game_date').query(f"season == '{year}'") # Removed
@@ -291,7 +294,7 @@ def fetch_fielding_stats():
         headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36',
         }
-        response = requests.get(fielding_url, headers=headers, timeout=30)
+        response = http_client.get(fielding_url, headers=headers, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -418,7 +421,7 @@ def run_differential(standings, standings_live_lad=None):
                 with open(att_path, 'r') as _f:
                     att_data = json.load(_f)
             else:
-                att_data = requests.get(att_url, timeout=15).json()
+                att_data = http_client.get(att_url, timeout=15).json()
             lad_att = [t for t in att_data if 'Dodgers' in t.get('team', '')]
             if lad_att and lad_att[0].get('attend_game'):
                 mean_attendance = float(lad_att[0]['attend_game'])
@@ -485,7 +488,7 @@ def get_projection_final_mean(local_path: str, remote_url: str) -> int:
 
     if data is None:
         try:
-            resp = requests.get(remote_url, timeout=20)
+            resp = http_client.get(remote_url, timeout=20)
             resp.raise_for_status()
             data = resp.json()
         except Exception:
@@ -519,7 +522,7 @@ def get_live_last_game_summary():
     url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId=119&startDate={five_days_ago.strftime('%Y-%m-%d')}&endDate={today.strftime('%Y-%m-%d')}&hydrate=team,linescore"
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         data = response.json()
         
@@ -587,7 +590,7 @@ def get_live_last_game_result():
     yesterday = today - timedelta(days=1)
     url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId=119&startDate={yesterday.strftime('%Y-%m-%d')}&endDate={today.strftime('%Y-%m-%d')}&hydrate=team,linescore"
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         data = response.json()
         for day in reversed(data.get('dates', [])):
@@ -619,7 +622,7 @@ def get_next_game_info():
     url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId=119&startDate={today.strftime('%Y-%m-%d')}&endDate={ten_days_ahead.strftime('%Y-%m-%d')}&hydrate=team,venue(timezone)"
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         data = response.json()
         
@@ -786,7 +789,7 @@ def generate_summary(
         url = f"https://bdfed.stitch.mlbinfra.com/bdfed/transform-mlb-standings?&splitPcts=false&numberPcts=false&standingsView=division&sortTemplate=3&season={current_year}&leagueIds=103&&leagueIds=104&standingsTypes=regularSeason&contextTeamId=&teamId=&date={today_str}&hydrateAlias=noSchedule&favoriteTeams=119&sortDivisions=201,202,200,204,205,203&sortLeagues=103,104,115,114&sortSports=1"
 
         try:
-            response = requests.get(url, headers=headers)
+            response = http_client.get(url, headers=headers)
             response.raise_for_status()
             json_data = response.json()
             team_records = []
@@ -1087,36 +1090,8 @@ summary_df.to_csv(os.path.join(base_dir, 'data', 'standings', 'season_summary_la
 summary_df.to_json(os.path.join(base_dir, 'data', 'standings', 'season_summary_latest.json'), orient='records', indent=4, lines=False)
 summary_df.to_json(os.path.join(base_dir, '_data', 'season_summary_latest.json'), orient='records', indent=4, lines=False)
 
-def save_to_s3(df, base_path, s3_bucket, formats=["csv", "json"]):
-    # Attempt to use AWS credentials from environment variables first (for GitHub Actions)
-    aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
-    aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-    
-    if aws_access_key_id and aws_secret_access_key:
-        session = boto3.Session(
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name="us-west-1"
-        )
-        logging.info("Using AWS credentials from environment variables for S3 upload.")
-    else:
-        # Fallback to local AWS profile if environment variables are not set
-        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
-        session = boto3.Session(profile_name=profile_name, region_name="us-west-1")
-        logging.info(f"Using AWS profile '{profile_name}' for S3 upload.")
-        
-    s3_resource = session.resource("s3")
-    for fmt in formats:
-        file_path = f"{base_path}.{fmt}"
-        buffer = BytesIO()
-        if fmt == "csv":
-            df.to_csv(buffer, index=False)
-            content_type = "text/csv"
-        elif fmt == "json":
-            df.to_json(buffer, orient="records", indent=4, lines=False)
-            content_type = "application/json"
-        buffer.seek(0)
-        s3_resource.Bucket(s3_bucket).put_object(Key=file_path, Body=buffer, ContentType=content_type)
-        logging.info(f"Uploaded {fmt} to {s3_bucket}/{file_path}")
-
-save_to_s3(summary_df, "dodgers/data/standings/season_summary_latest", "stilesdata.com")
\ No newline at end of file
+# Upload to S3 (gzipped by the publisher)
+results = publisher.publish_dataframe(summary_df, "dodgers/data/standings/season_summary_latest", ["csv", "json"], json_indent=4)
+failed = [r["key"] for r in results if r.get("method") == "error"]
+if failed:
+    raise RuntimeError(f"S3 upload failed for {', '.join(failed)}")
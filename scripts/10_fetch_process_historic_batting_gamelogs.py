@@ -4,27 +4,30 @@
 """
 LA Dodgers game-by-game batting stats from MLB API
 Builds cumulative batting gamelogs for charts (doubles, homers, etc.)
+Incremental: only games missing from the published season file are fetched
+(--full-rebuild refetches everything); finished seasons are frozen.
 """
 
 import os
+import argparse
 import boto3
 import pandas as pd
-import requests
-import json
 import logging
 from datetime import datetime
 from typing import Optional
 from io import BytesIO
 
+import publisher
+from archive_cache import read_archive
+from boxscores_archive import load_archive, regular_season_games
+from fetch_engine import map_concurrent
+from game_feed_cache import get_game_feed
+from gamelog_shards import publish_season_shards
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 DODGERS_TEAM_ID = 119
 BUCKET = "stilesdata.com"
-LOCAL_BOXES = "data/standings/dodgers_boxscores.json"
-
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-}
 
 
 def get_s3_client(profile_name: Optional[str] = None):
@@ -37,36 +40,12 @@ def get_s3_client(profile_name: Optional[str] = None):
     return session.client("s3")
 
 
-def load_boxscores(profile_name: Optional[str] = None) -> pd.DataFrame:
-    """Load boxscores archive from S3 or local"""
-    # Try S3 first
-    try:
-        s3 = get_s3_client(profile_name)
-        obj = s3.get_object(Bucket=BUCKET, Key="dodgers/data/standings/dodgers_boxscores.json")
-        text = obj["Body"].read().decode("utf-8")
-        logging.info(f"Loaded boxscores from S3")
-        return pd.DataFrame(json.loads(text))
-    except Exception as e:
-        logging.warning(f"Could not load from S3: {e}")
-    
-    # Try local
-    if os.path.exists(LOCAL_BOXES):
-        with open(LOCAL_BOXES, 'r') as f:
-            logging.info(f"Loaded boxscores from local: {LOCAL_BOXES}")
-            data = json.load(f)
-        return pd.DataFrame(data)
-    
-    raise FileNotFoundError(f"Could not load boxscores from S3 or local ({LOCAL_BOXES})")
-
-
 def fetch_game_batting_stats(game_pk: int, season: int) -> dict:
     """Fetch batting stats for a single game"""
-    url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
-    
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = get_game_feed(game_pk)
+        if data is None:
+            return None
         
         # Find Dodgers team stats
         dodgers_stats = None
@@ -103,72 +82,106 @@ def fetch_game_batting_stats(game_pk: int, season: int) -> dict:
         return None
 
 
-def build_batting_gamelogs(season: int) -> pd.DataFrame:
-    """Build game-by-game batting stats for the season"""
-    logging.info(f"Loading boxscores for {season}")
-    boxes_df = load_boxscores()
+BATTING_STAT_COLUMNS = [
+    'doubles', 'triples', 'home_runs', 'hits', 'runs', 'rbi',
+    'stolen_bases', 'walks', 'strikeouts', 'left_on_base',
+]
+
+# cumulative column -> per-game column, plus the short historical alias
+CUMULATIVE_COLUMNS = {
+    'cumulative_doubles': ('doubles', '2b_cum'),
+    'cumulative_triples': ('triples', '3b_cum'),
+    'cumulative_home_runs': ('home_runs', 'hr_cum'),
+    'cumulative_hits': ('hits', 'h_cum'),
+    'cumulative_runs': ('runs', 'r_cum'),
+    'cumulative_rbi': ('rbi', 'rbi_cum'),
+    'cumulative_stolen_bases': ('stolen_bases', 'sb_cum'),
+}
+
+
+def load_published_gamelogs(season: int, profile_name: Optional[str] = None) -> pd.DataFrame:
+    """Load the previously published season gamelogs (S3, then local), or an empty frame"""
+    s3_key = f"dodgers/data/batting/dodgers_batting_gamelogs_{season}.parquet"
+    try:
+        s3 = get_s3_client(profile_name)
+        obj = s3.get_object(Bucket=BUCKET, Key=s3_key)
+        df = pd.read_parquet(BytesIO(obj["Body"].read()))
+        logging.info(f"Loaded {len(df)} published games for {season} from S3")
+        return df
+    except Exception as e:
+        logging.warning(f"Could not load published {season} gamelogs from S3: {e}")
     
-    # Filter for current season and final games
-    boxes_df['date'] = pd.to_datetime(boxes_df['date'])
-    boxes_df = boxes_df[
-        (boxes_df['date'].dt.year == season) & 
-        (boxes_df['is_final'] == True)
-    ].sort_values('date').reset_index(drop=True)
+    local_path = f"data/batting/dodgers_batting_gamelogs_{season}.parquet"
+    if os.path.exists(local_path):
+        df = pd.read_parquet(local_path)
+        logging.info(f"Loaded {len(df)} published games for {season} from local: {local_path}")
+        return df
+    return pd.DataFrame()
+
+
+def add_cumulative_columns(df: pd.DataFrame, season: int) -> pd.DataFrame:
+    """Number games in order and (re)compute every cumulative column"""
+    df = df.sort_values(['game_date', 'game_pk']).reset_index(drop=True)
+    df['game_number'] = range(1, len(df) + 1)
     
-    # Exclude spring training
-    march_angels = (
-        (boxes_df['date'].dt.month == 3) & 
-        (boxes_df['opponent_name'].str.contains("Angels", na=False))
-    )
-    boxes_df = boxes_df[~march_angels]
+    # Add year column
+    df['year'] = season
     
-    logging.info(f"Fetching batting stats for {len(boxes_df)} games")
+    # Add gtm alias for game_number (matches historical schema)
+    df['gtm'] = df['game_number']
+    
+    # Cumulative columns (long names for clarity) plus short field name
+    # aliases to match historical data schema
+    cumulative = df[[col for col, _ in CUMULATIVE_COLUMNS.values()]].cumsum()
+    for long_name, (col, short_name) in CUMULATIVE_COLUMNS.items():
+        df[long_name] = cumulative[col]
+        df[short_name] = cumulative[col]
+    
+    return df
+
+
+def build_batting_gamelogs(season: int, boxes_df: pd.DataFrame, existing: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Build game-by-game batting stats for the season
+
+    Games already present in `existing` (the published gamelogs) are reused
+    as-is; only game_pks missing from it are fetched. Pass None or an empty
+    frame to rebuild the season from scratch.
+    """
+    games = regular_season_games(season, boxes_df)
+    games['game_pk'] = games['game_pk'].astype(int)
+    
+    base_columns = ['game_pk', 'game_date'] + BATTING_STAT_COLUMNS
+    if existing is not None and not existing.empty and set(base_columns).issubset(existing.columns):
+        known = existing.loc[existing['game_pk'].astype(int).isin(games['game_pk']), base_columns]
+    else:
+        known = pd.DataFrame(columns=base_columns)
+    
+    to_fetch = games[~games['game_pk'].isin(known['game_pk'].astype(int))]
+    logging.info(f"{season}: {len(known)} games already published, fetching {len(to_fetch)}")
+    
+    # Fetch missing games concurrently; results come back in game order
+    fetched = map_concurrent(lambda pk: fetch_game_batting_stats(pk, season), to_fetch['game_pk'].tolist())
     
     game_stats = []
-    for idx, row in boxes_df.iterrows():
-        game_pk = row['game_pk']
-        game_date = row['date'].strftime('%Y-%m-%d')
-        
-        logging.info(f"Fetching game {idx + 1}/{len(boxes_df)}: {game_date} (PK: {game_pk})")
-        stats = fetch_game_batting_stats(game_pk, season)
+    for stats, game_pk, game_date in zip(fetched, to_fetch['game_pk'], to_fetch['date'].dt.strftime('%Y-%m-%d')):
         if stats:
             stats['game_date'] = game_date
-            stats['game_number'] = idx + 1
             game_stats.append(stats)
         else:
             logging.warning(f"Skipped game {game_pk} - no stats returned")
     
-    logging.info(f"Successfully fetched {len(game_stats)}/{len(boxes_df)} games")
+    logging.info(f"Successfully fetched {len(game_stats)}/{len(to_fetch)} games")
     
-    if not game_stats:
+    frames = [f for f in (known, pd.DataFrame(game_stats, columns=base_columns)) if not f.empty]
+    if not frames:
         logging.error("No batting stats collected")
         return pd.DataFrame()
     
-    df = pd.DataFrame(game_stats)
-    
-    # Add year column
-    df['year'] = season
-    
-    # Add gtm alias for game_number (matches historical schema)
-    df['gtm'] = df['game_number']
-    
-    # Add cumulative columns (long names for clarity)
-    df['cumulative_doubles'] = df['doubles'].cumsum()
-    df['cumulative_triples'] = df['triples'].cumsum()
-    df['cumulative_home_runs'] = df['home_runs'].cumsum()
-    df['cumulative_hits'] = df['hits'].cumsum()
-    df['cumulative_runs'] = df['runs'].cumsum()
-    df['cumulative_rbi'] = df['rbi'].cumsum()
-    df['cumulative_stolen_bases'] = df['stolen_bases'].cumsum()
-    
-    # Add short field name aliases to match historical data schema
-    df['2b_cum'] = df['cumulative_doubles']
-    df['3b_cum'] = df['cumulative_triples']
-    df['hr_cum'] = df['cumulative_home_runs']
-    df['h_cum'] = df['cumulative_hits']
-    df['r_cum'] = df['cumulative_runs']
-    df['rbi_cum'] = df['cumulative_rbi']
-    df['sb_cum'] = df['cumulative_stolen_bases']
+    df = pd.concat(frames, ignore_index=True)
+    df['game_pk'] = df['game_pk'].astype(int)
+    df[BATTING_STAT_COLUMNS] = df[BATTING_STAT_COLUMNS].fillna(0).astype(int)
+    df = add_cumulative_columns(df, season)
     
     logging.info(f"Built batting gamelogs: {len(df)} games")
     return df
@@ -185,45 +198,57 @@ def save_outputs(df: pd.DataFrame, season: int, profile_name: Optional[str] = No
     df.to_parquet(f"{base_path}.parquet", index=False)
     logging.info(f"Saved locally: {base_path}")
     
-    # Upload to S3
-    try:
-        s3 = get_s3_client(profile_name)
-        s3_base = f"dodgers/data/batting/dodgers_batting_gamelogs_{season}"
-        
-        # CSV
-        csv_buf = df.to_csv(index=False).encode('utf-8')
-        s3.put_object(Bucket=BUCKET, Key=f"{s3_base}.csv", Body=csv_buf, ContentType="text/csv")
-        
-        # JSON
-        json_buf = df.to_json(orient='records', indent=2).encode('utf-8')
-        s3.put_object(Bucket=BUCKET, Key=f"{s3_base}.json", Body=json_buf, ContentType="application/json")
-        
-        # Parquet
-        parquet_buf = df.to_parquet(index=False)
-        s3.put_object(Bucket=BUCKET, Key=f"{s3_base}.parquet", Body=parquet_buf)
-        
-        logging.info(f"Uploaded to S3: {s3_base}")
-    except Exception as e:
-        logging.error(f"S3 upload failed: {e}")
+    # Upload to S3 (CSV/JSON gzipped by the publisher; failures are logged there)
+    s3_base = f"dodgers/data/batting/dodgers_batting_gamelogs_{season}"
+    publisher.publish_dataframe(df, s3_base, ["csv", "json", "parquet"], profile_name=profile_name)
 
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Build Dodgers batting gamelogs from the MLB Stats API")
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Ignore published gamelogs and refetch every game (default: only fetch new games)",
+    )
+    parser.add_argument(
+        "--export",
+        choices=["shards", "combined", "both"],
+        default="both",
+        help="1958-present output: per-season shards + index, the single combined JSON, or both (default)",
+    )
+    args = parser.parse_args()
+
     current_season = datetime.now().year
     profile = os.environ.get("AWS_PROFILE", "haekeo" if os.environ.get("GITHUB_ACTIONS") != "true" else None)
     
     # Build 2025 and 2026 seasons
-    seasons_to_build = [2025, current_season]
+    seasons_to_build = sorted({2025, current_season})
     all_new_data = []
     
+    boxes_df = load_archive(profile)
+    if boxes_df.empty:
+        raise FileNotFoundError("Could not load boxscores archive from S3 or local")
+    
     logging.info(f"Will build gamelogs for seasons: {seasons_to_build}")
     for season in seasons_to_build:
         logging.info(f"===== Building batting gamelogs for {season} =====")
-        df_season = build_batting_gamelogs(season)
+        existing = pd.DataFrame() if args.full_rebuild else load_published_gamelogs(season, profile)
+        
+        # Finished seasons are frozen: reuse the published file and never refetch
+        if season < current_season and not existing.empty:
+            logging.info(f"✅ {season} is complete; reusing {len(existing)} published games")
+            all_new_data.append(existing)
+            continue
+        
+        df_season = build_batting_gamelogs(season, boxes_df, existing)
         
         if not df_season.empty:
             all_new_data.append(df_season)
             logging.info(f"✅ Built {len(df_season)} games for {season}")
+            if season < current_season:
+                # Publish once so later runs can treat the season as frozen
+                save_outputs(df_season, season, profile)
         else:
             logging.warning(f"⚠️  No data generated for {season}")
     
@@ -241,7 +266,7 @@ def main():
     HISTORIC_URL = "https://stilesdata.com/dodgers/data/batting/archive/dodgers_team_cumulative_batting_logs_1958_2024.parquet"
     try:
         logging.info("Loading historical batting gamelogs archive (1958-2024)")
-        df_historic = pd.read_parquet(HISTORIC_URL)
+        df_historic = read_archive(HISTORIC_URL)
         logging.info(f"Loaded {len(df_historic)} historical records")
         
         # Combine: historic (1958-2024) + recent (2025-2026)
@@ -251,14 +276,22 @@ def main():
         
         logging.info(f"Combined total: {len(df_combined)} records (years: 1958-{current_season})")
         
-        # Upload combined file to archive path (what the charts use)
-        s3 = get_s3_client(profile)
-        archive_key = "dodgers/data/batting/archive/dodgers_historic_batting_gamelogs"
+        # Per-season shards + index (what the charts use); only new shards are uploaded
+        if args.export in ("shards", "both"):
+            publish_season_shards(
+                df_combined,
+                "dodgers/data/batting/archive/historic_batting_gamelogs",
+                "data/batting/historic_batting_gamelogs_index.json",
+                current_season,
+                profile_name=profile,
+                republish=args.full_rebuild,
+            )
         
-        # JSON (what the chart uses)
-        json_buf = df_combined.to_json(orient='records', indent=2).encode('utf-8')
-        s3.put_object(Bucket=BUCKET, Key=f"{archive_key}.json", Body=json_buf, ContentType="application/json")
-        logging.info(f"Uploaded combined archive to S3: {archive_key}.json")
+        # Single combined JSON (kept for existing consumers of the manifest URL)
+        if args.export in ("combined", "both"):
+            archive_key = "dodgers/data/batting/archive/dodgers_historic_batting_gamelogs"
+            json_buf = df_combined.to_json(orient='records').encode('utf-8')
+            publisher.publish_bytes(f"{archive_key}.json", json_buf, "application/json", profile_name=profile)
         
     except Exception as e:
         logging.error(f"Could not load/combine historical archive: {e}", exc_info=True)
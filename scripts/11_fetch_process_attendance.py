@@ -10,38 +10,16 @@
 # coding: utf-8
 
 import os
-import boto3
 import logging
 import datetime
 import pandas as pd
 import geopandas as gpd
-from io import BytesIO
+
+import publisher
 
 # Set up basic configuration for logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Determine if running in a GitHub Actions environment
-is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
-
-# AWS credentials and session initialization
-aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
-aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-aws_region = "us-west-1"
-
-# Conditional AWS session creation based on the environment
-if is_github_actions:
-    # In GitHub Actions, use environment variables directly
-    session = boto3.Session(
-        aws_access_key_id=aws_key_id,
-        aws_secret_access_key=aws_secret_key,
-        region_name=aws_region
-    )
-else:
-    # Locally, use a specific profile
-    session = boto3.Session(profile_name="haekeo", region_name=aws_region)
-
-s3_resource = session.resource("s3")
-
 # Base directory settings
 base_dir = os.getcwd()
 data_dir = os.path.join(base_dir, 'data', 'standings')
@@ -92,17 +70,5 @@ MERGE GEO/VALUES
 merged = pd.merge(df, gdf.drop(columns=['geometry']), on=['team', 'league'])
 
 
-# Function to save DataFrame to S3 as JSON
-def save_to_s3(df, s3_path, s3_bucket):
-    try:
-        buffer = BytesIO()
-        df.to_json(buffer, orient="records", lines=False)
-        buffer.seek(0)
-        s3_resource.Bucket(s3_bucket).put_object(Key=s3_path, Body=buffer, ContentType="application/json")
-        logging.info(f"Uploaded JSON to {s3_bucket}/{s3_path}")
-    except Exception as e:
-        logging.error(f"Failed to upload JSON to S3: {e}")
-
-# Saving DataFrame to S3
-s3_path = "dodgers/data/standings/mlb_team_attendance.json"
-save_to_s3(merged, s3_path, "stilesdata.com")
+# Saving DataFrame to S3 (gzipped by the publisher; failures are logged there)
+publisher.publish_dataframe(merged, "dodgers/data/standings/mlb_team_attendance", ["json"], json_indent=None)
@@ -8,64 +8,27 @@ Creates tables showing last 10 games and next 10 games
 
 import os
 import pandas as pd
-import requests
-import boto3
 import logging
 from datetime import datetime, timedelta
-from io import BytesIO
 import pytz
 
+import publisher
+from schedule_service import query_games
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 DODGERS_TEAM_ID = 119
 BUCKET = "stilesdata.com"
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-}
-
-
-def get_s3_resource():
-    """Get S3 resource with environment-based credentials"""
-    if os.getenv('GITHUB_ACTIONS') == 'true':
-        session = boto3.Session(
-            aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
-            region_name="us-west-1"
-        )
-    else:
-        profile = os.environ.get("AWS_PROFILE", "haekeo")
-        session = boto3.Session(profile_name=profile, region_name="us-west-1")
-    
-    return session.resource("s3")
-
-
 def fetch_schedule_from_mlb_api(season: int) -> pd.DataFrame:
     """Fetch full season schedule from MLB Stats API"""
-    # Get schedule for entire season
-    start_date = f"{season}-02-01"  # Spring training starts
-    end_date = f"{season}-11-30"    # World Series ends
-    
-    url = "https://statsapi.mlb.com/api/v1/schedule"
-    params = {
-        'sportId': 1,
-        'teamId': DODGERS_TEAM_ID,
-        'startDate': start_date,
-        'endDate': end_date,
-        'hydrate': 'team,linescore'
-    }
-    
     try:
-        response = requests.get(url, params=params, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
+        # Entire season from the shared league-wide schedule
         games = []
-        for date_entry in data.get('dates', []):
-            for game in date_entry.get('games', []):
-                game_data = parse_game(game)
-                if game_data:
-                    games.append(game_data)
+        for game in query_games(season, team_id=DODGERS_TEAM_ID):
+            game_data = parse_game(game)
+            if game_data:
+                games.append(game_data)
         
         if not games:
             logging.error("No games found in schedule")
@@ -176,28 +139,11 @@ def build_schedule_tables(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def save_to_s3(df: pd.DataFrame, base_path: str, bucket: str, formats: list):
-    """Save DataFrame to S3 in multiple formats"""
-    s3 = get_s3_resource()
-    
-    for fmt in formats:
-        try:
-            buffer = BytesIO()
-            if fmt == "csv":
-                df.to_csv(buffer, index=False)
-                content_type = "text/csv"
-            elif fmt == "json":
-                df.to_json(buffer, indent=4, orient="records", lines=False)
-                content_type = "application/json"
-            
-            buffer.seek(0)
-            s3.Bucket(bucket).put_object(
-                Key=f"{base_path}.{fmt}",
-                Body=buffer,
-                ContentType=content_type
-            )
-            logging.info(f"Uploaded {fmt} to {bucket}/{base_path}.{fmt}")
-        except Exception as e:
-            logging.error(f"Failed to upload {fmt} to S3: {e}")
+    """Save DataFrame to S3 in multiple formats (unchanged files are skipped)"""
+    try:
+        publisher.publish_dataframe(df, base_path, formats, json_indent=4)
+    except Exception as e:
+        logging.error(f"Failed to upload {base_path} to S3: {e}")
 
 
 def save_locally(df: pd.DataFrame, base_path: str, formats: list):
@@ -2,41 +2,19 @@
 # coding: utf-8
 
 import os
-import requests
+import http_client
 import datetime
 import pandas as pd
-from io import BytesIO
-import boto3
 import logging
 
+import publisher
+
 
 # Set up basic configuration for logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-# Determine if running in a GitHub Actions environment
-is_github_actions = os.getenv("GITHUB_ACTIONS") == "true"
-
-# AWS credentials and session initialization
-aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
-aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-aws_region = "us-west-1"
-
-# Conditional AWS session creation based on the environment
-if is_github_actions:
-    # In GitHub Actions, use environment variables directly
-    session = boto3.Session(
-        aws_access_key_id=aws_key_id,
-        aws_secret_access_key=aws_secret_key,
-        region_name=aws_region,
-    )
-else:
-    # Locally, use a specific profile
-    session = boto3.Session(profile_name="haekeo", region_name=aws_region)
-
-s3_resource = session.resource("s3")
-
 # Base directory settings
 base_dir = os.getcwd()
 data_dir = os.path.join(base_dir, "data", "pitching")
@@ -55,7 +33,7 @@ headers = {
 }
 
 # Fetch pitcher stats from BDFed API
-pitcher_list = requests.get(
+pitcher_list = http_client.get(
     f"https://bdfed.stitch.mlbinfra.com/bdfed/stats/player?&env=prod&season={year}&sportId=1&stats=season&group=pitching&gameType=R&offset=0&sortStat=inningsPitched&order=desc&teamId=119",
     headers=headers,
 )
@@ -110,29 +88,6 @@ df_final["fetched"] = today.strftime("%Y-%m-%d")
 
 logging.info(f"Found {len(df_final)} pitchers with 10+ IP")
 
-# Function to save DataFrame to S3
-def save_to_s3(df, base_path, s3_bucket, formats):
-    for fmt in formats:
-        try:
-            buffer = BytesIO()
-            if fmt == "csv":
-                df.to_csv(buffer, index=False)
-                content_type = "text/csv"
-            elif fmt == "json":
-                df.to_json(buffer, indent=4, orient="records", lines=False)
-                content_type = "application/json"
-            elif fmt == "parquet":
-                df.to_parquet(buffer, index=False)
-                content_type = "application/octet-stream"
-            buffer.seek(0)
-            s3_resource.Bucket(s3_bucket).put_object(
-                Key=f"{base_path}.{fmt}", Body=buffer, ContentType=content_type
-            )
-            logging.info(f"Uploaded {fmt} to {s3_bucket}/{base_path}.{fmt}")
-        except Exception as e:
-            logging.error(f"Failed to upload {fmt} to S3: {e}")
-
-
 # Saving files locally and to S3
 file_path = os.path.join(data_dir, "dodgers_pitcher_stats_current_table")
 formats = ["csv", "json", "parquet"]
@@ -150,12 +105,7 @@ for fmt in formats:
     except Exception as e:
         logging.error(f"Failed to save local {fmt}: {e}")
 
-# Upload to S3
-save_to_s3(
-    df_final,
-    "dodgers/data/pitching/dodgers_pitcher_stats_current_table",
-    "stilesdata.com",
-    formats,
-)
+# Upload to S3 (CSV/JSON gzipped by the publisher; failures are logged there)
+publisher.publish_dataframe(df_final, "dodgers/data/pitching/dodgers_pitcher_stats_current_table", formats, json_indent=4)
 
 logging.info("Pitcher stats fetch complete!")
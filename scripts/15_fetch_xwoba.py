@@ -9,17 +9,19 @@ This script downloads xwOBA data from Baseball Savant for all current Dodgers pl
 import os
 import sys
 import requests
+import http_client
 import pandas as pd
 from bs4 import BeautifulSoup
 import json
 import time
-import boto3
 import logging
 from io import StringIO
 from datetime import datetime
 import re
 import unicodedata
 
+import publisher
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Get current year dynamically
@@ -30,7 +32,6 @@ output_dir = "data/batting"
 csv_file = f"{output_dir}/dodgers_xwoba_current.csv"
 json_file = f"{output_dir}/dodgers_xwoba_current.json"
 parquet_file = f"{output_dir}/dodgers_xwoba_current.parquet"
-s3_bucket = "stilesdata.com"
 s3_key_csv = "dodgers/data/batting/dodgers_xwoba_current.csv"
 s3_key_json = "dodgers/data/batting/dodgers_xwoba_current.json"
 s3_key_parquet = "dodgers/data/batting/dodgers_xwoba_current.parquet"
@@ -61,29 +62,6 @@ NAME_CORRECTIONS = {
     "hyeseong kim": "hyeseong kim",  # keep as-is; normalization handles hyphens/accents
 }
 
-# AWS session and S3 resource
-# Determine if running in a GitHub Actions environment
-is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
-
-# AWS credentials and session initialization
-aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
-aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-aws_region = "us-west-1"
-
-# Conditional AWS session creation based on the environment
-if is_github_actions:
-    # In GitHub Actions, use environment variables directly
-    session = boto3.Session(
-        aws_access_key_id=aws_key_id,
-        aws_secret_access_key=aws_secret_key,
-        region_name=aws_region
-    )
-else:
-    # Locally, use a specific profile
-    session = boto3.Session(profile_name="haekeo", region_name=aws_region)
-
-s3 = session.resource('s3')
-
 headers = {
     'sec-ch-ua-platform': '"macOS"',
     'Referer': 'https://baseballsavant.mlb.com/savant-player/shohei-ohtani-660271?stats=career-r-hitting-mlb',
@@ -162,7 +140,7 @@ def fetch_player_ids():
     logging.info(f"Making request to: {team_url}")
     
     try:
-        response = requests.get(team_url, headers=headers)
+        response = http_client.get(team_url, headers=headers)
         logging.info(f"Response status code: {response.status_code}")
         
         if response.status_code != 200:
@@ -236,7 +214,7 @@ def fetch_player_xwoba(player_name, player_id):
     }
     
     try:
-        response = requests.get('https://baseballsavant.mlb.com/player-services/rolling-thumb', 
+        response = http_client.get('https://baseballsavant.mlb.com/player-services/rolling-thumb', 
                               params=params, 
                               headers=headers)
         logging.info(f"Response status code for {player_name}: {response.status_code}")
@@ -291,7 +269,7 @@ def fetch_league_average_xwoba(year=None):
     logging.info("Fetching league average xwOBA from rolling leaderboard.")
     url = 'https://baseballsavant.mlb.com/leaderboard/rolling'
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         logging.error(f"Error fetching URL: {e}")
@@ -428,14 +406,13 @@ def main():
             df.to_parquet(parquet_file, index=False)
             logging.info("Data written to JSON, CSV, and Parquet files.")
             
-            # Upload to S3
-            s3.Bucket(s3_bucket).upload_file(csv_file, s3_key_csv)
-            s3.Bucket(s3_bucket).upload_file(json_file, s3_key_json)
-            s3.Bucket(s3_bucket).upload_file(parquet_file, s3_key_parquet)
-            s3.Bucket(s3_bucket).upload_file(
-                f'{output_dir}/league_avg_xwoba.json',
-                'dodgers/data/batting/league_avg_xwoba.json'
-            )
+            # Upload to S3 (unchanged files are skipped)
+            publisher.publish_files({
+                csv_file: s3_key_csv,
+                json_file: s3_key_json,
+                parquet_file: s3_key_parquet,
+                f'{output_dir}/league_avg_xwoba.json': 'dodgers/data/batting/league_avg_xwoba.json',
+            })
             logging.info("Files successfully uploaded to S3.")
         else:
             logging.error("No data was collected from any players.")
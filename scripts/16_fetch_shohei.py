@@ -2,7 +2,7 @@
 # coding: utf-8
 
 import os
-import requests
+import http_client
 import boto3
 import pandas as pd
 import sys
@@ -29,7 +29,7 @@ stars = [
 
 def fetch_shohei_timeseries(season):
     # Get Shohei's playerId for the given season
-    batter_list = requests.get(
+    batter_list = http_client.get(
         f"https://bdfed.stitch.mlbinfra.com/bdfed/stats/player?&env=prod&season={season}&sportId=1&stats=season&group=hitting&gameType=R&offset=0&sortStat=homeRuns&order=desc&teamId=119",
         headers=headers,
     )
@@ -40,7 +40,7 @@ def fetch_shohei_timeseries(season):
         "type": "",
         "season": season,
     }
-    pitch_data = requests.get(
+    pitch_data = http_client.get(
         "https://baseballsavant.mlb.com/player-viz/lookup",
         params=params,
         headers=headers,
@@ -76,7 +76,7 @@ def fetch_shohei_timeseries(season):
 def fetch_shohei_sb_timeseries(season):
     player_id = 660271  # Shohei Ohtani
     url = f"https://statsapi.mlb.com/api/v1/people/{player_id}/stats?stats=gameLog&group=hitting&season={season}"
-    resp = requests.get(url)
+    resp = http_client.get(url)
     data = resp.json()
     games = data.get('stats', [{}])[0].get('splits', [])
     if not games:
@@ -9,6 +9,7 @@ Saves the data locally and uploads to S3.
 import os
 import pandas as pd
 import requests
+import http_client
 from bs4 import BeautifulSoup
 import boto3
 from io import StringIO, BytesIO
@@ -101,7 +102,7 @@ def fetch_lineup_data(current_date_str):
     logging.info(f"Fetching lineup from: {url}")
     
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         logging.error(f"Error fetching URL {url}: {e}")
@@ -333,7 +334,7 @@ def fetch_schedule_data(target_date_iso: str):
         return bool(re.match(r'^\d{1,2}:\d{2}\s?(AM|PM)$', s, flags=re.IGNORECASE))
 
     try:
-        resp = requests.get(schedule_url, timeout=10)
+        resp = http_client.get(schedule_url, timeout=10)
         resp.raise_for_status()
         schedule_data = resp.json()
 
@@ -2,10 +2,20 @@ import pandas as pd
 import numpy as np
 import json
 import os
-import boto3 # Added for S3
-from io import BytesIO # Added for S3
+import argparse
 import logging # Added for logging
 
+import publisher
+from projection_engine import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_SEED,
+    DEFAULT_SIMULATIONS,
+    bootstrap_probability,
+    pythagorean_probability,
+    recent_form_probability,
+    simulate_win_paths,
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -18,155 +28,164 @@ local_output_file_path = os.path.join(output_dir, output_file_name)
 s3_bucket_name = "stilesdata.com"
 s3_object_key = f"dodgers/data/standings/{output_file_name}"
 
-# Ensure the output directory exists for local save
-os.makedirs(output_dir, exist_ok=True)
-
-# Initialize default output structure
-output_data = {
-    "games_played": 0,
-    "current_wins": 0,
-    "current_losses": 0,
-    "timeseries": [],
-    "message": "Data not yet processed."
-}
-
-def upload_json_to_s3(data_dict, bucket_name, object_key):
-    """Uploads a python dictionary as a JSON object to S3."""
-    aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
-    aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-    
-    session_params = {"region_name": "us-west-1"} # Default region
-
-    if aws_access_key_id and aws_secret_access_key:
-        session_params["aws_access_key_id"] = aws_access_key_id
-        session_params["aws_secret_access_key"] = aws_secret_access_key
-        logging.info("Using AWS credentials from environment variables for S3 upload.")
-    else:
-        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
-        session_params["profile_name"] = profile_name
-        logging.info(f"Using AWS profile '{profile_name}' for S3 upload.")
-        
+SEASON_GAMES = 162
+MODELS = ["bootstrap", "recent_form", "pythagorean"]
+
+def upload_json_to_s3(data_dict, object_key):
+    """Uploads a python dictionary as a JSON object to S3 (gzipped by the publisher; failures are logged there)."""
+    publisher.publish_bytes(object_key, json.dumps(data_dict, indent=4).encode('utf-8'), "application/json")
+
+def win_probability(df, model):
+    """Per-game win probability for the remaining games under a model"""
+    if model == "recent_form":
+        return recent_form_probability(df["win"].values)
+    if model == "pythagorean":
+        if "r" not in df.columns or "ra" not in df.columns:
+            raise ValueError("Columns 'r' and 'ra' are required for the pythagorean model.")
+        return pythagorean_probability(df["r"].values, df["ra"].values)
+    return bootstrap_probability(df["win"].values)
+
+def played_timeseries(df):
+    """Actual cumulative wins for the games already played"""
+    return [
+        {
+            "game_number": int(gm),
+            "mean_projected_wins": float(wins),
+            "lower_ci_wins": float(wins),
+            "upper_ci_wins": float(wins),
+        }
+        for gm, wins in zip(df["gm"].to_numpy(), df["cumulative_wins"].to_numpy())
+    ]
+
+def projected_timeseries(games_played, current_wins, result):
+    """Mean and 95% interval of total wins after each remaining game"""
+    lower = np.round(current_wins + result["quantiles"][0.025]).astype(int)
+    upper = np.round(current_wins + result["quantiles"][0.975]).astype(int)
+    means = current_wins + result["mean"]
+    return [
+        {
+            "game_number": games_played + 1 + i,
+            "mean_projected_wins": round(float(mean), 1),
+            "lower_ci_wins": int(lo),
+            "upper_ci_wins": int(hi),
+        }
+        for i, (mean, lo, hi) in enumerate(zip(means, lower, upper))
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Project Dodgers season wins")
+    parser.add_argument("--simulations", type=int, default=DEFAULT_SIMULATIONS, help="Simulated seasons")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Seasons simulated per batch")
+    parser.add_argument("--seed", type=int, default=int(os.environ.get("PROJECTION_SEED", DEFAULT_SEED)),
+                        help="Random seed (reproducible output)")
+    parser.add_argument("--model", choices=MODELS, default="bootstrap", help="Win probability model")
+    args = parser.parse_args()
+
+    # Ensure the output directory exists for local save
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Initialize default output structure
+    output_data = {
+        "games_played": 0,
+        "current_wins": 0,
+        "current_losses": 0,
+        "timeseries": [],
+        "message": "Data not yet processed."
+    }
+    logging.info(f"DEBUG: Initial output_data defined. Target local file: {local_output_file_path}, Target S3: s3://{s3_bucket_name}/{s3_object_key}")
+    run_projection(args, output_data)
+
+def run_projection(args, output_data):
+    """Fill output_data with the played and projected timeseries, then save and upload it"""
     try:
-        session = boto3.Session(**session_params)
-        s3_resource = session.resource("s3")
-        
-        json_buffer = BytesIO(json.dumps(data_dict, indent=4).encode('utf-8'))
-        
-        s3_resource.Bucket(bucket_name).put_object(
-            Key=object_key, 
-            Body=json_buffer, 
-            ContentType="application/json"
-        )
-        logging.info(f"Successfully uploaded JSON to s3://{bucket_name}/{object_key}")
-    except Exception as e:
-        logging.error(f"Failed to upload JSON to S3 (s3://{bucket_name}/{object_key}): {e}")
-
-logging.info(f"DEBUG: Initial output_data defined. Target local file: {local_output_file_path}, Target S3: s3://{s3_bucket_name}/{s3_object_key}")
-
-try:
-    # Load game-by-game results data
-    local_source_data_path = os.path.join(output_dir, "dodgers_wins_losses_current.json")
-    source_data_url = "https://stilesdata.com/dodgers/data/standings/dodgers_wins_losses_current.json"
-
-    if not os.path.exists(local_source_data_path):
-        logging.info(f"Local source file {local_source_data_path} not found. Attempting to fetch from URL: {source_data_url}")
-        df = pd.read_json(source_data_url)
-    else:
-        logging.info(f"Loading data from local source file: {local_source_data_path}")
-        df = pd.read_json(local_source_data_path)
-
-    if df.empty:
-        output_data["message"] = "Source data is empty. No projection possible."
-        logging.warning(output_data["message"])
-    else:
-        if "gm" not in df.columns:
-            raise ValueError("Column 'gm' (game number) not found in source data.")
-        df = df.sort_values(by="gm").reset_index(drop=True)
+        # Load game-by-game results data
+        local_source_data_path = os.path.join(output_dir, "dodgers_wins_losses_current.json")
+        source_data_url = "https://stilesdata.com/dodgers/data/standings/dodgers_wins_losses_current.json"
+
+        if not os.path.exists(local_source_data_path):
+            logging.info(f"Local source file {local_source_data_path} not found. Attempting to fetch from URL: {source_data_url}")
+            df = pd.read_json(source_data_url)
+        else:
+            logging.info(f"Loading data from local source file: {local_source_data_path}")
+            df = pd.read_json(local_source_data_path)
+
+        if df.empty:
+            output_data["message"] = "Source data is empty. No projection possible."
+            logging.warning(output_data["message"])
+        else:
+            if "gm" not in df.columns:
+                raise ValueError("Column 'gm' (game number) not found in source data.")
+            df = df.sort_values(by="gm").reset_index(drop=True)
         
-        if 'win' not in df.columns:
-            if 'result' not in df.columns:
-                 raise ValueError("Column 'result' not found, cannot derive 'win'.")
-            df["win"] = (df["result"] == "W").astype(int)
+            if 'win' not in df.columns:
+                if 'result' not in df.columns:
+                     raise ValueError("Column 'result' not found, cannot derive 'win'.")
+                df["win"] = (df["result"] == "W").astype(int)
 
-        if 'cumulative_wins' not in df.columns:
-            df['cumulative_wins'] = df['win'].cumsum()
+            if 'cumulative_wins' not in df.columns:
+                df['cumulative_wins'] = df['win'].cumsum()
             
-        games_played = len(df)
-        current_wins = int(df["cumulative_wins"].iloc[-1]) if games_played > 0 else 0
-        current_losses = games_played - current_wins
-
-        output_data.update({
-            "games_played": games_played,
-            "current_wins": current_wins,
-            "current_losses": current_losses,
-            "timeseries": [] # Reset timeseries before populating
-        })
-        
-        for index, row in df.iterrows():
-            game_num = int(row["gm"])
-            cum_wins = int(row["cumulative_wins"])
-            output_data["timeseries"].append({
-                "game_number": game_num,
-                "mean_projected_wins": float(cum_wins),
-                "lower_ci_wins": float(cum_wins),
-                "upper_ci_wins": float(cum_wins)
+            games_played = len(df)
+            current_wins = int(df["cumulative_wins"].iloc[-1]) if games_played > 0 else 0
+            current_losses = games_played - current_wins
+
+            output_data.update({
+                "games_played": games_played,
+                "current_wins": current_wins,
+                "current_losses": current_losses,
+                "timeseries": [] # Reset timeseries before populating
             })
-
-        remaining_games = 162 - games_played
-
-        if games_played < 10:
-            output_data["message"] = "Not enough games played for a meaningful projection (minimum 10 games required)."
-            logging.info(output_data["message"])
-        elif remaining_games <= 0:
-            output_data["message"] = "Season complete. All 162 games have been played."
-            logging.info(output_data["message"])
-        else:
-            past_outcomes = df["win"].values
-            n_simulations = 10000
-            boot_simulations_remaining = np.random.choice(past_outcomes, 
-                                                          size=(n_simulations, remaining_games), 
-                                                          replace=True)
-            cumulative_boot_wins_for_remaining_part = np.cumsum(boot_simulations_remaining, axis=1)
-
-            for i in range(remaining_games):
-                game_num_overall = games_played + 1 + i
-                projected_total_wins_at_game_sims = current_wins + cumulative_boot_wins_for_remaining_part[:, i]
-                mean_wins = np.mean(projected_total_wins_at_game_sims)
-                lower_ci = np.percentile(projected_total_wins_at_game_sims, 2.5)
-                upper_ci = np.percentile(projected_total_wins_at_game_sims, 97.5)
-                output_data["timeseries"].append({
-                    "game_number": game_num_overall,
-                    "mean_projected_wins": round(mean_wins, 1),
-                    "lower_ci_wins": int(np.round(lower_ci)),
-                    "upper_ci_wins": int(np.round(upper_ci))
-                })
+        
+            output_data["timeseries"].extend(played_timeseries(df))
+
+            remaining_games = SEASON_GAMES - games_played
+
+            if games_played < 10:
+                output_data["message"] = "Not enough games played for a meaningful projection (minimum 10 games required)."
+                logging.info(output_data["message"])
+            elif remaining_games <= 0:
+                output_data["message"] = "Season complete. All 162 games have been played."
+                logging.info(output_data["message"])
+            else:
+                p = win_probability(df, args.model)
+                result = simulate_win_paths(np.full(remaining_games, p), n_simulations=args.simulations,
+                                            chunk_size=args.chunk_size, seed=args.seed)
+                output_data["timeseries"].extend(projected_timeseries(games_played, current_wins, result))
+                logging.info(f"Simulated {args.simulations:,} seasons ({args.model}, p={p:.3f}, seed={args.seed})")
             
-            output_data["message"] = f"Projection based on bootstrapping {games_played} past game outcomes for {remaining_games} remaining games."
-            logging.info(f"Current record: {current_wins}-{current_losses} ({games_played} games)")
-            final_mean = output_data['timeseries'][-1]['mean_projected_wins']
-            final_lower = output_data['timeseries'][-1]['lower_ci_wins']
-            final_upper = output_data['timeseries'][-1]['upper_ci_wins']
-            logging.info(f"Projected final wins: {final_mean:.1f} (95% CI: {final_lower} - {final_upper})")
-
-except FileNotFoundError:
-    output_data["message"] = f"Error: Source data file not found. Checked local ({local_source_data_path}) and URL ({source_data_url})."
-    logging.error(output_data["message"])
-except pd.errors.EmptyDataError:
-    output_data["message"] = "Error: Source data file is empty."
-    logging.error(output_data["message"])
-except ValueError as ve:
-    output_data["message"] = f"ValueError during data processing: {ve}"
-    logging.error(output_data["message"])
-except Exception as e:
-    output_data["message"] = f"An unexpected error occurred: {e}"
-    logging.error(output_data["message"])
-finally:
-    try:
-        with open(local_output_file_path, 'w') as f:
-            json.dump(output_data, f, indent=4)
-        logging.info(f"Local data saved to {local_output_file_path}")
-    except Exception as e_local_save:
-        logging.error(f"Failed to save data locally to {local_output_file_path}: {e_local_save}")
-
-    # Attempt to upload to S3 regardless of previous outcomes (output_data will have relevant message)
-    upload_json_to_s3(output_data, s3_bucket_name, s3_object_key)
\ No newline at end of file
+                output_data["message"] = (
+                    f"Projection based on bootstrapping {games_played} past game outcomes for {remaining_games} remaining games."
+                    if args.model == "bootstrap" else
+                    f"Projection based on {args.model} win probability from {games_played} past games for {remaining_games} remaining games."
+                )
+                logging.info(f"Current record: {current_wins}-{current_losses} ({games_played} games)")
+                final_mean = output_data['timeseries'][-1]['mean_projected_wins']
+                final_lower = output_data['timeseries'][-1]['lower_ci_wins']
+                final_upper = output_data['timeseries'][-1]['upper_ci_wins']
+                logging.info(f"Projected final wins: {final_mean:.1f} (95% CI: {final_lower} - {final_upper})")
+
+    except FileNotFoundError:
+        output_data["message"] = f"Error: Source data file not found. Checked local ({local_source_data_path}) and URL ({source_data_url})."
+        logging.error(output_data["message"])
+    except pd.errors.EmptyDataError:
+        output_data["message"] = "Error: Source data file is empty."
+        logging.error(output_data["message"])
+    except ValueError as ve:
+        output_data["message"] = f"ValueError during data processing: {ve}"
+        logging.error(output_data["message"])
+    except Exception as e:
+        output_data["message"] = f"An unexpected error occurred: {e}"
+        logging.error(output_data["message"])
+    finally:
+        try:
+            with open(local_output_file_path, 'w') as f:
+                json.dump(output_data, f, indent=4)
+            logging.info(f"Local data saved to {local_output_file_path}")
+        except Exception as e_local_save:
+            logging.error(f"Failed to save data locally to {local_output_file_path}: {e_local_save}")
+
+        # Attempt to upload to S3 regardless of previous outcomes (output_data will have relevant message)
+        upload_json_to_s3(output_data, s3_object_key)
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,18 @@
 import os
 import sys
-import requests
+import http_client
 import pandas as pd
 import logging
 from bs4 import BeautifulSoup
 import json
-import boto3
 import re
 import unicodedata
 import shutil
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
+import publisher
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Output config
@@ -22,28 +23,12 @@ json_file = f"{output_dir}/dodgers_roster_current.json"
 transactions_csv_file = f"{output_dir}/dodgers_transactions_current.csv"
 transactions_json_file = f"{output_dir}/dodgers_transactions_current.json"
 transactions_archive_json_file = f"{output_dir}/dodgers_transactions_archive.json"
-s3_bucket = "stilesdata.com"
 s3_key_csv = "dodgers/data/roster/dodgers_roster_current.csv"
 s3_key_json = "dodgers/data/roster/dodgers_roster_current.json"
 s3_key_transactions_csv = "dodgers/data/roster/dodgers_transactions_current.csv"
 s3_key_transactions_json = "dodgers/data/roster/dodgers_transactions_current.json"
 s3_key_transactions_archive_json = "dodgers/data/roster/dodgers_transactions_archive.json"
 
-# AWS session (same logic as your other scripts)
-is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
-aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
-aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-aws_region = "us-west-1"
-if is_github_actions:
-    session = boto3.Session(
-        aws_access_key_id=aws_key_id,
-        aws_secret_access_key=aws_secret_key,
-        region_name=aws_region
-    )
-else:
-    session = boto3.Session(profile_name="haekeo", region_name=aws_region)
-s3 = session.resource('s3')
-
 def sluggify(name):
     # Remove accents, lowercase, replace spaces with hyphens, remove non-alphanum except hyphens
     name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
@@ -191,7 +176,7 @@ def fetch_transactions():
     with open(transactions_archive_json_file, 'w', encoding='utf-8') as f:
         combined_df.to_json(f, indent=2, orient="records", force_ascii=False)
     logging.info(f"Full transaction archive saved to {transactions_archive_json_file}")
-    s3.Bucket(s3_bucket).upload_file(transactions_archive_json_file, s3_key_transactions_archive_json)
+    publisher.publish_file(transactions_archive_json_file, s3_key_transactions_archive_json)
 
     # Save current view (top 100)
     current_df = combined_df.head(100)
@@ -202,15 +187,17 @@ def fetch_transactions():
     shutil.copy(transactions_json_file, jekyll_data_dir)
     logging.info(f"Top 100 transactions copied to {jekyll_data_dir}")
 
-    s3.Bucket(s3_bucket).upload_file(transactions_csv_file, s3_key_transactions_csv)
-    s3.Bucket(s3_bucket).upload_file(transactions_json_file, s3_key_transactions_json)
+    publisher.publish_files({
+        transactions_csv_file: s3_key_transactions_csv,
+        transactions_json_file: s3_key_transactions_json,
+    })
     logging.info("Current transactions data written and uploaded to S3.")
 
 def main():
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(jekyll_data_dir, exist_ok=True)
     url = "https://www.mlb.com/dodgers/roster/40-man"
-    response = requests.get(url)
+    response = http_client.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     tables = soup.find_all('table', class_='roster__table')
 
@@ -240,9 +227,8 @@ def main():
     shutil.copy(json_file, jekyll_data_dir)
     logging.info(f"Roster data copied to {jekyll_data_dir}")
 
-    # Upload to S3
-    s3.Bucket(s3_bucket).upload_file(csv_file, s3_key_csv)
-    s3.Bucket(s3_bucket).upload_file(json_file, s3_key_json)
+    # Upload to S3 (CSV/JSON gzipped by the publisher; failures are logged there)
+    publisher.publish_files({csv_file: s3_key_csv, json_file: s3_key_json})
     logging.info("Roster data written and uploaded to S3.")
 
     fetch_transactions()
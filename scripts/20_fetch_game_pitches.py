@@ -1,42 +1,31 @@
-import requests
+import json
+import http_client
 import pandas as pd
-from datetime import datetime, timedelta
-from tqdm import tqdm
-import math
+from datetime import datetime
+import numpy as np
 import os
+import shutil
 import sys
 import argparse
-import boto3
+
+from fetch_engine import fetch_json, map_concurrent
+from game_feed_cache import get_game_feed
+from schedule_service import query_games
+import pitch_store
+import publisher
 
 # === Constants ===
-SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+DODGERS_TEAM_ID = 119
 GAMEFEED_URL = "https://baseballsavant.mlb.com/gf"
-LIVE_FEED_URL = "https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
 BALL_RADIUS_FEET = 1.45 / 12
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 MIN_EXPECTED_PITCHES = 40
 
 # === Configuration ===
 OUTPUT_DIR = os.path.join(SCRIPT_DIR, "..", "data", "pitches")
-S3_BUCKET = "stilesdata.com"
 current_year_for_paths = datetime.now().year
-S3_KEY_CSV = f"dodgers/data/pitches/dodgers_pitches_{current_year_for_paths}.csv"
 S3_KEY_JSON = f"dodgers/data/pitches/dodgers_pitches_{current_year_for_paths}.json"
-
-# === AWS Session Setup ===
-is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
-if is_github_actions:
-    aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
-    aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-    aws_region = "us-west-1"
-    session = boto3.Session(
-        aws_access_key_id=aws_key_id,
-        aws_secret_access_key=aws_secret_key,
-        region_name=aws_region
-    )
-else:
-    session = boto3.Session(profile_name="haekeo", region_name="us-west-1")
-s3 = session.resource('s3')
+KNOWN_GAMES_PATH = os.path.join(SCRIPT_DIR, "..", "data", "cache", "pitches", f"known_games_{current_year_for_paths}.json")
 
 # === Date Range for the current regular season ===
 current_year = datetime.now().year
@@ -46,56 +35,60 @@ start_date = datetime(current_year, 3, 20)
 end_date = datetime(current_year, current_month, current_day)
 
 # === Helpers ===
-def daterange(start, end):
-    while start <= end:
-        yield start
-        start += timedelta(days=1)
+def load_known_games(path: str) -> list:
+    """Dodgers games discovered on earlier runs ([{gamePk, team_side, game_date}])"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return []
 
-def _get_team_name(game, team_type):
-    """Safely retrieves a team's name from a game dictionary."""
+def save_known_games(path: str, games: list) -> None:
     try:
-        return game["teams"][team_type]["team"]["name"]
-    except KeyError:
-        return None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(games, f, indent=2)
+    except OSError as e:
+        print(f"⚠️ Could not save known games: {e}")
+
+def get_dodgers_games(start, end, known_games: list) -> list:
+    """
+    Dodgers games between two dates from the shared schedule index.
 
-def get_dodgers_game_ids(date_str):
-    params = {"sportId": 1, "date": date_str}
+    Games already in known_games keep their entry; only days from the last
+    known game onward are looked up, so discovery cost doesn't grow as the
+    season goes on.
+    """
+    by_pk = {g["gamePk"]: g for g in known_games
+             if start.strftime("%Y-%m-%d") <= (g.get("game_date") or "") <= end.strftime("%Y-%m-%d")}
+    since = max([g["game_date"] for g in by_pk.values()] or [start.strftime("%Y-%m-%d")])
     try:
-        resp = requests.get(SCHEDULE_URL, params=params)
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to fetch schedule for {date_str}: {e}")
-        return []
+        games = query_games(team_id=DODGERS_TEAM_ID, start_date=since, end_date=end)
+    except Exception as e:
+        print(f"Failed to fetch schedule from {since}: {e}")
+        games = []
 
-    dates = data.get("dates", [])
-    if not dates:
-        return []
-    
-    games = dates[0].get("games", [])
-    dodgers_games = []
     for g in games:
-        home_team = _get_team_name(g, "home")
-        away_team = _get_team_name(g, "away")
-        game_date = g.get("officialDate")
-
-        if home_team == "Los Angeles Dodgers":
-            dodgers_games.append({"gamePk": g.get("gamePk"), "team_side": "home_batters", "game_date": game_date})
-        elif away_team == "Los Angeles Dodgers":
-            dodgers_games.append({"gamePk": g.get("gamePk"), "team_side": "away_batters", "game_date": game_date})
-    
-    return dodgers_games
+        is_home = g["teams"]["home"]["team"]["id"] == DODGERS_TEAM_ID
+        by_pk[g.get("gamePk")] = {
+            "gamePk": g.get("gamePk"),
+            "team_side": "home_batters" if is_home else "away_batters",
+            "game_date": g.get("officialDate"),
+        }
+    return sorted(by_pk.values(), key=lambda g: (g["game_date"], g["gamePk"]))
 
 def fetch_game_pitches(game_pk):
-    resp = requests.get(GAMEFEED_URL, params={"game_pk": game_pk})
-    resp.raise_for_status()
-    return resp.json()
+    data = fetch_json(GAMEFEED_URL, params={"game_pk": game_pk})
+    if data is None:
+        raise ValueError("no gamefeed returned")
+    return data
 
 def load_existing_json(url: str) -> pd.DataFrame:
+    # Revalidate with ETag so an unchanged season file isn't downloaded again
     try:
-        resp = requests.get(url, timeout=15)
-        if resp.status_code == 200 and resp.content:
-            return pd.DataFrame(resp.json())
+        body, _ = http_client.conditional_get(url, timeout=15)
+        if body:
+            return pd.DataFrame(json.loads(body))
     except Exception:
         pass
     return pd.DataFrame()
@@ -106,10 +99,9 @@ def get_game_status(game_pk: int) -> dict:
     Returns dict with status, total_pitches, and innings_played.
     """
     try:
-        url = LIVE_FEED_URL.format(game_pk=game_pk)
-        resp = requests.get(url, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        data = get_game_feed(game_pk)
+        if data is None:
+            raise ValueError(f"No live feed for game {game_pk}")
         
         game_data = data.get('gameData', {})
         status = game_data.get('status', {})
@@ -131,7 +123,7 @@ def get_game_status(game_pk: int) -> dict:
             'total_pitches': total_pitches,
             'innings_played': current_inning
         }
-    except Exception as e:
+    except Exception:
         return {
             'status': 'Unknown',
             'is_final': False,
@@ -139,29 +131,30 @@ def get_game_status(game_pk: int) -> dict:
             'innings_played': 0
         }
 
-def should_refetch_game(game_pk: int, existing_df: pd.DataFrame, force_refresh_pks: set = None) -> bool:
+def should_refetch_game(game_pk: int, existing_counts: pd.Series, force_refresh_pks: set = None,
+                        get_status=None) -> bool:
     """
     Determine if a game should be re-fetched.
     Returns True if:
     - Game is in force_refresh_pks
     - Game is not final
     - Game has suspiciously low pitch count
+
+    existing_counts is the stored pitch count per game_pk. get_status
+    returns the game's status dict; pass a memoized one so both pitch
+    directions share a single lookup.
     """
     if force_refresh_pks and game_pk in force_refresh_pks:
         return True
     
-    if existing_df.empty or 'game_pk' not in existing_df.columns:
-        return True
-    
-    game_data = existing_df[existing_df['game_pk'] == game_pk]
-    if game_data.empty:
+    if game_pk not in existing_counts.index:
         return True
     
     # Check existing pitch count
-    existing_pitch_count = len(game_data)
+    existing_pitch_count = int(existing_counts[game_pk])
     
     # Fetch game status
-    status_info = get_game_status(game_pk)
+    status_info = get_status() if get_status else get_game_status(game_pk)
     
     # Re-fetch if game is not final
     if not status_info['is_final']:
@@ -181,82 +174,86 @@ def should_refetch_game(game_pk: int, existing_df: pd.DataFrame, force_refresh_p
     
     return False
 
-def analyze_pitches(game_info, batting_side_override: str = None, team_role: str = None):
+# Output column -> Savant gamefeed key, in output order
+PITCH_FIELDS = {
+    "pitch_id": "play_id",
+    "inning": "inning",
+    "ab_number": "ab_number",
+    "pitch_number": "pitch_number",
+    "batter": "batter_name",
+    "pitcher": "pitcher_name",
+    "pitch_name": "pitch_name",
+    "pitch_velocity": "start_speed",
+    "pitch_call": "pitch_call",
+    "at_bat_eventual_result": "result",
+    "at_bat_eventual_desc": "des",
+    "zone": "zone",
+}
+PITCH_COLUMNS = [
+    "game_pk", "game_date", "pitch_id", "inning", "ab_number", "pitch_number", "batter", "pitcher",
+    "pitch_name", "pitch_velocity", "pitch_call", "pitch_in_zone", "at_bat_eventual_result",
+    "at_bat_eventual_desc", "dist_from_sz_center_inches", "dist_from_sz_edge_inches",
+    "inside_margin_inches", "zone", "px", "pz", "sz_bot", "sz_top", "team_role",
+]
+INT_PITCH_COLUMNS = ["inning", "ab_number", "pitch_number", "zone"]
+
+# Strike zone horizontal boundaries (in feet)
+SZ_RIGHT = 0.708
+SZ_LEFT = -0.708
+
+def _float_array(pitches, key):
+    return pd.to_numeric(pd.Series([p.get(key) for p in pitches], dtype=object), errors="coerce").to_numpy(dtype=float)
+
+def analyze_pitches(game_info, data: dict, batting_side_override: str = None, team_role: str = None) -> pd.DataFrame:
+    """
+    Pitch rows for one batting side of a Savant gamefeed payload
+
+    Zone geometry is computed for every pitch at once with NumPy; pitches
+    missing px/pz/sz_bot/sz_top get NaN distances and are not in the zone.
+    """
     game_pk = game_info["gamePk"]
     team_side = batting_side_override if batting_side_override else game_info["team_side"]
     game_date = game_info.get("game_date")
-    try:
-        data = fetch_game_pitches(game_pk)
-    except Exception as e:
-        print(f"⚠️ Failed to fetch game {game_pk}: {e}")
-        return []
 
-    rows = []
-    # Strike zone horizontal boundaries (in feet)
-    sz_right = 0.708 
-    sz_left = -0.708
-
-    for batter_id, pitches in data.get(team_side, {}).items():
-        for pitch in pitches:
-            px = pitch.get("px")
-            pz = pitch.get("pz")
-            sz_bot = pitch.get("sz_bot")
-            sz_top = pitch.get("sz_top")
-
-            dist_from_sz_center_feet = None
-            dist_from_sz_edge_feet = None
-            dist_from_sz_center_inches = None
-            dist_from_sz_edge_inches = None
-            inside_margin_inches = None
-            if all(v is not None for v in [px, pz, sz_bot, sz_top]):
-                # Distance from ball center to closest point on the zone rectangle
-                closest_x = max(sz_left, min(sz_right, px))
-                closest_z = max(sz_bot, min(sz_top, pz))
-                dist_from_sz_center_feet = math.sqrt((px - closest_x)**2 + (pz - closest_z)**2)
-                dist_from_sz_edge_feet = dist_from_sz_center_feet - BALL_RADIUS_FEET
-                dist_from_sz_center_inches = dist_from_sz_center_feet * 12
-                dist_from_sz_edge_inches = dist_from_sz_edge_feet * 12
-
-                # Depth inside zone (from the ball's outside edge to nearest edge)
-                # Compute minimal center-to-edge distance when inside the zone
-                left_gap = px - sz_left
-                right_gap = sz_right - px
-                bottom_gap = pz - sz_bot
-                top_gap = sz_top - pz
-                min_gap_feet = min(left_gap, right_gap, bottom_gap, top_gap)
-                # Positive only when the center is inside the rectangle
-                if min_gap_feet is not None:
-                    inside_margin_inches = max(0.0, (min_gap_feet - BALL_RADIUS_FEET) * 12)
-            
-            in_strike_zone = dist_from_sz_center_feet is not None and dist_from_sz_center_feet <= BALL_RADIUS_FEET
-            
-            rows.append({
-                "game_pk": game_pk,
-                "game_date": game_date,
-                "pitch_id": pitch.get("play_id"),
-                "inning": pitch.get("inning"),
-                "ab_number": pitch.get("ab_number"),
-                "pitch_number": pitch.get("pitch_number"),
-                "batter": pitch.get("batter_name"),
-                "pitcher": pitch.get("pitcher_name"),
-                "pitch_name": pitch.get("pitch_name"),
-                "pitch_velocity": pitch.get("start_speed"),
-                "pitch_call": pitch.get("pitch_call"),
-                "pitch_in_zone": in_strike_zone,
-                "at_bat_eventual_result": pitch.get("result"),
-                "at_bat_eventual_desc": pitch.get("des"),
-                "dist_from_sz_center_inches": dist_from_sz_center_inches,
-                "dist_from_sz_edge_inches": dist_from_sz_edge_inches,
-                "inside_margin_inches": inside_margin_inches,
-                "zone": pitch.get("zone"),
-                "px": px,
-                "pz": pz,
-                "sz_bot": sz_bot,
-                "sz_top": sz_top,
-                "team_role": team_role or "thrown_to_dodgers",
-            })
-    rows.sort(key=lambda p: (p.get('inning', 0), p.get('ab_number', 0), p.get('pitch_number', 0)))
-    return rows
+    pitches = [pitch for batter_pitches in data.get(team_side, {}).values() for pitch in batter_pitches]
+    if not pitches:
+        return pd.DataFrame(columns=PITCH_COLUMNS)
+
+    px = _float_array(pitches, "px")
+    pz = _float_array(pitches, "pz")
+    sz_bot = _float_array(pitches, "sz_bot")
+    sz_top = _float_array(pitches, "sz_top")
+    valid = ~(np.isnan(px) | np.isnan(pz) | np.isnan(sz_bot) | np.isnan(sz_top))
+
+    # Distance from ball center to closest point on the zone rectangle
+    closest_x = np.maximum(SZ_LEFT, np.minimum(SZ_RIGHT, px))
+    closest_z = np.maximum(sz_bot, np.minimum(sz_top, pz))
+    dist_from_sz_center_feet = np.hypot(px - closest_x, pz - closest_z)
+    dist_from_sz_edge_feet = dist_from_sz_center_feet - BALL_RADIUS_FEET
+
+    # Depth inside zone (from the ball's outside edge to nearest edge),
+    # positive only when the center is inside the rectangle
+    min_gap_feet = np.minimum.reduce([px - SZ_LEFT, SZ_RIGHT - px, pz - sz_bot, sz_top - pz])
+    inside_margin_inches = np.maximum(0.0, (min_gap_feet - BALL_RADIUS_FEET) * 12)
+
+    df = pd.DataFrame({col: [p.get(key) for p in pitches] for col, key in PITCH_FIELDS.items()})
+    for col in INT_PITCH_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    df["pitch_velocity"] = pd.to_numeric(df["pitch_velocity"], errors="coerce")
+    df["game_pk"] = game_pk
+    df["game_date"] = game_date
+    df["pitch_in_zone"] = valid & (dist_from_sz_center_feet <= BALL_RADIUS_FEET)
+    df["dist_from_sz_center_inches"] = np.where(valid, dist_from_sz_center_feet * 12, np.nan)
+    df["dist_from_sz_edge_inches"] = np.where(valid, dist_from_sz_edge_feet * 12, np.nan)
+    df["inside_margin_inches"] = np.where(valid, inside_margin_inches, np.nan)
+    df["px"] = px
+    df["pz"] = pz
+    df["sz_bot"] = sz_bot
+    df["sz_top"] = sz_top
+    df["team_role"] = team_role or "thrown_to_dodgers"
+
+    df = df[PITCH_COLUMNS].sort_values(["inning", "ab_number", "pitch_number"], kind="mergesort")
+    return df.reset_index(drop=True)
 
 # === Argument Parsing ===
 parser = argparse.ArgumentParser(description='Fetch Dodgers pitch data from Baseball Savant')
@@ -272,23 +269,28 @@ if args.force_refresh:
         print("⚠️  Invalid game_pk in --force-refresh argument. Ignoring.")
 
 # === Main ===
-all_dodgers_games = []
-total_days = (end_date - start_date).days + 1
-for day in tqdm(daterange(start_date, end_date), total=total_days, desc="Fetching game IDs"):
-    date_str = day.strftime("%Y-%m-%d")
-    games = get_dodgers_game_ids(date_str)
-    all_dodgers_games.extend(games)
+known_games = load_known_games(KNOWN_GAMES_PATH)
+all_dodgers_games = get_dodgers_games(start_date, end_date, known_games)
+save_known_games(KNOWN_GAMES_PATH, all_dodgers_games)
 
 print(f"\nTotal Dodgers games found: {len(all_dodgers_games)}")
 
-all_pitches = []
-all_pitches_thrown_by_dodgers = []
+new_pitches_to = {}
+new_pitches_by = {}
 
-# Load existing datasets from public URLs to support incremental updates
+# Stored pitch counts per game drive the incremental update. The first run
+# against an empty store seeds it from the published season files.
 public_to_url = f"https://stilesdata.com/{S3_KEY_JSON}"
 public_by_url = f"https://stilesdata.com/dodgers/data/pitches/dodgers_pitches_thrown_{current_year_for_paths}.json"
-existing_to_df = load_existing_json(public_to_url)
-existing_by_df = load_existing_json(public_by_url)
+existing_counts = {}
+for role, url in (("thrown_to_dodgers", public_to_url), ("thrown_by_dodgers", public_by_url)):
+    counts = pitch_store.pitch_counts(current_year, role)
+    if counts.empty:
+        pitch_store.seed_season(current_year, role, load_existing_json(url))
+        counts = pitch_store.pitch_counts(current_year, role)
+    existing_counts[role] = counts
+existing_to_counts = existing_counts["thrown_to_dodgers"]
+existing_by_counts = existing_counts["thrown_by_dodgers"]
 
 # Track stats
 stats = {
@@ -299,16 +301,60 @@ stats = {
     'failed': 0
 }
 
-for game_info in tqdm(all_dodgers_games, desc="Analyzing games"):
+def process_game(game_info):
+    """
+    Check and (re)fetch both pitch directions for one game.
+
+    The game's status and its Savant gamefeed are each looked up at most
+    once; both pitch tables come from the same payload.
+    """
     gpk = game_info.get('gamePk')
 
+    status_info = {}
+    def get_status():
+        if not status_info:
+            status_info.update(get_game_status(gpk))
+        return status_info
+
+    should_fetch_to = should_refetch_game(gpk, existing_to_counts, force_refresh_pks, get_status)
+    should_fetch_by = should_refetch_game(gpk, existing_by_counts, force_refresh_pks, get_status)
+    empty = pd.DataFrame(columns=PITCH_COLUMNS)
+    if not (should_fetch_to or should_fetch_by):
+        return False, empty, empty
+
+    try:
+        data = fetch_game_pitches(gpk)
+    except Exception as e:
+        print(f"⚠️ Failed to fetch game {gpk}: {e}")
+        return should_fetch_to, empty, empty
+
     # Pitches thrown to Dodgers batters
-    should_fetch_to = should_refetch_game(gpk, existing_to_df, force_refresh_pks)
+    pitches_to = analyze_pitches(game_info, data, team_role="thrown_to_dodgers") if should_fetch_to else empty
+
+    # Pitches thrown BY Dodgers pitchers
+    pitches_by = empty
+    if should_fetch_by:
+        ts = game_info.get("team_side")
+        other_side = "away_batters" if ts == "home_batters" else "home_batters"
+        pitches_by = analyze_pitches(game_info, data, batting_side_override=other_side, team_role="thrown_by_dodgers")
+
+    return should_fetch_to, pitches_to, pitches_by
+
+# Games are processed concurrently; results come back in schedule order
+print(f"Analyzing {len(all_dodgers_games)} games...")
+results = map_concurrent(process_game, all_dodgers_games)
+
+for game_info, result in zip(all_dodgers_games, results):
+    gpk = game_info.get('gamePk')
+    if result is None:
+        stats['failed'] += 1
+        continue
+    should_fetch_to, pitches, pitches_by = result
+
     if should_fetch_to:
-        pitches = analyze_pitches(game_info, team_role="thrown_to_dodgers")
-        if pitches:
-            all_pitches.extend(pitches)
-            if gpk in existing_to_df.get('game_pk', pd.Series()).values:
+        if not pitches.empty:
+            new_pitches_to[gpk] = pitches
+            if gpk in existing_to_counts.index:
                 stats['refetched'] += 1
             else:
                 stats['fetched'] += 1
@@ -317,133 +363,81 @@ for game_info in tqdm(all_dodgers_games, desc="Analyzing games"):
     else:
         stats['skipped'] += 1
 
-    # Pitches thrown BY Dodgers pitchers
-    should_fetch_by = should_refetch_game(gpk, existing_by_df, force_refresh_pks)
-    if should_fetch_by:
-        ts = game_info.get("team_side")
-        other_side = "away_batters" if ts == "home_batters" else "home_batters"
-        pitches = analyze_pitches(game_info, batting_side_override=other_side, team_role="thrown_by_dodgers")
-        if pitches:
-            all_pitches_thrown_by_dodgers.extend(pitches)
+    if not pitches_by.empty:
+        new_pitches_by[gpk] = pitches_by
 
-print(f"\n=== Collection Summary ===")
+print("\n=== Collection Summary ===")
 print(f"Total games: {stats['total_games']}")
 print(f"Fetched new: {stats['fetched']}")
 print(f"Re-fetched incomplete: {stats['refetched']}")
 print(f"Skipped complete: {stats['skipped']}")
 print(f"Failed: {stats['failed']}")
 
-# === Results ===
-df = pd.DataFrame(all_pitches)
-df_by_dodgers = pd.DataFrame(all_pitches_thrown_by_dodgers)
-
-# Append to existing and dedupe
-def combine_and_dedupe(existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
-    if existing is None or existing.empty:
-        combined = new.copy()
-    elif new is None or new.empty:
-        combined = existing.copy()
-    else:
-        combined = pd.concat([existing, new], ignore_index=True)
-    if combined is None or combined.empty:
-        return pd.DataFrame()
-    subset_cols = [c for c in ['game_pk', 'ab_number', 'pitch_number'] if c in combined.columns]
-    if subset_cols:
-        combined = combined.drop_duplicates(subset=subset_cols)
-    else:
-        if 'pitch_id' in combined.columns:
-            combined = combined.drop_duplicates(subset=['pitch_id'])
-        else:
-            combined = combined.drop_duplicates()
-    return combined
-
-df = combine_and_dedupe(existing_to_df, df)
-df_by_dodgers = combine_and_dedupe(existing_by_df, df_by_dodgers)
+# === Store ===
+# Each new or refetched game replaces only its own partition
+changed_to = pitch_store.write_games(current_year, "thrown_to_dodgers", new_pitches_to)
+changed_by = pitch_store.write_games(current_year, "thrown_by_dodgers", new_pitches_by)
+print(f"Stored partitions: {len(changed_to)} thrown to Dodgers, {len(changed_by)} thrown by Dodgers")
 
 # === Validate final data ===
-print(f"\n=== Data Validation ===")
-if not df.empty and 'game_pk' in df.columns:
-    game_summary = df.groupby('game_pk').size().reset_index(name='pitch_count')
-    low_count_games = game_summary[game_summary['pitch_count'] < MIN_EXPECTED_PITCHES]
+print("\n=== Data Validation ===")
+stored_counts = pitch_store.pitch_counts(current_year, "thrown_to_dodgers")
+if not stored_counts.empty:
+    low_count_games = stored_counts[stored_counts < MIN_EXPECTED_PITCHES]
     if not low_count_games.empty:
         print(f"⚠️  {len(low_count_games)} games with suspiciously low pitch counts:")
-        for _, row in low_count_games.head(10).iterrows():
-            status_info = get_game_status(row['game_pk'])
-            print(f"  Game {row['game_pk']}: {row['pitch_count']} pitches, Status: {status_info['status']}")
+        for game_pk, pitch_count in low_count_games.head(10).items():
+            status_info = get_game_status(game_pk)
+            print(f"  Game {game_pk}: {pitch_count} pitches, Status: {status_info['status']}")
     else:
         print("✓ All games have reasonable pitch counts")
 else:
     print("No data to validate")
 
 # === Export the data ===
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-# Year-specific archive files
-csv_path = os.path.join(OUTPUT_DIR, f"dodgers_pitches_{current_year}.csv")
-json_path = os.path.join(OUTPUT_DIR, f"dodgers_pitches_{current_year}.json")
-csv_path_by = os.path.join(OUTPUT_DIR, f"dodgers_pitches_thrown_{current_year}.csv")
-json_path_by = os.path.join(OUTPUT_DIR, f"dodgers_pitches_thrown_{current_year}.json")
-
-# "Current" versions (for easy frontend reference)
-csv_path_current = os.path.join(OUTPUT_DIR, "dodgers_pitches_current.csv")
-json_path_current = os.path.join(OUTPUT_DIR, "dodgers_pitches_current.json")
-csv_path_by_current = os.path.join(OUTPUT_DIR, "dodgers_pitches_thrown_current.csv")
-json_path_by_current = os.path.join(OUTPUT_DIR, "dodgers_pitches_thrown_current.json")
-
-# Save year-specific files
-df.to_csv(csv_path, index=False)
-print(f"Pitch data saved locally to {csv_path}")
-df.to_json(json_path, indent=4, orient="records")
-print(f"Pitch data saved locally to {json_path}")
-
-# Save "current" files
-df.to_csv(csv_path_current, index=False)
-print(f"Pitch data saved locally to {csv_path_current}")
-df.to_json(json_path_current, indent=4, orient="records")
-print(f"Pitch data saved locally to {json_path_current}")
-
-# Save pitches thrown by Dodgers (year-specific)
-df_by_dodgers.to_csv(csv_path_by, index=False)
-print(f"Pitch data (thrown by Dodgers) saved locally to {csv_path_by}")
-df_by_dodgers.to_json(json_path_by, indent=4, orient="records")
-print(f"Pitch data (thrown by Dodgers) saved locally to {json_path_by}")
-
-# Save pitches thrown by Dodgers ("current")
-df_by_dodgers.to_csv(csv_path_by_current, index=False)
-print(f"Pitch data (thrown by Dodgers) saved locally to {csv_path_by_current}")
-df_by_dodgers.to_json(json_path_by_current, indent=4, orient="records")
-print(f"Pitch data (thrown by Dodgers) saved locally to {json_path_by_current}")
-
-# === Upload to S3 ===
-try:
-    # Upload year-specific archives
-    s3.Bucket(S3_BUCKET).upload_file(csv_path, S3_KEY_CSV)
-    print(f"Successfully uploaded {os.path.basename(csv_path)} to {S3_BUCKET}/{S3_KEY_CSV}")
-    s3.Bucket(S3_BUCKET).upload_file(json_path, S3_KEY_JSON)
-    print(f"Successfully uploaded {os.path.basename(json_path)} to {S3_BUCKET}/{S3_KEY_JSON}")
-
-    # Upload "current" versions
-    s3_key_csv_current = "dodgers/data/pitches/dodgers_pitches_current.csv"
-    s3_key_json_current = "dodgers/data/pitches/dodgers_pitches_current.json"
-    s3.Bucket(S3_BUCKET).upload_file(csv_path_current, s3_key_csv_current)
-    print(f"Successfully uploaded {os.path.basename(csv_path_current)} to {S3_BUCKET}/{s3_key_csv_current}")
-    s3.Bucket(S3_BUCKET).upload_file(json_path_current, s3_key_json_current)
-    print(f"Successfully uploaded {os.path.basename(json_path_current)} to {S3_BUCKET}/{s3_key_json_current}")
-
-    # Upload thrown-by-Dodgers files (year-specific)
-    s3_key_csv_by = f"dodgers/data/pitches/dodgers_pitches_thrown_{current_year_for_paths}.csv"
-    s3_key_json_by = f"dodgers/data/pitches/dodgers_pitches_thrown_{current_year_for_paths}.json"
-    s3.Bucket(S3_BUCKET).upload_file(csv_path_by, s3_key_csv_by)
-    print(f"Successfully uploaded {os.path.basename(csv_path_by)} to {S3_BUCKET}/{s3_key_csv_by}")
-    s3.Bucket(S3_BUCKET).upload_file(json_path_by, s3_key_json_by)
-    print(f"Successfully uploaded {os.path.basename(json_path_by)} to {S3_BUCKET}/{s3_key_json_by}")
-    
-    # Upload thrown-by-Dodgers files ("current")
-    s3_key_csv_by_current = "dodgers/data/pitches/dodgers_pitches_thrown_current.csv"
-    s3_key_json_by_current = "dodgers/data/pitches/dodgers_pitches_thrown_current.json"
-    s3.Bucket(S3_BUCKET).upload_file(csv_path_by_current, s3_key_csv_by_current)
-    print(f"Successfully uploaded {os.path.basename(csv_path_by_current)} to {S3_BUCKET}/{s3_key_csv_by_current}")
-    s3.Bucket(S3_BUCKET).upload_file(json_path_by_current, s3_key_json_by_current)
-    print(f"Successfully uploaded {os.path.basename(json_path_by_current)} to {S3_BUCKET}/{s3_key_json_by_current}")
-except Exception as e:
-    print(f"An error occurred during S3 upload: {e}")
\ No newline at end of file
+def export_season(role: str, base_name: str, label: str, publish: bool = True):
+    """
+    Rebuild the season-level files for one role from the store.
+
+    {base_name}_{year} is written as CSV and JSON locally, and to S3 when
+    `publish`; {base_name}_current is a local copy and a server-side S3
+    copy of it. The local files are always written, since a fresh checkout
+    has none and 21 reads them.
+    """
+    df = pitch_store.load_season(current_year, role)
+    if df.empty:
+        print(f"No stored pitches{label} for {current_year}; season files not written")
+        return
+    year_base = os.path.join(OUTPUT_DIR, f"{base_name}_{current_year}")
+    current_base = os.path.join(OUTPUT_DIR, f"{base_name}_current")
+    if publish:
+        try:
+            publisher.publish_dataframe(
+                df,
+                f"dodgers/data/pitches/{base_name}_{current_year}",
+                ["csv", "json"],
+                aliases=[f"dodgers/data/pitches/{base_name}_current"],
+                local_base=year_base,
+                json_indent=4,
+            )
+        except Exception as e:
+            print(f"An error occurred during S3 upload: {e}")
+    else:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        for ext in ("csv", "json"):
+            with open(f"{year_base}.{ext}", "wb") as f:
+                f.write(publisher.serialize(df, ext, json_indent=4))
+    for ext in ("csv", "json"):
+        if os.path.exists(f"{year_base}.{ext}"):
+            shutil.copyfile(f"{year_base}.{ext}", f"{current_base}.{ext}")
+            print(f"Pitch data{label} saved locally to {year_base}.{ext} and {current_base}.{ext}")
+
+# Both roles are always written locally (21 summarizes them together);
+# S3 is only updated for a role whose partitions changed
+export_season("thrown_to_dodgers", "dodgers_pitches", "", publish=bool(changed_to))
+if not changed_to:
+    print("No changes to pitches thrown to Dodgers; S3 season files left as is")
+
+export_season("thrown_by_dodgers", "dodgers_pitches_thrown", " (thrown by Dodgers)", publish=bool(changed_by))
+if not changed_by:
+    print("No changes to pitches thrown by Dodgers; S3 season files left as is")
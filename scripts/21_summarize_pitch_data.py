@@ -1,46 +1,28 @@
 import json
 import re
-import requests
 import pandas as pd
 import os
-import boto3
-from botocore.exceptions import NoCredentialsError
+
+import publisher
+from game_feed_cache import get_game_feed
 
 # === Configuration ===
 LOCAL_JSON_PATH = "data/summary/umpire_summary.json"
-S3_BUCKET = "stilesdata.com"
 S3_KEY = "dodgers/data/summary/umpire_summary.json"
 
-# === AWS Session Setup ===
-is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
-if is_github_actions:
-    aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
-    aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-    aws_region = "us-west-1"
-    session = boto3.Session(
-        aws_access_key_id=aws_key_id,
-        aws_secret_access_key=aws_secret_key,
-        region_name=aws_region
-    )
-else:
-    session = boto3.Session(profile_name="haekeo", region_name="us-west-1")
-s3 = session.resource('s3')
-
 def upload_to_s3(file_path):
-    """Uploads a file to the configured S3 bucket."""
-    if not S3_BUCKET:
-        print("S3 upload skipped: Bucket name is not configured.")
-        return
-    
+    """Uploads a file to the configured S3 key (gzipped by the publisher)."""
     try:
-        s3.Bucket(S3_BUCKET).upload_file(file_path, S3_KEY)
-        print(f"Successfully uploaded {os.path.basename(file_path)} to {S3_BUCKET}/{S3_KEY}")
+        results = publisher.publish_file(file_path, S3_KEY, content_type="application/json")
     except FileNotFoundError:
         print(f"Error: The file {file_path} was not found for S3 upload.")
-    except NoCredentialsError:
-        print("Error: AWS credentials not found. S3 upload failed.")
+        return
     except Exception as e:
         print(f"An error occurred during S3 upload: {e}")
+        return
+    failed = [r["key"] for r in results if r.get("method") == "error"]
+    if failed:
+        print(f"Error: S3 upload failed for {', '.join(failed)}")
 
 CHALLENGE_RE = re.compile(
     r"^(.+?) challenged \(pitch result\), call on the field was (confirmed|overturned): (.+)$"
@@ -277,10 +259,9 @@ def analyze_pitches(file_path, thrown_by_file_path=None):
     # --- Helper: Fetch Home Plate Umpire for the last game ---
     def get_home_plate_umpire(game_pk: int):
         try:
-            url = f"https://statsapi.mlb.com/api/v1.1/game/{int(game_pk)}/feed/live"
-            resp = requests.get(url, timeout=15)
-            resp.raise_for_status()
-            payload = resp.json()
+            payload = get_game_feed(int(game_pk))
+            if payload is None:
+                return None
             officials = (
                 payload
                 .get("liveData", {})
@@ -12,6 +12,7 @@ import argparse
 import logging
 from datetime import datetime
 import requests
+import http_client
 import tweepy
 import boto3
 from botocore.exceptions import ClientError
@@ -147,7 +148,7 @@ def main():
     # Fetch data
     url = "https://stilesdata.com/dodgers/data/standings/season_summary_latest.json"
     try:
-        response = requests.get(url)
+        response = http_client.get(url)
         response.raise_for_status()
         data = response.json()
     except requests.exceptions.RequestException as e:
@@ -1,7 +1,7 @@
 import re
 import json
 import os
-import requests
+import http_client
 import pandas as pd
 from bs4 import BeautifulSoup
 import boto3
@@ -37,7 +37,7 @@ s3 = session.resource('s3')
 
 # Fetch page content
 url = "https://baseballsavant.mlb.com/savant-player/shohei-ohtani-660271?stats=statcast-r-pitching-mlb&playerType=pitcher"
-html = requests.get(url).text
+html = http_client.get(url).text
 soup = BeautifulSoup(html, "html.parser")
 
 # Locate the JS script with the data
@@ -21,14 +21,14 @@ import json
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
-import requests
 import pandas as pd
 import boto3
 
+from game_feed_cache import get_game_feed
+from schedule_service import query_games
+
 
 DODGERS_TEAM_ID = 119
-SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
-LIVE_FEED_URL_TMPL = "https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 LOCAL_GAMEFEEDS_DIR = os.path.join(BASE_DIR, "data", "gamefeeds")
@@ -71,24 +71,16 @@ def find_local_gamepks(gamefeeds_dir: str) -> List[int]:
 
 def fetch_season_schedule_gamepks(year: int) -> List[Tuple[int, str]]:
     """Return list of (gamePk, date_iso) for all Dodgers games in the given year."""
-    params = {
-        "sportId": 1,
-        "teamId": DODGERS_TEAM_ID,
-        "startDate": f"{year}-03-01",
-        "endDate": f"{year}-11-30",
-    }
-    resp = requests.get(SCHEDULE_URL, params=params, timeout=20)
-    resp.raise_for_status()
-    payload = resp.json()
     out: List[Tuple[int, str]] = []
-    for day in payload.get("dates", []):
-        date_iso = day.get("date")
-        for g in day.get("games", []):
-            try:
-                gpk = int(g.get("gamePk"))
-            except Exception:
-                continue
-            out.append((gpk, date_iso))
+    games = query_games(
+        year, team_id=DODGERS_TEAM_ID, start_date=f"{year}-03-01", end_date=f"{year}-11-30"
+    )
+    for g in games:
+        try:
+            gpk = int(g.get("gamePk"))
+        except Exception:
+            continue
+        out.append((gpk, g.get("officialDate")))
     # Dedupe with preference for first seen
     seen = set()
     result: List[Tuple[int, str]] = []
@@ -110,11 +102,10 @@ def load_existing_output(path: str) -> pd.DataFrame:
 
 
 def fetch_home_plate_umpire(game_pk: int) -> Optional[Dict]:
-    url = LIVE_FEED_URL_TMPL.format(game_pk=game_pk)
     try:
-        resp = requests.get(url, timeout=15)
-        resp.raise_for_status()
-        payload = resp.json()
+        payload = get_game_feed(game_pk)
+        if payload is None:
+            return None
         officials = (
             payload.get("liveData", {}).get("boxscore", {}).get("officials", [])
         )
@@ -1,5 +1,5 @@
 import os
-import requests
+import http_client
 import pandas as pd
 import json
 import logging
@@ -25,7 +25,7 @@ def fetch_roster_data():
     else:
         # Fallback to URL
         s3_key_json = "https://stilesdata.com/dodgers/data/roster/dodgers_roster_current.json"
-        response = requests.get(s3_key_json)
+        response = http_client.get(s3_key_json)
         return response.json()
 
 def get_all_batters():
@@ -64,7 +64,7 @@ def get_next_game_info(series_data):
             current_year = datetime.now().year
             url = f"https://statsapi.mlb.com/api/v1/schedule/postseason?sportId=1&season={current_year}&hydrate=team,venue,linescore&language=en"
             
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             data = response.json()
             
@@ -125,7 +125,7 @@ def fetch_postseason_series():
     for i, url in enumerate(urls):
         try:
             logging.info(f"Trying API URL {i+1}/{len(urls)}")
-            response = requests.get(url)
+            response = http_client.get(url)
             response.raise_for_status()
             data = response.json()
             
@@ -205,7 +205,7 @@ def fetch_postseason_stats(player_id, player_name):
     url = f'https://statsapi.mlb.com/api/v1/people/{player_id}/stats?stats=yearByYear&gameType=P&leagueListId=mlb_hist&group=hitting&hydrate=team(league)&language=en'
     
     try:
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         data = response.json()
         
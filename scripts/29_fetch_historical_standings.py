@@ -12,6 +12,7 @@ import os
 import sys
 import pandas as pd
 import requests
+import http_client
 from bs4 import BeautifulSoup
 import boto3
 from io import StringIO
@@ -68,7 +69,7 @@ def fetch_year_data(year):
     
     try:
         logging.info(f"Fetching data for {year} from {url}")
-        response = requests.get(url, timeout=30)
+        response = http_client.get(url, timeout=30)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.content, 'html.parser')
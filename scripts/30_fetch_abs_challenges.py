@@ -9,17 +9,18 @@ batters, pitchers, and catchers for both the Dodgers and their opponents.
 
 import json
 import os
-import requests
 import pandas as pd
-import boto3
-from botocore.exceptions import NoCredentialsError
 from datetime import datetime, timedelta
 
+from fetch_engine import map_concurrent
+from game_feed_cache import get_game_feed
+import publisher
+from schedule_service import query_games
+
 # === Configuration ===
 OUTPUT_DIR = "data/summary"
 S3_PREFIX = "dodgers/data/summary"
 LOCAL_JSON_PATH = os.path.join(OUTPUT_DIR, "abs_challenges.json")
-S3_BUCKET = "stilesdata.com"
 S3_KEY = f"{S3_PREFIX}/abs_challenges.json"
 DODGERS_TEAM_ID = 119
 
@@ -75,39 +76,6 @@ ARCHIVE_COLUMNS = [
     "result_desc",
 ]
 
-# === AWS Session Setup ===
-is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
-if is_github_actions:
-    aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
-    aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-    aws_region = "us-west-1"
-    session = boto3.Session(
-        aws_access_key_id=aws_key_id,
-        aws_secret_access_key=aws_secret_key,
-        region_name=aws_region
-    )
-else:
-    session = boto3.Session(profile_name="haekeo", region_name="us-west-1")
-s3 = session.resource('s3')
-
-
-def upload_to_s3(file_path, s3_key):
-    """Uploads a file to the configured S3 bucket under the given key."""
-    if not S3_BUCKET:
-        print("S3 upload skipped: Bucket name is not configured.")
-        return
-    
-    try:
-        s3.Bucket(S3_BUCKET).upload_file(file_path, s3_key)
-        print(f"Successfully uploaded {os.path.basename(file_path)} to {S3_BUCKET}/{s3_key}")
-    except FileNotFoundError:
-        print(f"Error: The file {file_path} was not found for S3 upload.")
-    except NoCredentialsError:
-        print("Error: AWS credentials not found. S3 upload failed.")
-    except Exception as e:
-        print(f"An error occurred during S3 upload: {e}")
-
-
 def get_dodgers_games(start_date, end_date):
     """
     Fetch Dodgers game IDs for the date range.
@@ -119,28 +87,12 @@ def get_dodgers_games(start_date, end_date):
     Returns:
         List of game_pk integers
     """
-    url = f"https://statsapi.mlb.com/api/v1/schedule"
-    params = {
-        "sportId": 1,
-        "teamId": DODGERS_TEAM_ID,
-        "startDate": start_date,
-        "endDate": end_date
-    }
-    
     try:
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        game_pks = []
-        for date_obj in data.get("dates", []):
-            for game in date_obj.get("games", []):
-                # Only include completed games; postponed/cancelled games also report 'Final'
-                if (game["status"]["abstractGameState"] == "Final"
-                        and game["status"].get("detailedState", "") not in ("Postponed", "Cancelled")):
-                    game_pks.append(game["gamePk"])
-        
-        return game_pks
+        # Only include completed games; postponed/cancelled games also report 'Final'
+        games = query_games(
+            team_id=DODGERS_TEAM_ID, start_date=start_date, end_date=end_date, completed=True
+        )
+        return [game["gamePk"] for game in games]
     except Exception as e:
         print(f"Error fetching schedule: {e}")
         return []
@@ -156,12 +108,10 @@ def fetch_game_challenges(game_pk):
     Returns:
         List of challenge dicts or empty list if error/no challenges
     """
-    url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
-    
     try:
-        resp = requests.get(url, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        data = get_game_feed(game_pk)
+        if data is None:
+            return []
         
         # Check if game has ABS challenges enabled
         abs_info = data.get("gameData", {}).get("absChallenges", {})
@@ -429,11 +379,11 @@ def main():
     game_pks = get_dodgers_games(start_date, end_date)
     print(f"Found {len(game_pks)} completed games")
     
-    # Fetch challenges from each game
+    # Fetch challenges from each game (concurrently, reported in game order)
     all_challenges = []
-    for game_pk in game_pks:
+    per_game = map_concurrent(fetch_game_challenges, game_pks)
+    for game_pk, challenges in zip(game_pks, per_game):
         print(f"Processing game {game_pk}...", end=" ")
-        challenges = fetch_game_challenges(game_pk)
         if challenges:
             print(f"Found {len(challenges)} challenge(s)")
             all_challenges.extend(challenges)
@@ -457,11 +407,21 @@ def main():
     save_archive(all_challenges, paths["csv_local"], paths["json_local"])
     
     # Upload to S3: year-stamped canonical files plus stable "current" aliases
-    upload_to_s3(LOCAL_JSON_PATH, S3_KEY)
-    upload_to_s3(paths["csv_local"], paths["csv_s3"])
-    upload_to_s3(paths["json_local"], paths["json_s3"])
-    upload_to_s3(paths["csv_local"], paths["csv_s3_current"])
-    upload_to_s3(paths["json_local"], paths["json_s3_current"])
+    # (aliases are server-side copies; unchanged files are skipped)
+    try:
+        publisher.publish_files(
+            {
+                LOCAL_JSON_PATH: S3_KEY,
+                paths["csv_local"]: paths["csv_s3"],
+                paths["json_local"]: paths["json_s3"],
+            },
+            aliases={
+                paths["csv_local"]: [paths["csv_s3_current"]],
+                paths["json_local"]: [paths["json_s3_current"]],
+            },
+        )
+    except Exception as e:
+        print(f"An error occurred during S3 upload: {e}")
     
     # Print summary
     print("\n" + "="*50)
@@ -19,13 +19,13 @@ import json
 import logging
 from datetime import datetime, timezone
 
-import boto3
-import requests
+import http_client
 import pytz
 
+import publisher
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-BUCKET = "stilesdata.com"
 S3_PREFIX = "dodgers/data/markets"
 LOCAL_DIR = "data/markets"
 
@@ -59,20 +59,6 @@ HEADERS = {
 }
 
 
-def get_s3_resource():
-    """Get S3 resource with environment-based credentials."""
-    if os.getenv("GITHUB_ACTIONS") == "true":
-        session = boto3.Session(
-            aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
-            region_name="us-west-1",
-        )
-    else:
-        profile = os.environ.get("AWS_PROFILE", "haekeo")
-        session = boto3.Session(profile_name=profile, region_name="us-west-1")
-    return session.resource("s3")
-
-
 def get_pacific_time():
     """Return current Pacific time as an ISO string."""
     return datetime.now(pytz.timezone("US/Pacific")).isoformat()
@@ -94,7 +80,7 @@ def fetch_candlesticks(series, market):
     url = CANDLES_URL.format(series=series, market=market)
     params = {"period_interval": PERIOD_INTERVAL, "start_ts": START_TS, "end_ts": end_ts}
 
-    resp = requests.get(url, params=params, headers=HEADERS, timeout=30)
+    resp = http_client.get(url, params=params, headers=HEADERS, timeout=30)
     resp.raise_for_status()
     candles = resp.json().get("candlesticks", [])
 
@@ -122,7 +108,7 @@ def fetch_world_series():
     """Build the World Series odds payload."""
     series = fetch_candlesticks(WS_SERIES, WS_MARKET)
 
-    resp = requests.get(MARKET_URL.format(market=WS_MARKET), headers=HEADERS, timeout=30)
+    resp = http_client.get(MARKET_URL.format(market=WS_MARKET), headers=HEADERS, timeout=30)
     resp.raise_for_status()
     market = resp.json().get("market", {}) or {}
 
@@ -148,7 +134,7 @@ def fetch_world_series():
 
 def fetch_nl_mvp():
     """Build the NL MVP payload for the leading contenders."""
-    resp = requests.get(EVENT_URL.format(event=MVP_EVENT), headers=HEADERS, timeout=30)
+    resp = http_client.get(EVENT_URL.format(event=MVP_EVENT), headers=HEADERS, timeout=30)
     resp.raise_for_status()
     markets = resp.json().get("event", {}).get("markets", []) or []
 
@@ -213,16 +199,9 @@ def save_json(payload, name):
         json.dump(payload, f, indent=2)
     logging.info(f"Saved locally: {local_path}")
 
-    try:
-        s3 = get_s3_resource()
-        s3.Bucket(BUCKET).put_object(
-            Key=f"{S3_PREFIX}/{name}.json",
-            Body=json.dumps(payload, indent=2),
-            ContentType="application/json",
-        )
-        logging.info(f"Uploaded to s3://{BUCKET}/{S3_PREFIX}/{name}.json")
-    except Exception as e:
-        logging.error(f"Failed to upload {name} to S3: {e}")
+    # Gzipped by the publisher; a failure is logged there and the local file stands
+    publisher.publish_bytes(f"{S3_PREFIX}/{name}.json", json.dumps(payload, indent=2).encode("utf-8"),
+                            "application/json")
 
 
 def main():
@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+"""
+Simulate the rest of the MLB season and the postseason to estimate playoff odds
+
+Every remaining regular-season game in the league (from schedule_service)
+is played N times at once. Team strength is each club's Pythagorean win
+rate from runs scored and allowed (00_fetch_league_standings.py),
+regressed toward .500. Each game uses a log5 matchup with a home-field
+edge. Final records are seeded under the current format: in each league,
+three division winners and three wild cards; the two best division
+winners get a bye. Then the bracket is played out as series (best-of-3
+wild card, best-of-5 division series, best-of-7 LCS and World Series).
+
+Ties are broken at random rather than by head-to-head records.
+
+Output: data/standings/playoff_odds_{year}.json, with:
+- division, bye, playoff, pennant and World Series odds for every team
+- a daily timeseries of the Dodgers' odds (today's entry replaced on each run)
+
+Usage:
+    python scripts/32_simulate_playoff_odds.py [--simulations 100000] [--seed 162]
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+import publisher
+from projection_engine import PYTHAGOREAN_EXPONENT, log5_probability, series_probability
+from schedule_service import query_games
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CURRENT_YEAR = datetime.now().year
+DODGERS_TEAM_ID = 119
+
+OUTPUT_DIR = os.path.join("data", "standings")
+S3_PREFIX = "dodgers/data/standings"
+
+DEFAULT_SIMULATIONS = 100_000
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_SEED = 162
+
+# Games of .500 ball blended into each team's Pythagorean record
+REGRESSION_GAMES = 50
+# Share of games the home team wins between evenly matched clubs
+HOME_WIN_PCT = 0.54
+
+# Postseason series lengths
+WILD_CARD_GAMES = 3
+DIVISION_SERIES_GAMES = 5
+LCS_GAMES = 7
+WORLD_SERIES_GAMES = 7
+
+# A postponed game's original listing; the rescheduled game is listed separately
+SKIP_STATUSES = {"Postponed", "Cancelled"}
+
+
+def output_paths(year):
+    """Local path and S3 keys (year-stamped and `_current` alias)"""
+    filename = f"playoff_odds_{year}.json"
+    return {
+        "local": os.path.join(OUTPUT_DIR, filename),
+        "s3": f"{S3_PREFIX}/{filename}",
+        "s3_current": f"{S3_PREFIX}/playoff_odds_current.json",
+    }
+
+
+def load_standings(year):
+    """Team records from 00_fetch_league_standings.py"""
+    path = os.path.join(OUTPUT_DIR, f"all_teams_standings_metrics_{year}.json")
+    with open(path, "r") as f:
+        data = json.load(f)
+    teams = data.get("teams", data) if isinstance(data, dict) else data
+    if len(teams) != 30:
+        raise ValueError(f"Expected 30 teams in {path}, found {len(teams)}")
+    return sorted(teams, key=lambda t: t["team_id"])
+
+
+def team_strength(teams):
+    """Pythagorean win rate from runs scored/allowed, regressed toward .500"""
+    rs = np.array([t.get("runs_scored") or 0 for t in teams], dtype=float)
+    ra = np.array([t.get("runs_against") or 0 for t in teams], dtype=float)
+    played = np.array([t.get("games_played") or 0 for t in teams], dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pyth = rs ** PYTHAGOREAN_EXPONENT / (rs ** PYTHAGOREAN_EXPONENT + ra ** PYTHAGOREAN_EXPONENT)
+    pyth = np.where(rs + ra > 0, pyth, 0.5)
+    return (pyth * played + 0.5 * REGRESSION_GAMES) / (played + REGRESSION_GAMES)
+
+
+def remaining_games(year, team_index):
+    """(home, away) team indices of regular-season games not yet played"""
+    games = {}
+    for game in query_games(year, game_types=["R"], completed=False):
+        if game.get("status", {}).get("detailedState") in SKIP_STATUSES:
+            continue
+        teams = game.get("teams", {})
+        home = teams.get("home", {}).get("team", {}).get("id")
+        away = teams.get("away", {}).get("team", {}).get("id")
+        if home in team_index and away in team_index:
+            # Keyed by gamePk so a suspended or moved game counts once
+            games[(game.get("gamePk"), game.get("gameNumber", 1))] = (team_index[home], team_index[away])
+    pairs = np.array(list(games.values()), dtype=np.int64).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def home_win_probability(strength, home, away):
+    """log5 matchup with the odds shifted by home field"""
+    p = log5_probability(strength[home], strength[away])
+    odds = p / (1 - p) * (HOME_WIN_PCT / (1 - HOME_WIN_PCT))
+    return odds / (1 + odds)
+
+
+def simulate_wins(wins, home, away, p_home, n_simulations, chunk_size, rng):
+    """Final win totals, shape (n_simulations, teams)"""
+    n_teams = wins.size
+    totals = np.empty((n_simulations, n_teams), dtype=np.float32)
+    if home.size == 0:
+        totals[:] = wins
+        return totals
+
+    # Away team wins unless the home team does: wins = away games + outcomes @ (home - away)
+    swing = np.zeros((home.size, n_teams), dtype=np.float32)
+    swing[np.arange(home.size), home] += 1
+    swing[np.arange(away.size), away] -= 1
+    base = wins + np.bincount(away, minlength=n_teams)
+    p_home = p_home.astype(np.float32)
+
+    for start in range(0, n_simulations, chunk_size):
+        stop = min(start + chunk_size, n_simulations)
+        home_won = (rng.random((stop - start, home.size), dtype=np.float32) < p_home).astype(np.float32)
+        totals[start:stop] = base + home_won @ swing
+    return totals
+
+
+def play_series(rng, strength, higher, lower, games):
+    """Winner of each simulated series (arrays of team indices)"""
+    p = series_probability(log5_probability(strength[higher], strength[lower]), games)
+    return np.where(rng.random(higher.shape) < p, higher, lower)
+
+
+def seed_league(score, league_teams, divisions):
+    """
+    Playoff seeds 1-6 for one league, shape (n_simulations, 6)
+
+    Seeds 1-3 are division winners by record, 4-6 the best other records.
+    """
+    n = score.shape[0]
+    rows = np.arange(n)[:, None]
+    winners = np.stack([div[np.argmax(score[:, div], axis=1)] for div in divisions], axis=1)
+    winner_order = np.argsort(-score[rows, winners], axis=1)
+    division_seeds = winners[rows, winner_order]
+
+    others = score[:, league_teams].copy()
+    is_winner = (league_teams[None, :, None] == winners[:, None, :]).any(axis=2)
+    others[is_winner] = -np.inf
+    wild_cards = league_teams[np.argsort(-others, axis=1)[:, :3]]
+    return np.concatenate([division_seeds, wild_cards], axis=1)
+
+
+def play_league(rng, strength, seeds):
+    """Pennant winner from seeds: 3 v 6 and 4 v 5, then 1 and 2 host"""
+    wc_a = play_series(rng, strength, seeds[:, 2], seeds[:, 5], WILD_CARD_GAMES)
+    wc_b = play_series(rng, strength, seeds[:, 3], seeds[:, 4], WILD_CARD_GAMES)
+    ds_a = play_series(rng, strength, seeds[:, 0], wc_b, DIVISION_SERIES_GAMES)
+    ds_b = play_series(rng, strength, seeds[:, 1], wc_a, DIVISION_SERIES_GAMES)
+    return play_series(rng, strength, ds_a, ds_b, LCS_GAMES)
+
+
+def simulate_season(teams, home, away, n_simulations=DEFAULT_SIMULATIONS,
+                    chunk_size=DEFAULT_CHUNK_SIZE, seed=DEFAULT_SEED):
+    """
+    Play out the regular season and postseason
+
+    Returns:
+        dict of per-team arrays: mean_wins, division, bye, playoffs,
+        pennant, world_series (shares of simulations)
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(teams)
+    strength = team_strength(teams)
+    wins = np.array([t.get("wins") or 0 for t in teams], dtype=np.float32)
+    p_home = home_win_probability(strength, home, away)
+
+    totals = simulate_wins(wins, home, away, p_home, n_simulations, chunk_size, rng)
+    # Random fraction below one win breaks ties
+    score = totals + rng.random(totals.shape, dtype=np.float32) * 0.5
+
+    counts = {key: np.zeros(n_teams) for key in ("division", "bye", "playoffs", "pennant", "world_series")}
+    champions = []
+    for league in sorted({t["league_name"] for t in teams}):
+        league_teams = np.array([i for i, t in enumerate(teams) if t["league_name"] == league])
+        divisions = [
+            np.array([i for i in league_teams if teams[i]["division_name"] == name])
+            for name in sorted({teams[i]["division_name"] for i in league_teams})
+        ]
+        seeds = seed_league(score, league_teams, divisions)
+        counts["division"] += np.bincount(seeds[:, :3].ravel(), minlength=n_teams)
+        counts["bye"] += np.bincount(seeds[:, :2].ravel(), minlength=n_teams)
+        counts["playoffs"] += np.bincount(seeds.ravel(), minlength=n_teams)
+        pennant = play_league(rng, strength, seeds)
+        counts["pennant"] += np.bincount(pennant, minlength=n_teams)
+        champions.append(pennant)
+
+    if len(champions) == 2:
+        world_series = play_series(rng, strength, champions[0], champions[1], WORLD_SERIES_GAMES)
+        counts["world_series"] += np.bincount(world_series, minlength=n_teams)
+
+    result = {key: value / n_simulations for key, value in counts.items()}
+    result["mean_wins"] = totals.mean(axis=0, dtype=np.float64)
+    result["strength"] = strength
+    return result
+
+
+def build_team_table(teams, result):
+    table = []
+    for i, team in enumerate(teams):
+        table.append({
+            "team_id": team["team_id"],
+            "team_name": team["team_name"],
+            "league_name": team["league_name"],
+            "division_name": team["division_name"],
+            "wins": team.get("wins"),
+            "losses": team.get("losses"),
+            "strength": round(float(result["strength"][i]), 3),
+            "mean_wins": round(float(result["mean_wins"][i]), 1),
+            "division": round(float(result["division"][i]), 4),
+            "bye": round(float(result["bye"][i]), 4),
+            "playoffs": round(float(result["playoffs"][i]), 4),
+            "pennant": round(float(result["pennant"][i]), 4),
+            "world_series": round(float(result["world_series"][i]), 4),
+        })
+    return sorted(table, key=lambda row: (-row["world_series"], -row["playoffs"]))
+
+
+def load_timeseries(path):
+    """Dodgers daily odds from earlier runs this season"""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r") as f:
+            return json.load(f).get("timeseries", [])
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not read previous playoff odds {path}: {e}")
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate MLB playoff odds")
+    parser.add_argument("--year", type=int, default=CURRENT_YEAR)
+    parser.add_argument("--simulations", type=int, default=DEFAULT_SIMULATIONS, help="Simulated seasons")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Seasons simulated per batch")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed (reproducible output)")
+    parser.add_argument("--no-upload", action="store_true", help="Write the local file only")
+    args = parser.parse_args()
+
+    try:
+        teams = load_standings(args.year)
+    except (OSError, ValueError) as e:
+        logging.error(f"Could not load {args.year} standings: {e}")
+        return
+
+    team_index = {t["team_id"]: i for i, t in enumerate(teams)}
+    home, away = remaining_games(args.year, team_index)
+    logging.info(f"Simulating {home.size} remaining games x {args.simulations:,} seasons")
+
+    started = time.perf_counter()
+    result = simulate_season(teams, home, away, args.simulations, args.chunk_size, args.seed)
+    logging.info(f"Simulation finished in {time.perf_counter() - started:.2f}s")
+
+    now = datetime.now(ZoneInfo("America/Los_Angeles"))
+    paths = output_paths(args.year)
+    dodgers = teams[team_index[DODGERS_TEAM_ID]]
+    i = team_index[DODGERS_TEAM_ID]
+    today = {
+        "date": now.strftime("%Y-%m-%d"),
+        "wins": dodgers.get("wins"),
+        "losses": dodgers.get("losses"),
+        "mean_wins": round(float(result["mean_wins"][i]), 1),
+        "division": round(float(result["division"][i]), 4),
+        "bye": round(float(result["bye"][i]), 4),
+        "playoffs": round(float(result["playoffs"][i]), 4),
+        "world_series": round(float(result["world_series"][i]), 4),
+    }
+    timeseries = [row for row in load_timeseries(paths["local"]) if row.get("date") != today["date"]]
+    timeseries = sorted(timeseries + [today], key=lambda row: row["date"])
+
+    output = {
+        "last_updated": now.isoformat(),
+        "season": args.year,
+        "simulations": args.simulations,
+        "remaining_games": int(home.size),
+        "dodgers": today,
+        "timeseries": timeseries,
+        "teams": build_team_table(teams, result),
+    }
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(paths["local"], "w") as f:
+        json.dump(output, f, indent=2)
+    logging.info(f"Saved playoff odds to {paths['local']}")
+    logging.info(
+        f"Dodgers: division {today['division']:.1%}, bye {today['bye']:.1%}, "
+        f"playoffs {today['playoffs']:.1%}, World Series {today['world_series']:.1%}"
+    )
+
+    if not args.no_upload:
+        publisher.publish_file(paths["local"], paths["s3"], aliases=[paths["s3_current"]])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+Build the dashboard's data bundles
+
+The dashboard used to fetch each dataset it draws on its own (about 40
+requests on page load, counting the table blocks repeated in
+dashboard.js). Several of those are full raw datasets of which a chart
+uses three or four columns. This stage runs after the other pipeline
+steps and packs what each chart renders into two files:
+
+    dodgers/data/bundles/dashboard_bundle.json                the charts near the top of the page
+    dodgers/data/bundles/dashboard_bundle_lazy.{sha12}.json   everything below the fold
+
+The first is listed in the manifest (`dashboard_bundle`) and names the
+second, which is content-hashed and immutable. Large tables are trimmed
+to the columns (and rows) the charts read and stored in pandas' "split"
+layout ({"columns": [...], "data": [[...], ...]}); small datasets are
+included whole ({"data": ...}). Neither file carries a timestamp, so a
+run with no new data leaves both unchanged and browsers keep them cached.
+
+A dataset that can't be read is left out, and the page fetches it
+directly (fetchBundled() in assets/js/manifest_loader.js).
+
+Usage:
+    python scripts/33_build_dashboard_bundle.py [--no-upload]
+"""
+
+import os
+import glob
+import json
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import publisher
+from dataset_registry import open_dataset
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CURRENT_YEAR = datetime.now().year
+BASE_URL = "https://stilesdata.com/dodgers/data"
+
+OUTPUT_DIR = os.path.join("data", "bundles")
+S3_PREFIX = "dodgers/data/bundles"
+BUNDLE_NAME = "dashboard_bundle"
+LAZY_NAME = "dashboard_bundle_lazy"
+
+# What each chart in assets/js/dashboard.js reads. `columns` and `rows`
+# trim a table to what's drawn; without them the dataset goes in whole.
+# Keys are the manifest dataset IDs the page asks for.
+CRITICAL_DATASETS = {
+    "wins_losses_current": {
+        "url": f"{BASE_URL}/standings/dodgers_wins_losses_current.json",
+        "columns": ["gm", "run_diff"],
+    },
+    "standings_1958_present": {
+        "url": f"{BASE_URL}/standings/dodgers_standings_1958_present.parquet",
+        "columns": ["year", "gm", "wins"],
+    },
+    "standings_1958_present_optimized": {
+        "url": f"{BASE_URL}/standings/dodgers_standings_1958_present_optimized.json",
+        "columns": ["year", "gm", "gb"],
+    },
+    # Only published during the postseason
+    "postseason_players_current": {
+        "url": f"{BASE_URL}/postseason/dodgers_postseason_stats_{CURRENT_YEAR}.json",
+    },
+    "postseason_series_current": {
+        "url": f"{BASE_URL}/postseason/dodgers_postseason_series_{CURRENT_YEAR}.json",
+    },
+}
+
+LAZY_DATASETS = {
+    "kalshi_world_series": {
+        "url": f"{BASE_URL}/markets/dodgers_kalshi_world_series.json",
+    },
+    "kalshi_nl_mvp": {
+        "url": f"{BASE_URL}/markets/dodgers_kalshi_nl_mvp.json",
+    },
+    "historic_batting_gamelogs": {
+        "url": f"{BASE_URL}/batting/archive/dodgers_historic_batting_gamelogs.json",
+        "columns": ["year", "gtm", "2b_cum", "hr_cum"],
+    },
+    "player_batting_current": {
+        "url": f"{BASE_URL}/batting/dodgers_player_batting_current_table.json",
+        "columns": ["player", "postion", "avg", "obp", "slg", "plateAppearances", "bbper", "hrper", "soper"],
+        "rows": 10,
+    },
+    "xwoba_current": {
+        "url": f"{BASE_URL}/batting/dodgers_xwoba_current.json",
+        "columns": ["player_name", "rn_fwd", "xwoba", "league_avg_xwoba"],
+    },
+    "pitcher_stats_current": {
+        "url": f"{BASE_URL}/pitching/dodgers_pitcher_stats_current_table.json",
+    },
+    "historic_pitching_gamelogs": {
+        "url": f"{BASE_URL}/pitching/dodgers_historic_pitching_gamelogs_1958-present.json",
+        "columns": ["year", "gtm", "era_cum", "so_cum", "h_cum"],
+    },
+    "umpire_summary": {
+        "url": f"{BASE_URL}/summary/umpire_summary.json",
+    },
+    "abs_challenges": {
+        "url": f"{BASE_URL}/summary/abs_challenges.json",
+    },
+    "schedule_current": {
+        "url": f"{BASE_URL}/standings/dodgers_schedule.json",
+    },
+    "mlb_team_attendance": {
+        "url": f"{BASE_URL}/standings/mlb_team_attendance.json",
+    },
+}
+
+
+def source_path(url: str) -> str:
+    """The local copy written by an earlier step (data/ mirrors dodgers/data/), else the cached download"""
+    local = os.path.join("data", url.split("/dodgers/data/", 1)[1])
+    return local if os.path.exists(local) else open_dataset(url)
+
+
+def build_entry(spec: dict) -> dict:
+    """One dataset's bundle entry"""
+    path = source_path(spec["url"])
+    columns = spec.get("columns")
+    if spec["url"].endswith(".parquet"):
+        df = pq.read_table(path, columns=columns).to_pandas()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not columns:
+            return {"data": data}
+        df = pd.DataFrame.from_records(data)
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"missing columns {', '.join(missing)}")
+        df = df[columns]
+    if spec.get("rows"):
+        df = df.head(spec["rows"])
+    return json.loads(df.to_json(orient="split", index=False))
+
+
+def build_bundle(specs: dict) -> dict:
+    """Entries for every dataset that can be read; the rest are left for the page to fetch"""
+    datasets = {}
+    for dataset_id, spec in specs.items():
+        try:
+            datasets[dataset_id] = build_entry(spec)
+        except Exception as e:
+            logging.warning(f"Leaving {dataset_id} out of the bundle: {e}")
+    return datasets
+
+
+def encode(bundle: dict) -> bytes:
+    return json.dumps(bundle, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def write_local(name: str, body: bytes) -> str:
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(OUTPUT_DIR, name)
+    with open(path, "wb") as f:
+        f.write(body)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the dashboard data bundles")
+    parser.add_argument("--no-upload", action="store_true", help="Write the local files only")
+    args = parser.parse_args()
+
+    lazy = build_bundle(LAZY_DATASETS)
+    lazy_body = encode({"datasets": lazy})
+    lazy_file = f"{LAZY_NAME}.{hashlib.sha256(lazy_body).hexdigest()[:12]}.json"
+
+    critical = build_bundle(CRITICAL_DATASETS)
+    bundle = {"datasets": critical, "lazy": {"file": lazy_file, "datasets": sorted(lazy)}}
+    bundle["version"] = hashlib.sha256(encode(bundle)).hexdigest()[:12]
+    body = encode(bundle)
+
+    # Keep one lazy bundle locally: the one the current bundle names
+    for stale in glob.glob(os.path.join(OUTPUT_DIR, f"{LAZY_NAME}.*.json")):
+        if os.path.basename(stale) != lazy_file:
+            os.remove(stale)
+    write_local(lazy_file, lazy_body)
+    path = write_local(f"{BUNDLE_NAME}.json", body)
+    logging.info(f"Bundle {bundle['version']}: {len(critical)} datasets ({len(body):,} bytes), "
+                 f"lazy: {len(lazy)} datasets ({len(lazy_body):,} bytes) -> {path}")
+
+    if args.no_upload:
+        return
+    # The lazy bundle goes first, so the bundle never names a file that isn't there
+    results = publisher.publish_bytes(f"{S3_PREFIX}/{lazy_file}", lazy_body, "application/json",
+                                      extra_args={"CacheControl": publisher.IMMUTABLE_CACHE_CONTROL})
+    if any(r.get("method") == "error" for r in results):
+        logging.error(f"Could not publish {lazy_file}; keeping the published bundle")
+        return
+    publisher.publish_bytes(f"{S3_PREFIX}/{BUNDLE_NAME}.json", body, "application/json")
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,14 @@ This script reads metadata from existing outputs and consolidates into manifest.
 """
 import os
 import json
-import boto3
 from datetime import datetime
 import pytz
 import logging
 
 # Import season phase detector
 from season_phase import detect_season_phase
+import publisher
+from fetch_engine import map_concurrent
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -50,7 +51,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/standings/dodgers_standings_1958_present.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Game-by-game standings 1958-present",
             "cadence": "regular_season_daily",
             "source": "mlb_statsapi",
@@ -61,7 +61,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/standings/dodgers_standings_1958_present_optimized.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Optimized standings (year, gm, win_pct, gb only)",
             "cadence": "regular_season_daily",
             "source": "mlb_statsapi",
@@ -72,7 +71,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/standings/dodgers_wins_losses_current.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Current season wins/losses/run differential",
             "cadence": "regular_season_daily",
             "source": "mlb_statsapi"
@@ -82,7 +80,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/standings/dodgers_schedule.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Last 10 games and next 10 games",
             "cadence": "regular_season_daily",
             "source": "mlb_statsapi"
@@ -92,7 +89,6 @@ def build_manifest():
             "version": "v1",
             "url": f"https://stilesdata.com/dodgers/data/standings/all_teams_standings_metrics_{season}.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Current year standings for all MLB teams",
             "cadence": "regular_season_daily",
             "source": "mlb_statsapi"
@@ -102,7 +98,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/standings/mlb_team_attendance.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "MLB attendance by team",
             "cadence": "regular_season_weekly",
             "source": "baseball_reference_scrape"
@@ -112,7 +107,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/batting/dodgers_player_batting_current_table.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Current season player batting stats",
             "cadence": "regular_season_daily",
             "source": "mlb_bdfed"
@@ -122,7 +116,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/pitching/dodgers_pitcher_stats_current_table.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Current season individual pitcher stats",
             "cadence": "regular_season_daily",
             "source": "mlb_bdfed"
@@ -132,7 +125,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/batting/dodgers_xwoba_current.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Rolling 100 PA xwOBA per player",
             "cadence": "regular_season_daily",
             "source": "baseball_savant"
@@ -142,7 +134,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/batting/shohei_home_runs_cumulative_timeseries_combined.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Shohei Ohtani cumulative home runs",
             "cadence": "regular_season_daily",
             "source": "mlb_bdfed"
@@ -152,7 +143,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/batting/shohei_stolen_bases_cumulative_timeseries_combined.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Shohei Ohtani cumulative stolen bases",
             "cadence": "regular_season_daily",
             "source": "mlb_bdfed"
@@ -162,7 +152,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/batting/archive/dodgers_historic_batting_gamelogs.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Game-by-game batting stats (doubles, homers, hits)",
             "cadence": "regular_season_daily",
             "source": "mlb_statsapi",
@@ -173,18 +162,36 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/pitching/dodgers_historic_pitching_gamelogs_1958-present.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Game-by-game pitching stats (ERA, K's, hits allowed)",
             "cadence": "regular_season_daily",
             "source": "mlb_statsapi",
             "source_historical": "baseball_reference_archives"
         },
+        {
+            "id": "historic_batting_gamelogs_index",
+            "version": "v1",
+            "url": "https://stilesdata.com/dodgers/data/batting/archive/historic_batting_gamelogs/index.json",
+            "content_type": "application/json",
+            "description": "Index of per-season batting gamelog shards (same rows as historic_batting_gamelogs)",
+            "cadence": "regular_season_daily",
+            "source": "mlb_statsapi",
+            "source_historical": "baseball_reference_archives"
+        },
+        {
+            "id": "historic_pitching_gamelogs_index",
+            "version": "v1",
+            "url": "https://stilesdata.com/dodgers/data/pitching/archive/historic_pitching_gamelogs/index.json",
+            "content_type": "application/json",
+            "description": "Index of per-season pitching gamelog shards (same rows as historic_pitching_gamelogs)",
+            "cadence": "regular_season_daily",
+            "source": "mlb_statsapi",
+            "source_historical": "baseball_reference_archives"
+        },
         {
             "id": "shohei_pitch_mix",
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/pitching/shohei_ohtani_pitch_mix.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Shohei Ohtani pitch type distribution",
             "cadence": "regular_season_daily",
             "source": "baseball_savant"
@@ -194,7 +201,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/pitching/shohei_ohtani_pitches.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Shohei Ohtani pitch-by-pitch data",
             "cadence": "regular_season_daily",
             "source": "baseball_savant"
@@ -204,7 +210,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/summary/umpire_summary.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Umpire scorecard summary",
             "cadence": "regular_season_daily",
             "source": "baseball_savant"
@@ -214,7 +219,6 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/summary/abs_challenges.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "ABS challenge tracking",
             "cadence": "regular_season_daily",
             "source": "mlb_statsapi"
@@ -224,7 +228,6 @@ def build_manifest():
             "version": "v1",
             "url": f"https://stilesdata.com/dodgers/data/postseason/dodgers_postseason_stats_{season}.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Current postseason player stats",
             "cadence": "postseason_only",
             "source": "mlb_statsapi"
@@ -234,7 +237,6 @@ def build_manifest():
             "version": "v1",
             "url": f"https://stilesdata.com/dodgers/data/postseason/dodgers_postseason_series_{season}.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Current postseason series journey",
             "cadence": "postseason_only",
             "source": "mlb_statsapi"
@@ -244,17 +246,24 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/standings/dodgers_wins_projection_timeseries.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Projected final wins (simulation)",
             "cadence": "regular_season_daily",
             "source": "derived"
         },
+        {
+            "id": "playoff_odds_current",
+            "version": "v1",
+            "url": f"https://stilesdata.com/dodgers/data/standings/playoff_odds_{season}.json",
+            "content_type": "application/json",
+            "description": "Division, bye, playoff and World Series odds for every team (league simulation), with the Dodgers' daily history",
+            "cadence": "regular_season_daily",
+            "source": "derived"
+        },
         {
             "id": "kalshi_world_series",
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/markets/dodgers_kalshi_world_series.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Kalshi implied probability the Dodgers win the World Series",
             "cadence": "daily",
             "source": "kalshi"
@@ -264,16 +273,88 @@ def build_manifest():
             "version": "v1",
             "url": "https://stilesdata.com/dodgers/data/markets/dodgers_kalshi_nl_mvp.json",
             "content_type": "application/json",
-            "last_updated": get_pacific_time(),
             "description": "Kalshi implied probability for leading NL MVP contenders",
             "cadence": "daily",
             "source": "kalshi"
+        },
+        {
+            "id": "dashboard_bundle",
+            "version": "v1",
+            "url": "https://stilesdata.com/dodgers/data/bundles/dashboard_bundle.json",
+            "content_type": "application/json",
+            "description": "What the dashboard's charts render, trimmed, in one file (names a lazily loaded second bundle for the rest of the page)",
+            "cadence": "daily",
+            "source": "derived"
         }
     ]
     
+    apply_dataset_versions(datasets)
     manifest["datasets"] = datasets
     return manifest
 
+def dataset_key(url):
+    """S3 key for a dataset URL on the public bucket"""
+    return url.replace(f"https://{S3_BUCKET}/", "", 1)
+
+def load_previous_manifest():
+    """Datasets from the last manifest written locally, by id"""
+    try:
+        with open(OUTPUT_FILE, 'r') as f:
+            return {d["id"]: d for d in json.load(f).get("datasets", [])}
+    except Exception:
+        return {}
+
+def head_metadata(key):
+    """Hash, size and modification time of an S3 object"""
+    head = publisher.get_s3_client().head_object(Bucket=S3_BUCKET, Key=key)
+    sha256 = head.get("Metadata", {}).get("sha256")
+    return {
+        "hash": f"sha256:{sha256}" if sha256 else f"md5:{head['ETag'].strip(chr(34))}",
+        "bytes": head["ContentLength"],
+        "last_updated": head["LastModified"],
+    }
+
+def apply_dataset_versions(datasets):
+    """
+    Record a content hash, byte size and true modification time per dataset.
+    `bytes` is the stored size (gzipped where the publisher compressed it),
+    from the change report and HEAD alike.
+
+    The publisher's change report is used where it has the key (it knows
+    when content last changed, not just when it was last written); other
+    keys are looked up with HEAD requests. The front end uses the hash as
+    its cache-buster, so unchanged datasets keep the same URL across runs.
+    Datasets that can't be resolved keep the values from the previous
+    manifest.
+    """
+    pacific = pytz.timezone('US/Pacific')
+    report = publisher.load_report()
+    previous = load_previous_manifest()
+
+    def resolve(dataset):
+        key = dataset_key(dataset["url"])
+        entry = report.get(key)
+        if entry and entry.get("sha256") and entry.get("changed_at"):
+            return {
+                "hash": f"sha256:{entry['sha256']}",
+                "bytes": entry.get("size"),
+                "last_updated": datetime.fromisoformat(entry["changed_at"]),
+            }
+        return head_metadata(key)
+
+    for dataset, meta in zip(datasets, map_concurrent(resolve, datasets)):
+        if meta:
+            dataset["hash"] = meta["hash"]
+            dataset["bytes"] = meta["bytes"]
+            dataset["last_updated"] = meta["last_updated"].astimezone(pacific).isoformat()
+        elif dataset["id"] in previous and previous[dataset["id"]].get("hash"):
+            logging.warning(f"Could not resolve {dataset['id']}; keeping previous version")
+            for field in ("hash", "bytes", "last_updated"):
+                dataset[field] = previous[dataset["id"]].get(field)
+        else:
+            logging.warning(f"Could not resolve {dataset['id']}; no content hash recorded")
+            dataset["last_updated"] = get_pacific_time()
+
 def main():
     """Generate and publish manifest."""
     logging.info("Generating manifest...")
@@ -288,21 +369,10 @@ def main():
     logging.info(f"   Datasets: {len(manifest['datasets'])}")
     
     # Upload to S3
-    is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
-    if is_github_actions:
-        session = boto3.Session(
-            aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
-            region_name="us-west-1"
-        )
-    else:
-        session = boto3.Session(profile_name="haekeo", region_name="us-west-1")
-    
-    s3 = session.resource('s3')
-    s3.Bucket(S3_BUCKET).upload_file(
-        OUTPUT_FILE, 
-        S3_KEY, 
-        ExtraArgs={'ContentType': 'application/json'}
+    # Short-lived so clients pick up new dataset hashes promptly
+    publisher.publish_file(
+        OUTPUT_FILE, S3_KEY, content_type="application/json",
+        extra_args={"CacheControl": "max-age=60"},
     )
     logging.info(f"✅ Manifest uploaded to s3://{S3_BUCKET}/{S3_KEY}")
     logging.info(f"   Public URL: https://stilesdata.com/{S3_KEY}")
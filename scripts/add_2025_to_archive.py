@@ -8,7 +8,7 @@ This is a one-time script to backfill 2025 data that was treated as "current" la
 
 import os
 import pandas as pd
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import boto3
 from io import StringIO
@@ -39,7 +39,7 @@ def fetch_year_data(url, year):
     logging.info(f"Fetching {year} data from Baseball Reference...")
     
     try:
-        response = requests.get(url)
+        response = http_client.get(url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, "html.parser")
         table = soup.find("table", {"id": "team_schedule"})
@@ -12,6 +12,7 @@ Usage:
 """
 
 import argparse
+import gzip
 import os
 import sys
 import pandas as pd
@@ -47,7 +48,11 @@ def load_season_data(year: int, profile_name: Optional[str] = None) -> pd.DataFr
     try:
         s3 = get_s3_client(profile_name)
         obj = s3.get_object(Bucket=BUCKET, Key=f"{STANDINGS_KEY}.json")
-        text = obj["Body"].read().decode("utf-8")
+        body = obj["Body"].read()
+        # Published JSON is stored gzipped (Content-Encoding: gzip)
+        if obj.get("ContentEncoding") == "gzip":
+            body = gzip.decompress(body)
+        text = body.decode("utf-8")
         df = pd.DataFrame(json.loads(text))
         logging.info(f"Loaded standings from S3: {STANDINGS_KEY}.json")
     except Exception as e:
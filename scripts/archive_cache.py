@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+Checksum-pinned local cache for the frozen historical archives
+
+The 1958-2024/2025 archive parquets (standings, batting totals and
+rankings, batting and pitching gamelogs) never change during a season,
+but every run read them again with pd.read_parquet(url). Here each archive
+is downloaded once, checked against the SHA-256 pinned for its URL in
+data/pipeline/archive_lock.json, and converted to an uncompressed Arrow
+IPC (Feather) file under data/cache/archives. Later runs verify that file
+against its recorded checksum and memory-map it, with no network access.
+
+The first download of an archive pins it. If an archive at a pinned URL
+later comes back with different contents, read_archive() raises instead
+of quietly using it. New seasons get new, year-stamped archive URLs, so
+they are pinned on first use. After a deliberate in-place fix, re-pin:
+
+    python scripts/archive_cache.py --repin <url>
+
+Usage:
+    from archive_cache import read_archive
+    df = read_archive("https://stilesdata.com/.../dodgers_standings_1958_2025.parquet")
+
+    python scripts/archive_cache.py            # list pinned archives
+    python scripts/archive_cache.py --verify   # download and check every pin
+"""
+
+import os
+import json
+import fcntl
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+import http_client
+import telemetry
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "archives")
+LOCK_PATH = os.path.join(BASE_DIR, "data", "pipeline", "archive_lock.json")
+
+_lock = threading.Lock()
+
+
+class ArchiveChecksumError(ValueError):
+    """A pinned archive's contents no longer match its lockfile checksum"""
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(url: str):
+    name = os.path.splitext(os.path.basename(url.split("?", 1)[0]))[0]
+    stem = os.path.join(CACHE_DIR, f"{name}_{_sha256(url.encode('utf-8'))[:8]}")
+    return f"{stem}.arrow", f"{stem}.json"
+
+
+def load_lock() -> Dict[str, dict]:
+    """URL -> {sha256, bytes, etag, pinned_at}"""
+    try:
+        with open(LOCK_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _pin(url: str, body: bytes, etag: Optional[str]) -> dict:
+    """Record an archive's checksum in the lockfile (safe across processes)"""
+    entry = {
+        "sha256": _sha256(body),
+        "bytes": len(body),
+        "etag": etag,
+        "pinned_at": datetime.now(timezone.utc).isoformat(),
+    }
+    os.makedirs(os.path.dirname(LOCK_PATH), exist_ok=True)
+    with open(LOCK_PATH + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        pins = load_lock()
+        pins[url] = entry
+        tmp_path = f"{LOCK_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(pins, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, LOCK_PATH)
+    logging.info(f"Pinned archive {url} (sha256 {entry['sha256'][:12]}, {len(body):,} bytes)")
+    return entry
+
+
+def _download(url: str):
+    response = http_client.get(url, timeout=120)
+    response.raise_for_status()
+    return response.content, response.headers.get("ETag")
+
+
+def _read_cached(url: str, pinned: dict) -> Optional[pa.Table]:
+    """The memory-mapped Arrow copy, if it exists and matches the pin"""
+    arrow_path, meta_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except Exception:
+        return None
+    if meta.get("source_sha256") != pinned["sha256"] or not os.path.exists(arrow_path):
+        return None
+    if _file_sha256(arrow_path) != meta.get("arrow_sha256"):
+        logging.warning(f"Cached copy of {url} is corrupt; downloading again")
+        return None
+    return feather.read_table(arrow_path, memory_map=True)
+
+
+def _write_cached(url: str, table: pa.Table, source_sha256: str) -> None:
+    arrow_path, meta_path = _cache_paths(url)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{arrow_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # Uncompressed so later reads can memory-map it without decoding
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, arrow_path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "source_sha256": source_sha256,
+                       "arrow_sha256": _file_sha256(arrow_path)}, f)
+    except OSError as e:
+        logging.warning(f"Could not cache archive {url}: {e}")
+
+
+def load_archive_table(url: str, repin: bool = False) -> pa.Table:
+    """
+    An archive as an Arrow table, from the local cache when it matches the pin
+
+    Raises:
+        ArchiveChecksumError: if the downloaded archive doesn't match its pin
+    """
+    with _lock:
+        pinned = load_lock().get(url)
+        if pinned and not repin:
+            table = _read_cached(url, pinned)
+            if table is not None:
+                telemetry.record_cache("archives", hit=True)
+                return table
+
+        telemetry.record_cache("archives", hit=False)
+        body, etag = _download(url)
+        if pinned and not repin and _sha256(body) != pinned["sha256"]:
+            raise ArchiveChecksumError(
+                f"{url} changed since it was pinned (expected sha256 {pinned['sha256'][:12]}, "
+                f"got {_sha256(body)[:12]}). If the change is intended, run "
+                f"python scripts/archive_cache.py --repin {url}"
+            )
+        if not pinned or repin:
+            pinned = _pin(url, body, etag)
+        table = pq.read_table(BytesIO(body))
+        _write_cached(url, table, pinned["sha256"])
+        return table
+
+
+def read_archive(url: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """An archive as a DataFrame (see load_archive_table)"""
+    table = load_archive_table(url)
+    if columns:
+        table = table.select(list(columns))
+    return table.to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pinned historical archive cache")
+    parser.add_argument("--repin", metavar="URL", action="append", default=[],
+                        help="Download an archive again and pin its current contents")
+    parser.add_argument("--verify", action="store_true",
+                        help="Download every pinned archive and compare it with its pin")
+    args = parser.parse_args()
+
+    for url in args.repin:
+        table = load_archive_table(url, repin=True)
+        print(f"Re-pinned {url} ({table.num_rows:,} rows)")
+
+    pins = load_lock()
+    if args.verify:
+        failed = 0
+        for url, entry in sorted(pins.items()):
+            body, _ = _download(url)
+            ok = _sha256(body) == entry["sha256"]
+            failed += not ok
+            print(f"{'ok      ' if ok else 'CHANGED '} {url}")
+        raise SystemExit(1 if failed else 0)
+
+    print(f"Archive lockfile: {LOCK_PATH} ({len(pins)} archives)")
+    for url, entry in sorted(pins.items()):
+        arrow_path, _ = _cache_paths(url)
+        cached = "cached" if os.path.exists(arrow_path) else "not cached"
+        print(f"  {entry['sha256'][:12]}  {entry['bytes']:>11,} bytes  {cached:<10}  {url}")
+
+
+if __name__ == "__main__":
+    main()
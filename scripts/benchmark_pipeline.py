@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+"""
+Offline benchmark suite for the data pipeline
+
+Records one real run of the benchmarked scripts into a fixture directory,
+then replays them against those fixtures with no network and reports time,
+memory and request counts per script. Optimizations can then be compared
+on a laptop with the same inputs every time.
+
+Each record or replay pass runs in a throwaway copy of scripts/ and data/
+(without data/cache), so:
+- caches start cold (or stay warm between repeats with --warm)
+- the repository's own data files are never touched
+- bucket writes go to a scratch directory (see replay.py)
+
+Usage:
+    # Once, with network and AWS credentials (nothing is published)
+    python scripts/benchmark_pipeline.py record
+
+    # Any time after, offline
+    python scripts/benchmark_pipeline.py replay --repeat 3
+    python scripts/benchmark_pipeline.py replay --compare benchmarks/results/<earlier>.json
+"""
+
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from phase_config import SCRIPT_TIMEOUT, get_dependencies, topological_order
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_FIXTURES = os.path.join(BASE_DIR, "benchmarks", "fixtures", "default")
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmarks", "results")
+
+BENCHMARK_SCRIPTS = [
+    "scripts/02_update_boxscores_archive.py",
+    "scripts/04_fetch_process_standings.py",
+    "scripts/07_create_toplines_summary.py",
+    "scripts/09_build_wins_losses_from_boxscores.py",
+    "scripts/10_fetch_process_historic_batting_gamelogs.py",
+    "scripts/12_fetch_process_historic_pitching_gamelogs.py",
+    "scripts/20_fetch_game_pitches.py",
+    "scripts/21_summarize_pitch_data.py",
+    "scripts/30_fetch_abs_challenges.py",
+]
+
+
+def make_workspace() -> str:
+    """Copy scripts/ and data/ (minus caches) into a temporary tree"""
+    workspace = tempfile.mkdtemp(prefix="pipeline_bench_")
+    ignore = shutil.ignore_patterns("__pycache__", "*.pyc")
+    shutil.copytree(SCRIPTS_DIR, os.path.join(workspace, "scripts"), ignore=ignore)
+    shutil.copytree(os.path.join(BASE_DIR, "data"), os.path.join(workspace, "data"),
+                    ignore=shutil.ignore_patterns("cache"))
+    os.makedirs(os.path.join(workspace, "bucket"), exist_ok=True)
+    return workspace
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run_one(workspace: str, script: str, mode: str, fixtures: str) -> dict:
+    """Run one script under replay.py in the workspace and collect its metrics"""
+    telemetry_path = os.path.join(workspace, "telemetry.json")
+    stats_path = os.path.join(workspace, "replay_stats.json")
+    for path in (telemetry_path, stats_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    env = {
+        **os.environ,
+        "PIPELINE_TELEMETRY_FILE": telemetry_path,
+        "PIPELINE_REPLAY_STATS": stats_path,
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    if mode == "replay":
+        # Scripts take their CI code path; no credentials are used offline
+        env.update({
+            "GITHUB_ACTIONS": "true",
+            "AWS_ACCESS_KEY_ID": "replay",
+            "AWS_SECRET_ACCESS_KEY": "replay",
+            "AWS_DEFAULT_REGION": "us-west-1",
+        })
+        env.pop("AWS_PROFILE", None)
+
+    command = [
+        sys.executable, os.path.join(workspace, "scripts", "replay.py"),
+        "--mode", mode, "--fixtures", os.path.abspath(fixtures),
+        "--bucket", os.path.join(workspace, "bucket"),
+        os.path.join(workspace, script),
+    ]
+    started = time.monotonic()
+    timed_out = False
+    try:
+        result = subprocess.run(command, cwd=workspace, env=env, capture_output=True,
+                                text=True, timeout=SCRIPT_TIMEOUT)
+        success = result.returncode == 0
+        stderr = result.stderr
+    except subprocess.TimeoutExpired:
+        success, timed_out, stderr = False, True, ""
+    wall = time.monotonic() - started
+
+    telemetry = _read_json(telemetry_path) or {}
+    stats = _read_json(stats_path) or {"http": {}, "s3": {}}
+    http = stats.get("http", {})
+    s3 = stats.get("s3", {})
+    record = {
+        "script": os.path.basename(script),
+        "success": success,
+        "timed_out": timed_out,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": telemetry.get("cpu_seconds"),
+        "peak_rss_mb": telemetry.get("peak_rss_mb"),
+        "http_requests": sum(h.get("requests", 0) for h in http.values()),
+        "http_misses": sum(h.get("misses", 0) for h in http.values()),
+        "http_mb": round(sum(h.get("bytes", 0) for h in http.values()) / 1e6, 3),
+        "s3_requests": sum(op.get("requests", 0) for name, op in s3.items() if name != "origin_get"),
+        "s3_mb_down": round(sum(op.get("bytes_down", 0) for op in s3.values()) / 1e6, 3),
+        "s3_mb_up": round(sum(op.get("bytes_up", 0) for op in s3.values()) / 1e6, 3),
+        "hosts": http,
+        "cache_hit_ratio": telemetry.get("cache_hit_ratio"),
+    }
+    if not success:
+        record["error"] = (stderr or "").strip().splitlines()[-1:] or ["timed out" if timed_out else "failed"]
+    return record
+
+
+def run_pass(mode: str, fixtures: str, scripts: List[str], workspace: Optional[str] = None) -> List[dict]:
+    """Run the scripts once, in dependency order, in one workspace"""
+    workspace = workspace or make_workspace()
+    order = topological_order(scripts, get_dependencies(scripts))
+    records = []
+    for script in order:
+        logging.info(f"{mode.capitalize()}: {script}")
+        record = run_one(workspace, script, mode, fixtures)
+        status = "ok" if record["success"] else "FAILED"
+        logging.info(
+            f"   {status} in {record['wall_seconds']:.1f}s, {record['http_requests']} HTTP requests "
+            f"({record['http_misses']} misses), {record['s3_requests']} S3 calls"
+        )
+        records.append(record)
+    return records
+
+
+def record(fixtures: str, scripts: List[str]) -> None:
+    """Capture a live run into the fixture directory"""
+    if os.path.exists(fixtures):
+        logging.info(f"Replacing fixtures in {fixtures}")
+        shutil.rmtree(fixtures)
+    os.makedirs(fixtures)
+    recorded_at = datetime.now(timezone.utc).isoformat()
+    workspace = make_workspace()
+    try:
+        records = run_pass("record", fixtures, scripts, workspace)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    with open(os.path.join(fixtures, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"recorded_at": recorded_at, "scripts": scripts, "results": records}, f, indent=2)
+    failed = [r["script"] for r in records if not r["success"]]
+    logging.info(f"Recorded {len(records)} scripts into {fixtures}" + (f"; failed: {', '.join(failed)}" if failed else ""))
+
+
+def summarize_repeats(passes: List[List[dict]]) -> List[dict]:
+    """Median of each numeric metric per script across repeated passes"""
+    by_script = {}
+    for records in passes:
+        for r in records:
+            by_script.setdefault(r["script"], []).append(r)
+    summary = []
+    for script, runs in by_script.items():
+        row = {"script": script, "success": all(r["success"] for r in runs), "repeats": len(runs)}
+        for field in ("wall_seconds", "cpu_seconds", "peak_rss_mb", "http_requests", "http_misses",
+                      "http_mb", "s3_requests", "s3_mb_down", "s3_mb_up"):
+            values = [r[field] for r in runs if r.get(field) is not None]
+            row[field] = round(statistics.median(values), 3) if values else None
+        summary.append(row)
+    return summary
+
+
+def print_table(rows: List[dict], baseline: Optional[Dict[str, dict]] = None) -> None:
+    header = f"{'script':<48} {'wall s':>8} {'cpu s':>8} {'rss MB':>8} {'http':>6} {'miss':>5} {'http MB':>8} {'s3':>5} {'s3 MB':>7}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        line = (
+            f"{r['script']:<48} {r['wall_seconds'] or 0:>8.2f} {r['cpu_seconds'] or 0:>8.2f} "
+            f"{r['peak_rss_mb'] or 0:>8.0f} {r['http_requests'] or 0:>6.0f} {r['http_misses'] or 0:>5.0f} "
+            f"{r['http_mb'] or 0:>8.2f} {r['s3_requests'] or 0:>5.0f} {(r['s3_mb_down'] or 0) + (r['s3_mb_up'] or 0):>7.2f}"
+        )
+        if baseline:
+            base = baseline.get(r["script"], {}).get("wall_seconds")
+            line += f" {r['wall_seconds'] / base:>7.2f}x" if base else f" {'-':>8}"
+        if not r["success"]:
+            line += "  FAILED"
+        print(line)
+    total = sum(r["wall_seconds"] or 0 for r in rows)
+    print(f"{'total':<48} {total:>8.2f}")
+
+
+def replay(fixtures: str, scripts: List[str], repeat: int = 1, warm: bool = False,
+           compare: Optional[str] = None, output: Optional[str] = None) -> List[dict]:
+    """Replay the scripts against the fixtures `repeat` times and report medians"""
+    if not os.path.exists(os.path.join(fixtures, "manifest.json")):
+        raise FileNotFoundError(f"No fixtures in {fixtures}; run `benchmark_pipeline.py record` first")
+    passes = []
+    workspace = make_workspace() if warm else None
+    try:
+        for i in range(repeat):
+            logging.info(f"Replay pass {i + 1}/{repeat} ({'warm' if warm and i else 'cold'} caches)")
+            ws = workspace or make_workspace()
+            try:
+                passes.append(run_pass("replay", fixtures, scripts, ws))
+            finally:
+                if not warm:
+                    shutil.rmtree(ws, ignore_errors=True)
+    finally:
+        if workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    summary = summarize_repeats(passes)
+    baseline = None
+    if compare:
+        baseline = {r["script"]: r for r in (_read_json(compare) or {}).get("summary", [])}
+    print()
+    print_table(summary, baseline)
+
+    output = output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"fixtures": os.path.abspath(fixtures), "repeat": repeat, "warm": warm,
+                   "summary": summary, "passes": passes}, f, indent=2)
+    print(f"\nResults saved to {output}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay the pipeline benchmark")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="Fixture directory")
+    parser.add_argument("--scripts", nargs="+", help="Script numbers or paths (default: the benchmark set)")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay passes (median is reported)")
+    parser.add_argument("--warm", action="store_true", help="Keep caches between replay passes")
+    parser.add_argument("--compare", help="Earlier results JSON to compare wall times against")
+    parser.add_argument("--output", help="Where to write the results JSON")
+    args = parser.parse_args()
+
+    scripts = BENCHMARK_SCRIPTS
+    if args.scripts:
+        scripts = [s for s in BENCHMARK_SCRIPTS
+                   if any(os.path.basename(s).startswith(f"{sel}_") or s.endswith(sel) for sel in args.scripts)]
+        if not scripts:
+            parser.error(f"No benchmark scripts match {args.scripts}")
+
+    if args.mode == "record":
+        record(args.fixtures, scripts)
+    else:
+        replay(args.fixtures, scripts, repeat=args.repeat, warm=args.warm,
+               compare=args.compare, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
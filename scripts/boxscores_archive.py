@@ -0,0 +1,414 @@
+#!/usr/bin/env python
+"""
+Access layer for the Dodgers boxscores archive
+
+The archive is stored as one Parquet file per season on S3:
+
+    dodgers/data/standings/boxscores/season={season}.parquet
+
+Runs-by-inning columns are Arrow list<int64> columns, ints and bools are
+typed, and dates stay YYYY-MM-DD strings. Adding a game rewrites only its
+season's partition, never the full history. dodgers_boxscores.json is still
+exported whenever a partition changes, for readers of the old file (the
+README lists it as a pipeline output); nothing in the pipeline reads it
+back once the partitions exist.
+
+Reads are served from local copies under data/cache/boxscores:
+
+- load_archive() lists the partitions (one ListObjectsV2 call, which also
+  returns each ETag) and only downloads seasons whose ETag changed. Within
+  one process the frame is memoized. `columns` projects at read time.
+- load_season() reads a single season partition.
+- upsert_games() / append_games() merge new rows by game_pk into the
+  affected season partitions and write through to the local copies.
+- regular_season_games(season) is the typed, pre-filtered view the
+  downstream scripts want: final games of one season, March Angels
+  exhibitions removed, sorted by date and game_pk.
+
+Before the first partitioned write, reads fall back to the legacy JSON
+archive, and the first upsert writes every season.
+
+Usage:
+    from boxscores_archive import load_archive, regular_season_games
+    games = regular_season_games(2026)
+"""
+
+import os
+import io
+import gzip
+import json
+import logging
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+
+import telemetry
+from publisher import get_s3_client, publish_bytes
+
+BUCKET = "stilesdata.com"
+PARTITION_PREFIX = "dodgers/data/standings/boxscores/"
+PARTITION_KEY = PARTITION_PREFIX + "season={season}.parquet"
+ARCHIVE_KEY_JSON = "dodgers/data/standings/dodgers_boxscores.json"
+ARCHIVE_KEY_CSV = "dodgers/data/standings/dodgers_boxscores.csv"  # legacy fallback
+LOCAL_ARCHIVE_JSON = os.path.join("data", "standings", "dodgers_boxscores.json")
+LOCAL_ARCHIVE_CSV = os.path.join("data", "standings", "dodgers_boxscores.csv")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "boxscores")
+CACHE_META = os.path.join(CACHE_DIR, "partitions.meta.json")
+
+INT_COLUMNS = ["game_pk", "home_team_id", "away_team_id", "home_runs", "away_runs",
+               "dodgers_runs", "opponent_runs", "diff", "venue_id"]
+BOOL_COLUMNS = ["dodgers_is_home", "is_final"]
+LIST_COLUMNS = ["runs_by_inning_home", "runs_by_inning_away"]
+
+_memo = {}
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply consistent dtypes to archive rows (dates stay YYYY-MM-DD strings)"""
+    df = df.copy()
+    if df.empty:
+        return df
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
+    for col in INT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    for col in BOOL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna(False).astype(bool)
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(lambda v: [int(x) for x in v] if v is not None and not _is_missing(v) else [])
+    return df
+
+
+def _is_missing(value) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False  # list-likes
+
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Convert normalized rows to an Arrow table with list<int64> inning columns"""
+    table = pa.Table.from_pandas(normalize(df), preserve_index=False)
+    for col in LIST_COLUMNS:
+        if col in table.column_names:
+            i = table.column_names.index(col)
+            table = table.set_column(i, col, table.column(col).cast(pa.list_(pa.int64())))
+    return table
+
+
+def season_of(df: pd.DataFrame) -> pd.Series:
+    return pd.to_datetime(df["date"]).dt.year
+
+
+# ---------------------------------------------------------------------------
+# Local partition copies
+# ---------------------------------------------------------------------------
+
+def _partition_path(season: int) -> str:
+    return os.path.join(CACHE_DIR, f"season={int(season)}.parquet")
+
+
+def _read_meta() -> Dict[str, Optional[str]]:
+    try:
+        with open(CACHE_META, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _write_meta(meta: Dict[str, Optional[str]]) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{CACHE_META}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, CACHE_META)
+
+
+def _write_local_partition(season: int, body: bytes, etag: Optional[str]) -> None:
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _partition_path(season)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        meta = _read_meta()
+        meta[str(int(season))] = etag
+        _write_meta(meta)
+    except Exception as e:
+        logging.warning(f"Could not write local boxscores partition for {season}: {e}")
+
+
+def _read_local(seasons: List[int], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    paths = [_partition_path(s) for s in sorted(seasons) if os.path.exists(_partition_path(s))]
+    if not paths:
+        return pd.DataFrame()
+    frames = [pq.read_table(p, columns=columns).to_pandas() for p in paths]
+    return pd.concat(frames, ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# S3 partitions
+# ---------------------------------------------------------------------------
+
+def _remote_partitions(s3) -> Dict[int, str]:
+    """Map season -> ETag for every partition on S3"""
+    partitions = {}
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=BUCKET, Prefix=PARTITION_PREFIX):
+        for obj in page.get("Contents", []):
+            name = obj["Key"][len(PARTITION_PREFIX):]
+            if name.startswith("season=") and name.endswith(".parquet"):
+                partitions[int(name[len("season="):-len(".parquet")])] = obj["ETag"]
+    return partitions
+
+
+def _sync_partitions(profile_name: Optional[str], seasons: Optional[List[int]] = None) -> Optional[List[int]]:
+    """
+    Bring local partition copies up to date with S3
+
+    Returns the list of available seasons, or None when S3 has no partitions
+    yet (or is unreachable and nothing is cached locally).
+    """
+    meta = _read_meta()
+    try:
+        s3 = get_s3_client(profile_name)
+        remote = _remote_partitions(s3)
+    except Exception as e:
+        logging.warning(f"Could not list boxscores partitions on S3: {e}")
+        cached = [int(s) for s in meta if os.path.exists(_partition_path(int(s)))]
+        return sorted(cached) or None
+
+    if not remote:
+        return None
+
+    wanted = [s for s in remote if seasons is None or s in seasons]
+    for season in wanted:
+        etag = remote[season]
+        if meta.get(str(season)) == etag and os.path.exists(_partition_path(season)):
+            telemetry.record_cache("boxscores_partitions", hit=True)
+            continue
+        telemetry.record_cache("boxscores_partitions", hit=False)
+        obj = s3.get_object(Bucket=BUCKET, Key=PARTITION_KEY.format(season=season))
+        _write_local_partition(season, obj["Body"].read(), obj.get("ETag", etag))
+        logging.info(f"Downloaded boxscores partition {season}")
+    return sorted(wanted)
+
+
+def _load_legacy(profile_name: Optional[str]) -> pd.DataFrame:
+    """Read the pre-partition JSON archive (S3, then local files)"""
+    try:
+        s3 = get_s3_client(profile_name)
+        try:
+            obj = s3.get_object(Bucket=BUCKET, Key=ARCHIVE_KEY_JSON)
+            body = obj["Body"].read()
+            # export_json() publishes it gzipped (Content-Encoding: gzip)
+            if obj.get("ContentEncoding") == "gzip":
+                body = gzip.decompress(body)
+            df = normalize(pd.DataFrame(json.loads(body.decode("utf-8"))))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "NoSuchKey":
+                raise
+            obj = s3.get_object(Bucket=BUCKET, Key=ARCHIVE_KEY_CSV)
+            df = normalize(pd.read_csv(obj["Body"]))
+        logging.info(f"Loaded legacy boxscores archive from S3 ({len(df)} games)")
+        return df
+    except Exception as e:
+        logging.warning(f"Could not load boxscores from S3: {e}")
+
+    if os.path.exists(LOCAL_ARCHIVE_JSON):
+        with open(LOCAL_ARCHIVE_JSON, "r", encoding="utf-8") as f:
+            logging.info(f"Loaded boxscores from local: {LOCAL_ARCHIVE_JSON}")
+            return normalize(pd.DataFrame(json.load(f)))
+    if os.path.exists(LOCAL_ARCHIVE_CSV):
+        logging.info(f"Loaded boxscores from local: {LOCAL_ARCHIVE_CSV}")
+        return normalize(pd.read_csv(LOCAL_ARCHIVE_CSV))
+    return pd.DataFrame()
+
+
+def _project(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    if columns is None or df.empty:
+        return df
+    return df[[c for c in columns if c in df.columns]]
+
+
+def _sort(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty or not {"date", "game_pk"}.issubset(df.columns):
+        return df.reset_index(drop=True)
+    return df.sort_values(["date", "game_pk"]).reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def load_archive(profile_name: Optional[str] = None, refresh: bool = False,
+                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Return the full boxscores archive (empty frame if nothing is reachable)
+
+    Args:
+        profile_name: Optional AWS profile
+        refresh: Skip the in-process memo and revalidate against S3
+        columns: Only read these columns
+    """
+    memo_key = ("archive", tuple(columns) if columns else None)
+    if refresh or memo_key not in _memo:
+        seasons = _sync_partitions(profile_name)
+        if seasons is None:
+            df = _project(_load_legacy(profile_name), columns)
+        else:
+            df = _read_local(seasons, columns)
+        _memo[memo_key] = _sort(df)
+    return _memo[memo_key].copy()
+
+
+def load_season(season: int, profile_name: Optional[str] = None,
+                columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Return one season's partition (empty frame if it does not exist)"""
+    memo_key = ("season", int(season), tuple(columns) if columns else None)
+    if memo_key not in _memo:
+        seasons = _sync_partitions(profile_name, [int(season)])
+        if seasons is None:
+            df = load_archive(profile_name)
+            if not df.empty:
+                df = _project(df[season_of(df) == int(season)], columns)
+        else:
+            df = _read_local([int(season)] if int(season) in seasons else [], columns)
+        _memo[memo_key] = _sort(df)
+    return _memo[memo_key].copy()
+
+
+def _put_partition(s3, season: int, df: pd.DataFrame) -> None:
+    buffer = io.BytesIO()
+    pq.write_table(to_arrow(df), buffer, compression="zstd")
+    body = buffer.getvalue()
+    etag = None
+    try:
+        response = s3.put_object(
+            Bucket=BUCKET,
+            Key=PARTITION_KEY.format(season=season),
+            Body=body,
+            ContentType="application/vnd.apache.parquet",
+        )
+        etag = response.get("ETag")
+        print(f"Uploaded partition -> s3://{BUCKET}/{PARTITION_KEY.format(season=season)} ({len(df)} games)")
+    except Exception as exc:
+        print(f"S3 upload failed for {season} partition ({exc}). Kept local copy only.")
+    _write_local_partition(season, body, etag)
+
+
+def upsert_games(new_df: pd.DataFrame, profile_name: Optional[str] = None, replace: bool = True) -> pd.DataFrame:
+    """
+    Merge rows into the archive by game_pk and rewrite only the touched seasons
+
+    Args:
+        new_df: Rows in the archive's row format
+        profile_name: Optional AWS profile
+        replace: Replace existing rows with the same game_pk (upsert). When
+            False, rows for game_pks already archived are ignored (append).
+
+    Returns:
+        The full archive after the write
+    """
+    new_df = normalize(new_df)
+    migrating = _sync_partitions(profile_name) is None
+    archive_df = load_archive(profile_name)
+    s3 = get_s3_client(profile_name)
+
+    if not new_df.empty and not archive_df.empty and not replace:
+        new_df = new_df[~new_df["game_pk"].isin(archive_df["game_pk"])]
+
+    touched = set(season_of(new_df).tolist()) if not new_df.empty else set()
+    if migrating and not archive_df.empty:
+        # First partitioned write: lay out every season from the legacy archive
+        touched |= set(season_of(archive_df).tolist())
+    if not touched:
+        return archive_df
+
+    for season in sorted(touched):
+        current = archive_df[season_of(archive_df) == season] if not archive_df.empty else archive_df
+        incoming = new_df[season_of(new_df) == season] if not new_df.empty else new_df
+        merged = (
+            pd.concat([f for f in (current, incoming) if not f.empty], ignore_index=True)
+            .drop_duplicates(subset=["game_pk"], keep="last")
+        )
+        _put_partition(s3, season, _sort(merged))
+
+    # Drop memoized reads so later calls see the new partitions
+    _memo.clear()
+    combined = load_archive(profile_name)
+    export_json(combined, profile_name)
+    telemetry.record_rows(PARTITION_PREFIX.rstrip("/"), len(combined))
+    return combined
+
+
+def append_games(new_df: pd.DataFrame, profile_name: Optional[str] = None) -> pd.DataFrame:
+    """Add rows for game_pks not yet archived; existing rows are left alone"""
+    return upsert_games(new_df, profile_name, replace=False)
+
+
+def _json_default(value):
+    # numpy scalars/arrays and pandas NA coming back from Parquet
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if pd.isna(value):
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def export_json(df: pd.DataFrame, profile_name: Optional[str] = None) -> None:
+    """Publish dodgers_boxscores.json for readers of the pre-partition archive"""
+    df = normalize(df).astype(object).where(lambda d: d.notna(), None)
+    json_bytes = json.dumps(
+        df.to_dict(orient="records"), ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+    # Gzipped and skipped when unchanged by the publisher
+    results = publish_bytes(ARCHIVE_KEY_JSON, json_bytes, "application/json", profile_name=profile_name)
+    failed = [r for r in results if r.get("method") == "error"]
+    if failed:
+        # Write locally as a fallback
+        os.makedirs(os.path.dirname(LOCAL_ARCHIVE_JSON), exist_ok=True)
+        with open(LOCAL_ARCHIVE_JSON, "wb") as f:
+            f.write(json_bytes)
+        print(f"S3 upload failed ({failed[0].get('error')}). Saved locally -> {LOCAL_ARCHIVE_JSON}")
+
+
+def regular_season_games(season: int, df: Optional[pd.DataFrame] = None,
+                         profile_name: Optional[str] = None) -> pd.DataFrame:
+    """
+    Final games for one season with spring training exhibitions removed
+
+    Returns a copy sorted by date and game_pk, with `date` as datetime64.
+    """
+    if df is None:
+        df = load_season(season, profile_name)
+    if df.empty:
+        return df
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["date"])
+    df = df[(df["date"].dt.year == season) & (df["is_final"] == True)]
+
+    # Exclude spring training exhibitions (Angels games in March)
+    march_angels = (
+        (df["date"].dt.month == 3) &
+        (df["opponent_name"].str.contains("Angels", na=False))
+    )
+    df = df[~march_angels]
+    return df.sort_values(["date", "game_pk"]).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    archive = load_archive(columns=["date"])
+    print(f"Boxscores archive: {len(archive)} games")
+    if not archive.empty:
+        for year, n in season_of(archive).value_counts().sort_index().items():
+            print(f"  {year}: {n}")
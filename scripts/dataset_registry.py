@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Registry of the published Parquet datasets that later steps read back
+
+Summary steps used to call pd.read_parquet(url) for each query, which
+downloads and decodes the whole file every time, even when only one
+season and a handful of columns are needed. Here each source is
+downloaded once into data/cache/datasets and revalidated with its ETag
+(an unchanged file costs one 304). Reads go through pyarrow with
+columns= and filters= so only the needed columns and rows are decoded.
+
+A source is revalidated the first time it's opened in a process and then
+reused. clear() forgets that, so the next open checks the ETag again;
+script_worker calls it between scripts.
+
+Usage:
+    from dataset_registry import read_dataset
+    df = read_dataset("standings", columns=["gm", "wins"], filters=[("year", "==", 2026)])
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import List, Optional, Sequence
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import http_client
+import telemetry
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "datasets")
+
+DATASETS = {
+    "standings": "https://stilesdata.com/dodgers/data/standings/dodgers_standings_1958_present.parquet",
+    "batting": "https://stilesdata.com/dodgers/data/batting/dodgers_team_batting_1958_present.parquet",
+    "pitching": "https://stilesdata.com/dodgers/data/pitching/dodgers_pitching_totals_current.parquet",
+}
+
+_opened = {}
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def resolve(source: str) -> str:
+    """URL for a registered dataset name (URLs pass through)"""
+    return DATASETS.get(source, source)
+
+
+def _cache_paths(url: str):
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    name = os.path.basename(url.split("?", 1)[0])
+    stem = os.path.join(CACHE_DIR, f"{digest}_{name}")
+    return stem, f"{stem}.json"
+
+
+def _lock_for(url: str) -> threading.Lock:
+    with _locks_lock:
+        return _locks.setdefault(url, threading.Lock())
+
+
+def _read_meta(meta_path: str) -> dict:
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _download(url: str, path: str, meta_path: str) -> str:
+    """Fetch url into path unless the cached copy's ETag still matches"""
+    meta = _read_meta(meta_path) if os.path.exists(path) else {}
+    headers = {"If-None-Match": meta["etag"]} if meta.get("etag") else {}
+    try:
+        response = http_client.get(url, headers=headers, timeout=60)
+        if response.status_code == 304 and meta:
+            telemetry.record_cache("datasets", hit=True)
+            return path
+        response.raise_for_status()
+    except Exception as e:
+        if os.path.exists(path):
+            logging.warning(f"Could not revalidate {url} ({e}); using cached copy")
+            return path
+        raise
+
+    body = response.content
+    telemetry.record_cache("datasets", hit=False)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "bytes": len(body),
+        }, f)
+    logging.info(f"Downloaded {url} ({len(body):,} bytes)")
+    return path
+
+
+def open_dataset(source: str) -> str:
+    """Local path of a dataset's current copy (revalidated once per process)"""
+    url = resolve(source)
+    with _lock_for(url):
+        if url in _opened:
+            telemetry.record_cache("datasets", hit=True)
+            return _opened[url]
+        path, meta_path = _cache_paths(url)
+        _opened[url] = _download(url, path, meta_path)
+        return _opened[url]
+
+
+def read_dataset(source: str, columns: Optional[Sequence[str]] = None,
+                 filters: Optional[List] = None, sort_by: Optional[str] = None,
+                 ascending: bool = False) -> pd.DataFrame:
+    """
+    Read a dataset, decoding only the requested columns and matching rows
+
+    Args:
+        source: Registered name (see DATASETS) or Parquet URL
+        columns: Columns to read (default: all)
+        filters: pyarrow filters, e.g. [("year", "==", 2026)]
+        sort_by: Optional column to sort by
+        ascending: Sort direction (newest first by default)
+    """
+    table = pq.read_table(open_dataset(source), columns=list(columns) if columns else None,
+                          filters=filters, memory_map=True)
+    df = table.to_pandas()
+    if sort_by and sort_by in df.columns:
+        df.sort_values(sort_by, ascending=ascending, inplace=True)
+    return df
+
+
+def clear() -> None:
+    """Revalidate every source on its next open"""
+    _opened.clear()
+
+
+if __name__ == "__main__":
+    for name, url in DATASETS.items():
+        metadata = pq.ParquetFile(open_dataset(name)).metadata
+        print(f"{name}: {metadata.num_rows:,} rows, {metadata.num_columns} columns, {metadata.num_row_groups} row groups ({url})")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+Concurrent fetch engine for per-game HTTP work
+
+Scripts hand this module a list of URLs (fetch_all) or a list of items and a
+per-item function (map_concurrent); work runs on a bounded thread pool and
+results come back in input order.
+
+Every request made through fetch_json/fetch_text is throttled per host:
+- a semaphore caps in-flight requests to the host
+- a token bucket caps the sustained request rate
+
+HOST_LIMITS holds the budgets for the hosts this pipeline talks to. Requests
+go through http_client's pooled per-host sessions. Retry and backoff
+semantics are the ones the boxscores updater has always used: 5xx and
+connection errors back off exponentially, 4xx fail immediately and the
+caller gets None.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+import http_client
+
+DEFAULT_MAX_WORKERS = 16
+
+# host -> (max concurrent requests, sustained requests per second, burst)
+HOST_LIMITS = {
+    "statsapi.mlb.com": (8, 20.0, 20),
+    "baseballsavant.mlb.com": (4, 5.0, 5),
+    # Baseball Reference blocks clients above ~20 requests/minute
+    "www.baseball-reference.com": (1, 0.3, 1),
+    "baseball-reference.com": (1, 0.3, 1),
+}
+DEFAULT_HOST_LIMIT = (4, 10.0, 10)
+
+USER_AGENT = http_client.USER_AGENT
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostThrottle:
+    """Concurrency limit plus rate limit for one host"""
+
+    def __init__(self, max_concurrent: int, rate: float, burst: int):
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.bucket = TokenBucket(rate, burst)
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        self.bucket.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.semaphore.release()
+        return False
+
+
+_throttles = {}
+_throttles_lock = threading.Lock()
+
+
+def throttle_for(url: str) -> HostThrottle:
+    """Return the shared throttle for the URL's host"""
+    host = urlparse(url).netloc.lower()
+    with _throttles_lock:
+        if host not in _throttles:
+            _throttles[host] = HostThrottle(*HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+        return _throttles[host]
+
+
+def _get_with_backoff(url, params, headers, timeout, max_retries, base_delay, parse):
+    for attempt in range(max_retries + 1):
+        try:
+            with throttle_for(url):
+                response = http_client.get(url, params=params, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            return parse(response)
+
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [500, 502, 503, 504]:
+                if attempt < max_retries:
+                    delay = base_delay * (2 ** attempt)  # Exponential backoff
+                    logging.warning(f"Server error {e.response.status_code} for {url}. Retrying in {delay} seconds... (attempt {attempt + 1}/{max_retries + 1})")
+                    time.sleep(delay)
+                    continue
+                else:
+                    logging.error(f"Server error {e.response.status_code} for {url}. All retries exhausted.")
+                    return None
+            else:
+                # For non-server errors (4xx), don't retry
+                logging.error(f"Client error {e.response.status_code} for {url}: {e}")
+                return None
+
+        except requests.exceptions.RequestException as e:
+            if attempt < max_retries:
+                delay = base_delay * (2 ** attempt)
+                logging.warning(f"Request failed for {url}: {e}. Retrying in {delay} seconds... (attempt {attempt + 1}/{max_retries + 1})")
+                time.sleep(delay)
+                continue
+            else:
+                logging.error(f"Request failed for {url} after all retries: {e}")
+                return None
+
+        except ValueError as e:  # JSON decode error
+            logging.error(f"Invalid JSON response from {url}: {e}")
+            return None
+
+    return None
+
+
+def fetch_text(url: str, max_retries: int = 3, base_delay: float = 1.0,
+               params: Optional[dict] = None, headers: Optional[dict] = None,
+               timeout: float = 30) -> Optional[str]:
+    """
+    Fetch text from URL with retry logic and exponential backoff.
+
+    Args:
+        url: URL to fetch
+        max_retries: Maximum number of retry attempts
+        base_delay: Base delay between retries (exponentially increased)
+        params: Optional query parameters
+        headers: Optional request headers (defaults to a browser User-Agent)
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Response text or None if all retries failed
+    """
+    headers = headers or {"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"}
+    return _get_with_backoff(url, params, headers, timeout, max_retries, base_delay, lambda r: r.text)
+
+
+def fetch_json(url: str, max_retries: int = 3, base_delay: float = 1.0,
+               params: Optional[dict] = None, headers: Optional[dict] = None,
+               timeout: float = 30) -> Optional[dict]:
+    """
+    Fetch JSON from URL with retry logic and exponential backoff.
+
+    Args:
+        url: URL to fetch
+        max_retries: Maximum number of retry attempts
+        base_delay: Base delay between retries (exponentially increased)
+        params: Optional query parameters
+        headers: Optional request headers
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Parsed JSON as dict or None if all retries failed
+    """
+    return _get_with_backoff(url, params, headers, timeout, max_retries, base_delay, lambda r: r.json())
+
+
+def map_concurrent(func: Callable, items: Iterable, max_workers: int = DEFAULT_MAX_WORKERS) -> List:
+    """
+    Apply func to every item on a bounded thread pool, preserving order.
+
+    An exception raised by func is logged and its slot is None, so one bad
+    game never sinks the batch.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def run(item):
+        try:
+            return func(item)
+        except Exception as e:
+            logging.error(f"Concurrent task failed for {item}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(run, items))
+
+
+def fetch_all(urls: Iterable[str], as_json: bool = True, max_workers: int = DEFAULT_MAX_WORKERS, **kwargs) -> List:
+    """
+    Fetch many URLs concurrently within each host's budget.
+
+    Returns parsed JSON (or text when as_json=False) in the same order as
+    `urls`; failed requests are None.
+    """
+    fetch = fetch_json if as_json else fetch_text
+    return map_concurrent(lambda url: fetch(url, **kwargs), urls, max_workers=max_workers)
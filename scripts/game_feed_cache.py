@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+On-disk cache for MLB StatsAPI live game feeds
+
+Several scripts read https://statsapi.mlb.com/api/v1.1/game/{gamePk}/feed/live
+for the same games on every run (gamelogs, umpires, ABS challenges, pitch
+status checks). This module keeps one shared copy per game:
+
+- Final games are stored permanently, gzipped and keyed by gamePk and the
+  feed's metaData.timeStamp: data/cache/game_feeds/{gamePk}_{timeStamp}.final.json.gz
+- Non-final games are stored as data/cache/game_feeds/{gamePk}.live.json.gz and
+  reused for NON_FINAL_TTL_SECONDS. Once stale, the lightweight
+  /feed/live/timestamps endpoint is checked first and the full feed is only
+  downloaded when the game has actually changed.
+
+Downloads go through fetch_engine, so they share its retries and the
+statsapi.mlb.com rate budget and are safe to call from map_concurrent.
+
+Usage:
+    from game_feed_cache import get_game_feed
+    feed = get_game_feed(game_pk)  # dict or None
+"""
+
+import os
+import glob
+import gzip
+import json
+import time
+import logging
+import threading
+from typing import Optional
+
+import telemetry
+from fetch_engine import fetch_json
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get(
+    "GAME_FEED_CACHE_DIR", os.path.join(BASE_DIR, "data", "cache", "game_feeds")
+)
+
+LIVE_FEED_URL = "https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
+TIMESTAMPS_URL = "https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live/timestamps"
+
+# How long a non-final feed is trusted before checking for changes
+NON_FINAL_TTL_SECONDS = 300
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+
+def is_final_feed(feed: dict) -> bool:
+    """True when the feed reports a Final game (codedGameState 'F')"""
+    status = feed.get("gameData", {}).get("status", {})
+    if status.get("codedGameState") == "F":
+        return True
+    return str(status.get("detailedState", "")).startswith(("Final", "Completed Early"))
+
+
+def feed_timestamp(feed: dict) -> Optional[str]:
+    """Return the feed's metaData.timeStamp (e.g. '20250930_051512')"""
+    return feed.get("metaData", {}).get("timeStamp")
+
+
+def _final_paths(game_pk: int) -> list:
+    return sorted(glob.glob(os.path.join(CACHE_DIR, f"{int(game_pk)}_*.final.json.gz")))
+
+
+def _live_path(game_pk: int) -> str:
+    return os.path.join(CACHE_DIR, f"{int(game_pk)}.live.json.gz")
+
+
+def _read(path: str) -> Optional[dict]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"Discarding unreadable feed cache {path}: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def _write(path: str, feed: dict) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(feed, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def store_game_feed(game_pk: int, feed: dict) -> None:
+    """Write a feed to the cache, promoting it to permanent storage once Final"""
+    if is_final_feed(feed):
+        ts = feed_timestamp(feed) or time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+        _write(os.path.join(CACHE_DIR, f"{int(game_pk)}_{ts}.final.json.gz"), feed)
+        live_path = _live_path(game_pk)
+        if os.path.exists(live_path):
+            os.remove(live_path)
+    else:
+        _write(_live_path(game_pk), feed)
+
+
+def _latest_remote_timestamp(game_pk: int) -> Optional[str]:
+    """Fetch the most recent feed timestamp without downloading the feed"""
+    stamps = fetch_json(TIMESTAMPS_URL.format(game_pk=game_pk), max_retries=1, headers=HEADERS, timeout=15)
+    return stamps[-1] if stamps else None
+
+
+def _download(game_pk: int) -> Optional[dict]:
+    feed = fetch_json(LIVE_FEED_URL.format(game_pk=game_pk), headers=HEADERS)
+    if feed is None:
+        logging.error(f"Failed to fetch live feed for game {game_pk}")
+    return feed
+
+
+def get_game_feed(game_pk: int, refresh: bool = False) -> Optional[dict]:
+    """
+    Return the live feed for a game, downloading only when needed
+
+    Args:
+        game_pk: MLB game ID
+        refresh: Ignore cached copies and download the feed again
+
+    Returns:
+        Parsed feed dict, or None if it could not be fetched and nothing is cached
+    """
+    game_pk = int(game_pk)
+
+    if not refresh:
+        for path in reversed(_final_paths(game_pk)):
+            feed = _read(path)
+            if feed is not None:
+                telemetry.record_cache("game_feeds", hit=True)
+                return feed
+
+    live_path = _live_path(game_pk)
+    cached = _read(live_path) if os.path.exists(live_path) and not refresh else None
+    if cached is not None:
+        age = time.time() - os.path.getmtime(live_path)
+        if age < NON_FINAL_TTL_SECONDS:
+            telemetry.record_cache("game_feeds", hit=True)
+            return cached
+        # Stale: only pull the full feed if the game has moved on
+        remote_ts = _latest_remote_timestamp(game_pk)
+        if remote_ts is not None and remote_ts == feed_timestamp(cached):
+            os.utime(live_path, None)
+            telemetry.record_cache("game_feeds", hit=True)
+            return cached
+
+    telemetry.record_cache("game_feeds", hit=False)
+    feed = _download(game_pk)
+    if feed is None:
+        # Serve a stale copy rather than nothing when the API is flaky
+        return cached
+
+    try:
+        store_game_feed(game_pk, feed)
+    except Exception as e:
+        logging.warning(f"Could not cache live feed for game {game_pk}: {e}")
+    return feed
+
+
+if __name__ == "__main__":
+    # Report what is cached
+    finals = glob.glob(os.path.join(CACHE_DIR, "*.final.json.gz"))
+    lives = glob.glob(os.path.join(CACHE_DIR, "*.live.json.gz"))
+    size = sum(os.path.getsize(p) for p in finals + lives)
+    print(f"Game feed cache: {CACHE_DIR}")
+    print(f"  Final feeds: {len(finals)}")
+    print(f"  Live feeds: {len(lives)}")
+    print(f"  Size: {size / 1e6:.1f} MB")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Per-season shards of the 1958-present gamelog archives
+
+The combined batting/pitching gamelogs (about 70 seasons of game rows)
+used to be rewritten and re-downloaded as one indented JSON on every run.
+Here the combined table is split into one compact JSON shard per season
+plus a small index the dashboard reads first:
+
+    {prefix}/index.json
+    {prefix}/1958.3f9c0a1b2c4d.json   finished seasons: content-hashed, immutable
+    {prefix}/2026.json                current season: stable name, short cache
+
+Each shard is pandas' "split" layout ({"columns": [...], "data": [[...],
+...]}), so column names aren't repeated on every row. Finished seasons
+are only uploaded when their content hash is new (first run, or a changed
+archive), so a normal run uploads just the current season and the index.
+The index is also written locally (and committed with data/), which is
+how the next run knows which shards already exist.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+import pandas as pd
+
+import publisher
+
+
+def shard_body(df: pd.DataFrame) -> bytes:
+    """One season's rows as compact split-orient JSON"""
+    return df.to_json(orient="split", index=False).encode("utf-8")
+
+
+def load_index(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def publish_season_shards(df: pd.DataFrame, prefix: str, local_index_path: str, current_season: int,
+                          profile_name: Optional[str] = None, republish: bool = False) -> dict:
+    """
+    Publish changed season shards and the index for a combined gamelog table
+
+    Args:
+        df: Every season's rows, with a `year` column
+        prefix: S3 key prefix for the shards and index.json
+        local_index_path: Local copy of the index (remembers published shards)
+        current_season: Seasons from this one on are still changing
+        profile_name: AWS profile for local runs
+        republish: Upload every shard, not just new ones
+
+    Returns:
+        The index dict
+    """
+    previous = {int(s["year"]): s for s in load_index(local_index_path).get("seasons", [])}
+    seasons = []
+    items = []
+    for year, season_df in df.groupby(df["year"].astype(int), sort=True):
+        year = int(year)
+        body = shard_body(season_df.reset_index(drop=True))
+        sha256 = hashlib.sha256(body).hexdigest()
+        frozen = year < current_season
+        filename = f"{year}.{sha256[:12]}.json" if frozen else f"{year}.json"
+        seasons.append({"year": year, "rows": len(season_df), "file": filename, "sha256": sha256})
+        if republish or not frozen or previous.get(year, {}).get("file") != filename:
+            items.append({
+                "key": f"{prefix}/{filename}",
+                "body": body,
+                "content_type": "application/json",
+                "extra_args": {"CacheControl": publisher.IMMUTABLE_CACHE_CONTROL if frozen
+                               else publisher.DEFAULT_CACHE_CONTROL},
+                "profile_name": profile_name,
+            })
+
+    index = {
+        "updated": datetime.now(timezone.utc).isoformat(),
+        "current_season": current_season,
+        "columns": list(df.columns),
+        "seasons": seasons,
+    }
+    index_body = json.dumps(index, separators=(",", ":")).encode("utf-8")
+
+    logging.info(f"Publishing {len(items)} of {len(seasons)} season shards to {prefix}")
+    failed = [r["key"] for r in publisher.publish(items) if r.get("method") == "error"]
+    if not failed:
+        # Only after the shards, so the published index never names a missing file
+        results = publisher.publish_bytes(f"{prefix}/index.json", index_body, "application/json",
+                                          extra_args={"CacheControl": publisher.DEFAULT_CACHE_CONTROL},
+                                          profile_name=profile_name)
+        failed = [r["key"] for r in results if r.get("method") == "error"]
+    if failed:
+        # Keep the old indexes so the failed shards are retried next run
+        logging.error(f"Season shard publish failed for {len(failed)} keys; index not updated")
+        return index
+
+    os.makedirs(os.path.dirname(local_index_path) or ".", exist_ok=True)
+    with open(local_index_path, "wb") as f:
+        f.write(index_body)
+    return index
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""
+Shared, pooled HTTP client for the pipeline scripts
+
+One requests.Session per host, created on first use and reused for every
+later request to that host, so keep-alive connections survive across calls
+instead of paying a fresh TCP+TLS handshake each time. Each session has:
+- a connection pool sized by HTTP_POOL_CONNECTIONS / HTTP_POOL_MAXSIZE
+- urllib3 retries for GETs on 429/5xx with exponential backoff
+- gzip/deflate (and br when brotli is installed) Accept-Encoding
+- a default timeout for callers that don't pass one
+
+conditional_get() adds ETag / If-Modified-Since revalidation with the last
+body kept under data/cache/http, so unchanged resources come back as a
+304 with no payload.
+
+Per-host counters (requests, errors, 304s, bytes, seconds) are kept for the
+life of the process; get_stats() returns them and a one-line summary per
+host is logged at exit.
+
+Usage:
+    import http_client
+    response = http_client.get(url, params=params, timeout=30)
+"""
+
+import os
+import json
+import gzip
+import time
+import atexit
+import hashlib
+import logging
+import importlib.util
+import threading
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import telemetry
+
+POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "16"))
+DEFAULT_TIMEOUT = 30
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HTTP_CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", os.path.join(BASE_DIR, "data", "cache", "http"))
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# urllib3 decodes br only when brotli is importable
+if importlib.util.find_spec("brotli") is not None:
+    ACCEPT_ENCODING = "gzip, deflate, br"
+else:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+_sessions = {}
+_stats = {}
+_lock = threading.Lock()
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def create_session_with_retries(pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE):
+    """Create a pooled requests session with retry strategy for resilience."""
+    session = requests.Session()
+
+    # Define retry strategy
+    retry_strategy = Retry(
+        total=3,  # Total number of retries
+        backoff_factor=2,  # Wait time between retries (2, 4, 8 seconds)
+        status_forcelist=[500, 502, 503, 504, 429],  # HTTP status codes to retry
+        allowed_methods=["GET"]  # Only retry GET requests
+    )
+
+    # Mount adapter with retry strategy and a shared connection pool
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+
+    return session
+
+
+def get_session(url_or_host: str) -> requests.Session:
+    """Return the shared session for a host (accepts a URL or a bare host)"""
+    host = _host(url_or_host) if "://" in url_or_host else url_or_host.lower()
+    with _lock:
+        if host not in _sessions:
+            _sessions[host] = create_session_with_retries()
+        return _sessions[host]
+
+
+def _record(host: str, seconds: float, nbytes: int = 0, error: bool = False, not_modified: bool = False) -> None:
+    with _lock:
+        s = _stats.setdefault(host, {"requests": 0, "errors": 0, "not_modified": 0, "bytes": 0, "seconds": 0.0})
+        s["requests"] += 1
+        s["seconds"] += seconds
+        s["bytes"] += nbytes
+        s["errors"] += int(error)
+        s["not_modified"] += int(not_modified)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the host's pooled session (same arguments as requests.request)"""
+    host = _host(url)
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    started = time.perf_counter()
+    try:
+        response = get_session(host).request(method, url, **kwargs)
+    except Exception:
+        _record(host, time.perf_counter() - started, error=True)
+        raise
+    nbytes = 0 if kwargs.get("stream") else len(response.content)
+    _record(
+        host,
+        time.perf_counter() - started,
+        nbytes=nbytes,
+        error=response.status_code >= 400,
+        not_modified=response.status_code == 304,
+    )
+    return response
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Drop-in replacement for requests.get that reuses pooled connections"""
+    return request("GET", url, **kwargs)
+
+
+def _validator_paths(url: str, params: Optional[dict]) -> Tuple[str, str]:
+    key = url + ("?" + json.dumps(params, sort_keys=True) if params else "")
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return (
+        os.path.join(HTTP_CACHE_DIR, f"{digest}.meta.json"),
+        os.path.join(HTTP_CACHE_DIR, f"{digest}.body.gz"),
+    )
+
+
+def conditional_get(url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+                    **kwargs) -> Tuple[Optional[bytes], bool]:
+    """
+    GET with ETag / If-Modified-Since revalidation against the last response.
+
+    Returns:
+        (body, changed): the current body (None on failure with nothing cached)
+        and whether it differs from the previously cached copy
+    """
+    meta_path, body_path = _validator_paths(url, params)
+    meta = {}
+    cached_body = None
+    if os.path.exists(meta_path) and os.path.exists(body_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with gzip.open(body_path, "rb") as f:
+                cached_body = f.read()
+        except Exception:
+            meta, cached_body = {}, None
+
+    headers = dict(headers or {})
+    if cached_body is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = get(url, params=params, headers=headers, **kwargs)
+        if response.status_code == 304 and cached_body is not None:
+            telemetry.record_cache("http", hit=True)
+            return cached_body, False
+        response.raise_for_status()
+    except Exception as e:
+        logging.warning(f"Conditional GET failed for {url}: {e}")
+        return cached_body, False
+    telemetry.record_cache("http", hit=False)
+
+    body = response.content
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        with gzip.open(body_path, "wb") as f:
+            f.write(body)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }, f)
+    except OSError as e:
+        logging.warning(f"Could not cache response for {url}: {e}")
+    return body, body != cached_body
+
+
+def get_stats() -> dict:
+    """Per-host request counters for this process"""
+    with _lock:
+        return {host: dict(s) for host, s in _stats.items()}
+
+
+def reset_stats() -> None:
+    """Zero the per-host counters (e.g. between scripts in one process)"""
+    with _lock:
+        _stats.clear()
+
+
+def log_summary() -> None:
+    """Log one line of request counters per host"""
+    for host, s in sorted(get_stats().items()):
+        logging.info(
+            f"HTTP {host}: {s['requests']} requests ({s['errors']} errors, {s['not_modified']} not modified), "
+            f"{s['bytes'] / 1e6:.2f} MB, {s['seconds']:.1f}s"
+        )
+
+
+atexit.register(log_summary)
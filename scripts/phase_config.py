@@ -6,6 +6,8 @@ Defines which scripts should run in each season phase.
 This allows workflows to automatically adjust based on the current phase.
 """
 
+import os
+
 # Dataset/script configuration by phase
 PHASE_CONFIG = {
     "regular_season": {
@@ -32,12 +34,15 @@ PHASE_CONFIG = {
             "scripts/11_fetch_process_attendance.py",
             # Projection only during regular season
             "scripts/18_generate_projection.py",
+            "scripts/32_simulate_playoff_odds.py",
             # News for homepage ticker (no-op for tweet; JSON saved by default)
             "scripts/24_fetch_news.py",
             # Prediction markets (Kalshi odds)
             "scripts/31_fetch_kalshi_markets.py",
             # Summary aggregates
             "scripts/07_create_toplines_summary.py",
+            # Dashboard data bundles (after everything they pack)
+            "scripts/33_build_dashboard_bundle.py",
         ],
         "cadence": "multiple_times_daily"
     },
@@ -57,6 +62,7 @@ PHASE_CONFIG = {
             # Optionally refresh final regular season snapshots (low frequency)
             "scripts/00_fetch_league_standings.py",
             "scripts/07_create_toplines_summary.py",
+            "scripts/33_build_dashboard_bundle.py",
         ],
         "cadence": "daily"
     },
@@ -74,11 +80,88 @@ PHASE_CONFIG = {
             "scripts/10_fetch_process_historic_batting_gamelogs.py",
             "scripts/11_fetch_process_attendance.py",
             "scripts/12_fetch_process_historic_pitching_gamelogs.py",
+            "scripts/33_build_dashboard_bundle.py",
         ],
         "cadence": "weekly"
     }
 }
 
+# What each script needs to have run first in the same pass (it reads
+# their outputs). Dependencies outside the current phase are ignored:
+# the script then uses the output of an earlier run.
+SCRIPT_DEPENDENCIES = {
+    # boxscores archive
+    "scripts/04_fetch_process_standings.py": ["scripts/02_update_boxscores_archive.py"],
+    "scripts/09_build_wins_losses_from_boxscores.py": ["scripts/02_update_boxscores_archive.py"],
+    "scripts/10_fetch_process_historic_batting_gamelogs.py": ["scripts/02_update_boxscores_archive.py"],
+    "scripts/12_fetch_process_historic_pitching_gamelogs.py": ["scripts/02_update_boxscores_archive.py"],
+    # dodgers_wins_losses_current.json
+    "scripts/18_generate_projection.py": ["scripts/09_build_wins_losses_from_boxscores.py"],
+    # all_teams_standings_metrics_{year}.json
+    "scripts/32_simulate_playoff_odds.py": ["scripts/00_fetch_league_standings.py"],
+    # local pitch files
+    "scripts/21_summarize_pitch_data.py": ["scripts/20_fetch_game_pitches.py"],
+    # roster and transactions
+    "scripts/26_post_transactions.py": ["scripts/19_fetch_roster.py"],
+    "scripts/28_fetch_postseason_stats.py": ["scripts/19_fetch_roster.py"],
+    # league standings, league ranks, standings, batting, pitching,
+    # attendance and postseason series
+    "scripts/07_create_toplines_summary.py": [
+        "scripts/00_fetch_league_standings.py",
+        "scripts/03_scrape_league_ranks.py",
+        "scripts/04_fetch_process_standings.py",
+        "scripts/05_fetch_process_batting.py",
+        "scripts/06_fetch_process_pitching.py",
+        "scripts/11_fetch_process_attendance.py",
+        "scripts/28_fetch_postseason_stats.py",
+    ],
+    # the outputs packed into the dashboard bundles (07's outputs aren't
+    # packed; the bundle stage runs after it so it comes last in the pass)
+    "scripts/33_build_dashboard_bundle.py": [
+        "scripts/04_fetch_process_standings.py",
+        "scripts/07_create_toplines_summary.py",
+        "scripts/09_build_wins_losses_from_boxscores.py",
+        "scripts/10_fetch_process_historic_batting_gamelogs.py",
+        "scripts/11_fetch_process_attendance.py",
+        "scripts/12_fetch_process_historic_pitching_gamelogs.py",
+        "scripts/13_fetch_process_schedule.py",
+        "scripts/14_fetch_process_batting_mlb.py",
+        "scripts/14b_fetch_pitcher_stats_mlb.py",
+        "scripts/15_fetch_xwoba.py",
+        "scripts/21_summarize_pitch_data.py",
+        "scripts/28_fetch_postseason_stats.py",
+        "scripts/30_fetch_abs_challenges.py",
+        "scripts/31_fetch_kalshi_markets.py",
+    ],
+}
+
+# Rate-limited hosts each script talks to. fetch_engine throttles requests
+# within one process; these keep parallel scripts from multiplying that
+# budget.
+SCRIPT_HOSTS = {
+    "scripts/02_update_boxscores_archive.py": ["statsapi.mlb.com", "baseballsavant.mlb.com"],
+    "scripts/08_fetch_process_season_outcomes.py": ["www.baseball-reference.com"],
+    "scripts/11_fetch_process_attendance.py": ["www.baseball-reference.com"],
+    "scripts/15_fetch_xwoba.py": ["baseballsavant.mlb.com"],
+    "scripts/16_fetch_shohei.py": ["baseballsavant.mlb.com"],
+    "scripts/20_fetch_game_pitches.py": ["baseballsavant.mlb.com"],
+    "scripts/21_summarize_pitch_data.py": ["baseballsavant.mlb.com"],
+    "scripts/32_simulate_playoff_odds.py": ["statsapi.mlb.com"],
+}
+
+# Scripts allowed to use a host at the same time
+HOST_SCRIPT_LIMITS = {
+    "baseballsavant.mlb.com": 2,
+    "www.baseball-reference.com": 1,
+    "statsapi.mlb.com": 4,
+}
+
+# Scripts run at once by run_phase_scripts.py
+DEFAULT_WORKERS = 6
+
+# Seconds before a script is stopped
+SCRIPT_TIMEOUT = 600
+
 def get_scripts_for_phase(phase):
     """
     Get list of scripts to run for a given phase
@@ -95,6 +178,40 @@ def get_phase_description(phase):
     """Get human-readable description of what runs in a phase"""
     return PHASE_CONFIG.get(phase, {}).get("description", "Unknown phase")
 
+def get_dependencies(scripts):
+    """
+    Dependencies among a list of scripts
+
+    Returns:
+        dict script -> scripts in `scripts` it must wait for
+
+    Raises:
+        ValueError: if the dependencies form a cycle
+    """
+    in_run = set(scripts)
+    deps = {s: [d for d in SCRIPT_DEPENDENCIES.get(s, []) if d in in_run] for s in scripts}
+    topological_order(scripts, deps)
+    return deps
+
+def topological_order(scripts, deps):
+    """Scripts ordered so dependencies come first (ties keep config order)"""
+    order = []
+    done = set()
+    remaining = list(scripts)
+    while remaining:
+        ready = [s for s in remaining if all(d in done for d in deps.get(s, []))]
+        if not ready:
+            raise ValueError(f"Dependency cycle among: {', '.join(remaining)}")
+        for s in ready:
+            order.append(s)
+            done.add(s)
+        remaining = [s for s in remaining if s not in done]
+    return order
+
+def get_script_hosts(script):
+    """Rate-limited hosts a script uses"""
+    return SCRIPT_HOSTS.get(script, [])
+
 def get_phase_cadence(phase):
     """Get recommended run cadence for a phase"""
     return PHASE_CONFIG.get(phase, {}).get("cadence", "daily")
@@ -108,5 +225,7 @@ if __name__ == "__main__":
         print(f"Description: {config['description']}")
         print(f"Cadence: {config['cadence']}")
         print(f"\nScripts ({len(config['scripts'])}):")
+        deps = get_dependencies(config['scripts'])
         for script in config['scripts']:
-            print(f"  - {script}")
+            after = f"  (after {', '.join(os.path.basename(d) for d in deps[script])})" if deps[script] else ""
+            print(f"  - {script}{after}")
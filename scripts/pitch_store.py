@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+"""
+Partitioned store for the Dodgers pitch-by-pitch data
+
+20_fetch_game_pitches.py used to download the whole season's pitch JSON,
+append a few games and rewrite every file. Here each game is its own
+compact Parquet partition on S3:
+
+    dodgers/data/pitches/store/season={season}/role={role}/game_pk={game_pk}.parquet
+
+role is thrown_to_dodgers or thrown_by_dodgers. Next to the partitions,
+_index.json maps game_pk -> {pitches, game_date, sha256}. That is enough
+to decide which games need refetching without reading any pitches.
+
+- write_games() writes only games whose content hash changed, then the
+  index, and returns the changed game_pks
+- load_season() assembles a season from a local mirror under
+  data/cache/pitches/store, downloading only partitions whose hash differs
+  from the mirrored copy
+- seed_season() splits an existing season frame into partitions (one-time
+  migration from the published season JSON)
+
+Usage:
+    import pitch_store
+    counts = pitch_store.pitch_counts(2026, "thrown_to_dodgers")
+    changed = pitch_store.write_games(2026, "thrown_to_dodgers", {game_pk: df})
+"""
+
+import os
+import io
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+import pandas as pd
+from botocore.exceptions import ClientError
+
+from fetch_engine import map_concurrent
+from publisher import get_s3_client
+import telemetry
+
+BUCKET = "stilesdata.com"
+STORE_PREFIX = "dodgers/data/pitches/store"
+ROLES = ("thrown_to_dodgers", "thrown_by_dodgers")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "pitches", "store")
+
+# Rows are unique per pitch within a game
+PITCH_KEY = ["game_pk", "ab_number", "pitch_number"]
+
+_index_memo = {}
+
+
+def _partition_dir(season: int, role: str) -> str:
+    return f"season={int(season)}/role={role}"
+
+
+def _partition_key(season: int, role: str, game_pk: int) -> str:
+    return f"{STORE_PREFIX}/{_partition_dir(season, role)}/game_pk={int(game_pk)}.parquet"
+
+
+def _index_key(season: int, role: str) -> str:
+    return f"{STORE_PREFIX}/{_partition_dir(season, role)}/_index.json"
+
+
+def _local_path(season: int, role: str, name: str) -> str:
+    return os.path.join(CACHE_DIR, _partition_dir(season, role), name)
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Content hash of a game's rows (independent of Parquet encoding)"""
+    digest = hashlib.sha256(",".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    subset = [c for c in PITCH_KEY if c in df.columns]
+    if subset:
+        df = df.drop_duplicates(subset=subset, keep="last")
+    return df.reset_index(drop=True)
+
+
+def _read_local_index(season: int, role: str) -> dict:
+    try:
+        with open(_local_path(season, role, "_index.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _write_local_index(season: int, role: str, index: dict) -> None:
+    path = _local_path(season, role, "_index.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+
+def load_index(season: int, role: str, profile_name: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Return the season's index: str(game_pk) -> {pitches, game_date, sha256}
+
+    Empty when the season has not been written to the store yet.
+    """
+    memo_key = (int(season), role)
+    if memo_key not in _index_memo:
+        try:
+            s3 = get_s3_client(profile_name)
+            obj = s3.get_object(Bucket=BUCKET, Key=_index_key(season, role))
+            _index_memo[memo_key] = json.loads(obj["Body"].read().decode("utf-8")).get("games", {})
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "NoSuchKey":
+                logging.warning(f"Could not load pitch store index for {season}/{role}: {e}")
+            _index_memo[memo_key] = {}
+        except Exception as e:
+            logging.warning(f"Could not load pitch store index for {season}/{role}: {e}")
+            _index_memo[memo_key] = {}
+    return dict(_index_memo[memo_key])
+
+
+def pitch_counts(season: int, role: str, profile_name: Optional[str] = None) -> pd.Series:
+    """Stored pitch count per game_pk"""
+    index = load_index(season, role, profile_name)
+    return pd.Series({int(pk): entry.get("pitches", 0) for pk, entry in index.items()}, dtype="int64")
+
+
+def _upload_index(s3, season: int, role: str, index: dict) -> None:
+    body = json.dumps({"season": int(season), "role": role, "games": index}, indent=2, sort_keys=True)
+    s3.put_object(
+        Bucket=BUCKET,
+        Key=_index_key(season, role),
+        Body=body.encode("utf-8"),
+        ContentType="application/json",
+    )
+
+
+def write_games(season: int, role: str, games: Dict[int, pd.DataFrame],
+                profile_name: Optional[str] = None) -> List[int]:
+    """
+    Store one partition per game, replacing any previous copy
+
+    Games whose rows hash the same as the stored partition are skipped.
+
+    Returns:
+        game_pks whose partition was written
+    """
+    index = load_index(season, role, profile_name)
+    local_index = _read_local_index(season, role)
+    pending = []
+    for game_pk, df in games.items():
+        if df is None or df.empty:
+            continue
+        df = _prepare(df)
+        digest = frame_hash(df)
+        if index.get(str(int(game_pk)), {}).get("sha256") == digest:
+            continue
+        pending.append((int(game_pk), df, digest))
+
+    if not pending:
+        return []
+
+    s3 = get_s3_client(profile_name)
+
+    def write(item):
+        game_pk, df, digest = item
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False, compression="zstd")
+        body = buffer.getvalue()
+        path = _local_path(season, role, f"game_pk={game_pk}.parquet")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body)
+        s3.put_object(
+            Bucket=BUCKET,
+            Key=_partition_key(season, role, game_pk),
+            Body=body,
+            ContentType="application/vnd.apache.parquet",
+        )
+        return game_pk
+
+    written = [pk for pk in map_concurrent(write, pending) if pk is not None]
+    for game_pk, df, digest in pending:
+        if game_pk not in written:
+            continue
+        game_date = str(df["game_date"].iloc[0]) if "game_date" in df.columns else None
+        entry = {"pitches": int(len(df)), "game_date": game_date, "sha256": digest}
+        index[str(game_pk)] = entry
+        local_index[str(game_pk)] = entry
+
+    if written:
+        _upload_index(s3, season, role, index)
+        _write_local_index(season, role, local_index)
+        _index_memo[(int(season), role)] = index
+        telemetry.record_rows(f"{STORE_PREFIX}/{_partition_dir(season, role)}",
+                              sum(entry.get("pitches", 0) for entry in index.values()))
+        logging.info(f"Pitch store {season}/{role}: wrote {len(written)} game partitions")
+    return sorted(written)
+
+
+def load_season(season: int, role: str, profile_name: Optional[str] = None) -> pd.DataFrame:
+    """Every stored game for a season and role, in game_date/game_pk order"""
+    index = load_index(season, role, profile_name)
+    if not index:
+        return pd.DataFrame()
+    local_index = _read_local_index(season, role)
+
+    stale = [
+        int(pk) for pk, entry in index.items()
+        if local_index.get(pk, {}).get("sha256") != entry.get("sha256")
+        or not os.path.exists(_local_path(season, role, f"game_pk={pk}.parquet"))
+    ]
+    telemetry.record_cache("pitch_partitions", hit=True, count=len(index) - len(stale))
+    telemetry.record_cache("pitch_partitions", hit=False, count=len(stale))
+    if stale:
+        s3 = get_s3_client(profile_name)
+
+        def download(game_pk):
+            obj = s3.get_object(Bucket=BUCKET, Key=_partition_key(season, role, game_pk))
+            path = _local_path(season, role, f"game_pk={game_pk}.parquet")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(obj["Body"].read())
+            return game_pk
+
+        for game_pk in map_concurrent(download, stale):
+            if game_pk is not None:
+                local_index[str(game_pk)] = index[str(game_pk)]
+        _write_local_index(season, role, local_index)
+        logging.info(f"Pitch store {season}/{role}: downloaded {len(stale)} game partitions")
+
+    frames = []
+    for pk, entry in sorted(index.items(), key=lambda kv: (kv[1].get("game_date") or "", int(kv[0]))):
+        path = _local_path(season, role, f"game_pk={pk}.parquet")
+        if os.path.exists(path):
+            frames.append(pd.read_parquet(path))
+        else:
+            logging.warning(f"Missing pitch partition for game {pk}")
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def seed_season(season: int, role: str, df: pd.DataFrame, profile_name: Optional[str] = None) -> List[int]:
+    """Split a whole-season frame into game partitions (one-time migration)"""
+    if df is None or df.empty or "game_pk" not in df.columns:
+        return []
+    games = {int(pk): g for pk, g in df.groupby("game_pk", sort=False)}
+    logging.info(f"Seeding pitch store {season}/{role} with {len(games)} games")
+    return write_games(season, role, games, profile_name)
+
+
+if __name__ == "__main__":
+    season = pd.Timestamp.now().year
+    for role in ROLES:
+        counts = pitch_counts(season, role)
+        print(f"{season} {role}: {len(counts)} games, {int(counts.sum())} pitches")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Vectorized Monte Carlo engine for season win projections
+
+Every remaining game is a Bernoulli draw with its own win probability, so
+models differ only in the probability vector they produce:
+- bootstrap: the season-to-date win rate (resampling past W/L outcomes)
+- recent_form: an exponentially weighted win rate (recent games count more)
+- pythagorean: expected win rate from runs scored and allowed
+
+Any other per-game vector (home/away splits, opponent strength) plugs into
+simulate_win_paths() the same way, at the same cost. log5_probability()
+and series_probability() turn team strengths into game and series odds
+(used by the league-wide playoff simulation).
+
+Simulations run in chunks of chunk_size. Each chunk's cumulative-wins
+matrix is folded into a per-game histogram of win totals (game x wins),
+then discarded. Win totals are small integers, so the histogram gives
+exact means and quantiles for every game at once, in memory that doesn't
+grow with the number of simulations. A seeded numpy Generator makes
+the output reproducible.
+
+Usage:
+    from projection_engine import bootstrap_probability, simulate_win_paths
+    p = bootstrap_probability(df["win"].values)
+    result = simulate_win_paths(np.full(remaining, p), n_simulations=1_000_000)
+    result["mean"], result["quantiles"][0.025]
+"""
+
+from math import comb
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_SIMULATIONS = 10_000
+DEFAULT_CHUNK_SIZE = 20_000
+DEFAULT_SEED = 162
+DEFAULT_QUANTILES = (0.025, 0.975)
+PYTHAGOREAN_EXPONENT = 1.83
+
+
+def bootstrap_probability(outcomes: Sequence[int]) -> float:
+    """Win rate to date; drawing from it is the same as resampling past outcomes"""
+    outcomes = np.asarray(outcomes, dtype=float)
+    return float(outcomes.mean()) if outcomes.size else 0.5
+
+
+def recent_form_probability(outcomes: Sequence[int], half_life: float = 20.0) -> float:
+    """Exponentially weighted win rate; a game half_life games ago counts half"""
+    outcomes = np.asarray(outcomes, dtype=float)
+    if not outcomes.size:
+        return 0.5
+    age = np.arange(outcomes.size)[::-1]
+    weights = 0.5 ** (age / half_life)
+    return float(np.dot(weights, outcomes) / weights.sum())
+
+
+def pythagorean_probability(runs_scored: Sequence[float], runs_allowed: Sequence[float],
+                            exponent: float = PYTHAGOREAN_EXPONENT) -> float:
+    """Expected win rate from total runs scored and allowed"""
+    rs = float(np.sum(runs_scored))
+    ra = float(np.sum(runs_allowed))
+    if rs + ra <= 0:
+        return 0.5
+    return rs ** exponent / (rs ** exponent + ra ** exponent)
+
+
+def log5_probability(p_a, p_b):
+    """Chance team A beats team B given each one's win rate against an average team (log5)"""
+    p_a = np.asarray(p_a, dtype=float)
+    p_b = np.asarray(p_b, dtype=float)
+    return p_a * (1 - p_b) / (p_a * (1 - p_b) + p_b * (1 - p_a))
+
+
+def series_probability(p, games: int):
+    """Chance of winning a best-of-`games` series with per-game win probability p"""
+    p = np.asarray(p, dtype=float)
+    needed = games // 2 + 1
+    total = np.zeros_like(p)
+    # Win the deciding game after `lost` losses: C(needed - 1 + lost, lost) p^needed (1 - p)^lost
+    for lost in range(needed):
+        total += comb(needed - 1 + lost, lost) * p ** needed * (1 - p) ** lost
+    return total
+
+
+def histogram_quantiles(counts: np.ndarray, quantiles: Iterable[float]) -> Dict[float, np.ndarray]:
+    """
+    Quantiles per row of a value histogram (row i: counts of value 0..k)
+
+    Matches np.percentile's default linear interpolation on the samples the
+    histogram was built from.
+    """
+    counts = np.asarray(counts)
+    n = int(counts[0].sum())
+    cumulative = counts.cumsum(axis=1)
+
+    def order_statistic(k):
+        # Smallest value whose cumulative count exceeds rank k (0-based)
+        return np.argmax(cumulative > k, axis=1)
+
+    result = {}
+    for q in quantiles:
+        h = q * (n - 1)
+        lo = int(np.floor(h))
+        hi = min(lo + 1, n - 1)
+        x_lo = order_statistic(lo)
+        x_hi = order_statistic(hi)
+        result[q] = x_lo + (h - lo) * (x_hi - x_lo)
+    return result
+
+
+def simulate_win_paths(probabilities: Sequence[float], n_simulations: int = DEFAULT_SIMULATIONS,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE, seed: Optional[int] = DEFAULT_SEED,
+                       quantiles: Iterable[float] = DEFAULT_QUANTILES) -> dict:
+    """
+    Simulate the remaining games and summarize cumulative wins after each
+
+    Args:
+        probabilities: Win probability for each remaining game, in order
+        n_simulations: Number of simulated seasons
+        chunk_size: Seasons simulated per batch (bounds memory)
+        seed: Seed for numpy's Generator (None for fresh entropy)
+        quantiles: Quantiles to report for each game
+
+    Returns:
+        dict with mean (array, wins added through each remaining game),
+        quantiles ({q: array}), counts (game x wins histogram) and
+        n_simulations
+    """
+    p = np.asarray(probabilities, dtype=np.float32)
+    remaining = p.size
+    quantiles = tuple(quantiles)
+    if remaining == 0 or n_simulations <= 0:
+        empty = np.zeros(0)
+        return {"mean": empty, "quantiles": {q: empty for q in quantiles},
+                "counts": np.zeros((0, 1), dtype=np.int64), "n_simulations": 0}
+
+    rng = np.random.default_rng(seed)
+    width = remaining + 1
+    counts = np.zeros(remaining * width, dtype=np.int64)
+    offsets = np.arange(remaining, dtype=np.int64) * width
+    wins_dtype = np.int16 if remaining < np.iinfo(np.int16).max else np.int32
+
+    done = 0
+    while done < n_simulations:
+        size = min(chunk_size, n_simulations - done)
+        wins = (rng.random((size, remaining), dtype=np.float32) < p).cumsum(axis=1, dtype=wins_dtype)
+        counts += np.bincount((wins + offsets).ravel(), minlength=counts.size)
+        done += size
+
+    counts = counts.reshape(remaining, width)
+    mean = counts @ np.arange(width) / n_simulations
+    return {
+        "mean": mean,
+        "quantiles": histogram_quantiles(counts, quantiles),
+        "counts": counts,
+        "n_simulations": n_simulations,
+    }
@@ -0,0 +1,381 @@
+#!/usr/bin/env python
+"""
+Shared S3 publishing layer
+
+Most scripts end by serializing a DataFrame to CSV/JSON/Parquet and
+uploading every file, even when nothing changed, and by uploading the same
+file again under a `_current` alias. This module handles that step:
+
+- each dataset is serialized once per format
+- the body's SHA-256 is compared with the existing object (x-amz-meta-sha256,
+  or the ETag, which is the MD5 for single-part uploads) and identical
+  writes are skipped
+- JSON/CSV/text bodies are gzipped at build time and stored with
+  Content-Encoding: gzip (browsers, requests and pandas decode it)
+- every object gets a Cache-Control: immutable for year-stamped files from
+  past seasons, short for `_current` aliases, otherwise by the dataset's
+  cadence in data/manifest.json
+- alias keys are published with a server-side copy_object instead of a
+  second upload
+- the uploads that remain run concurrently
+- every result is recorded in a change report
+  (data/cache/publish/changes.json) that the manifest step reads to know
+  when each key last actually changed
+
+Usage:
+    import publisher
+    publisher.publish_dataframe(
+        df, "dodgers/data/standings/dodgers_schedule", ["csv", "json"],
+        aliases=["dodgers/data/standings/dodgers_schedule_current"],
+    )
+"""
+
+import os
+import re
+import gzip
+import json
+import fcntl
+import hashlib
+import logging
+import mimetypes
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import boto3
+import pandas as pd
+from botocore.exceptions import ClientError
+
+import telemetry
+from fetch_engine import map_concurrent
+
+BUCKET = "stilesdata.com"
+MAX_WORKERS = 8
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_PATH = os.path.join(BASE_DIR, "data", "cache", "publish", "changes.json")
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "parquet": "application/octet-stream",
+}
+
+# Stored gzipped (Parquet is already compressed). S3 can't negotiate
+# encodings per request, so only gzip, which every client decodes.
+COMPRESSIBLE_TYPES = {
+    "application/json", "text/csv", "text/plain", "text/html", "text/css",
+    "application/javascript", "text/javascript", "image/svg+xml",
+}
+MIN_COMPRESS_BYTES = 1024
+
+MANIFEST_PATH = os.path.join(BASE_DIR, "data", "manifest.json")
+PUBLIC_URL = f"https://{BUCKET}/"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+CURRENT_CACHE_CONTROL = "public, max-age=60"
+DEFAULT_CACHE_CONTROL = "public, max-age=300"
+CACHE_CONTROL_BY_CADENCE = {
+    "multiple_times_daily": "public, max-age=300",
+    "regular_season_daily": "public, max-age=300",
+    "postseason_only": "public, max-age=300",
+    "daily": "public, max-age=3600",
+    "regular_season_weekly": "public, max-age=86400",
+    "weekly": "public, max-age=86400",
+}
+_YEAR = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+_LIVE_NAME = re.compile(r"current|present|latest")
+
+_cadences = None
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_s3_client(profile_name: Optional[str] = None):
+    """Return a (cached) S3 client with sensible local/CI behavior.
+
+    Priority:
+    1) Explicit CLI profile
+    2) If running in GitHub Actions, use default chain (env/role)
+    3) AWS_PROFILE env var
+    4) Local fallback profile 'haekeo'
+    """
+    with _clients_lock:
+        if profile_name not in _clients:
+            if profile_name:
+                session = boto3.session.Session(profile_name=profile_name)
+            elif os.environ.get("GITHUB_ACTIONS") == "true":
+                session = boto3.session.Session()
+            else:
+                session = boto3.session.Session(profile_name=os.environ.get("AWS_PROFILE") or "haekeo")
+            client = session.client("s3")
+            telemetry.instrument_s3(client)
+            _clients[profile_name] = client
+        return _clients[profile_name]
+
+
+def serialize(df: pd.DataFrame, fmt: str, json_indent: Optional[int] = 2) -> bytes:
+    """Serialize a DataFrame the way the pipeline's published files are written"""
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    if fmt == "json":
+        return df.to_json(orient="records", indent=json_indent).encode("utf-8")
+    if fmt == "parquet":
+        return df.to_parquet(index=False)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _manifest_cadences() -> Dict[str, str]:
+    """S3 key -> cadence, from the last manifest written locally"""
+    global _cadences
+    if _cadences is None:
+        try:
+            with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+                datasets = json.load(f).get("datasets", [])
+            _cadences = {
+                d["url"][len(PUBLIC_URL):].split("?", 1)[0]: d.get("cadence")
+                for d in datasets if d.get("url", "").startswith(PUBLIC_URL)
+            }
+        except Exception:
+            _cadences = {}
+    return _cadences
+
+
+def cache_control_for(key: str) -> str:
+    """
+    Cache-Control for a key
+
+    Year-stamped files whose latest year is a past season never change
+    (archives, finished seasons); `_current`/`present`/`latest` files always
+    can. Everything else follows its manifest cadence.
+    """
+    name = key.rsplit("/", 1)[-1]
+    if _LIVE_NAME.search(name):
+        return CURRENT_CACHE_CONTROL
+    years = [int(y) for y in _YEAR.findall(name)]
+    if years and max(years) < datetime.now().year:
+        return IMMUTABLE_CACHE_CONTROL
+    return CACHE_CONTROL_BY_CADENCE.get(_manifest_cadences().get(key), DEFAULT_CACHE_CONTROL)
+
+
+def encode_body(body: bytes, content_type: str):
+    """(stored body, Content-Encoding or None) for a payload"""
+    base_type = content_type.split(";", 1)[0].strip()
+    if base_type in COMPRESSIBLE_TYPES and len(body) >= MIN_COMPRESS_BYTES:
+        # mtime=0 keeps the bytes (and ETag) identical for identical input
+        return gzip.compress(body, compresslevel=9, mtime=0), "gzip"
+    return body, None
+
+
+def _digests(body: bytes) -> Dict[str, str]:
+    return {"sha256": hashlib.sha256(body).hexdigest(), "md5": hashlib.md5(body).hexdigest()}
+
+
+def _remote_matches(s3, key: str, digests: Dict[str, str], headers: Dict[str, str]) -> bool:
+    """True if the object holds the same content with the same headers"""
+    try:
+        head = s3.head_object(Bucket=BUCKET, Key=key)
+    except ClientError as e:
+        if str(e.response.get("Error", {}).get("Code")) in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+    # Objects from before compression/caching was added are rewritten once
+    if any(head.get(name) != value for name, value in headers.items()):
+        return False
+    if head.get("Metadata", {}).get("sha256"):
+        return head["Metadata"]["sha256"] == digests["sha256"]
+    return head.get("ETag", "").strip('"') == digests["md5"]
+
+
+def _publish_one(item: dict) -> List[dict]:
+    s3 = get_s3_client(item.get("profile_name"))
+    body = item["body"]
+    # sha256 is of the logical (uncompressed) content; md5 of the stored bytes
+    stored, encoding = encode_body(body, item["content_type"]) if item.get("compress", True) else (body, None)
+    digests = {"sha256": _digests(body)["sha256"], "md5": _digests(stored)["md5"]}
+    key = item["key"]
+    extra_args = dict(item.get("extra_args", {}))
+    extra_args.setdefault("CacheControl", cache_control_for(key))
+    if encoding:
+        extra_args["ContentEncoding"] = encoding
+    results = []
+
+    def expected_headers(args):
+        return {"ContentEncoding": args.get("ContentEncoding"), "CacheControl": args.get("CacheControl")}
+
+    changed = not _remote_matches(s3, key, digests, expected_headers(extra_args))
+    if changed:
+        s3.put_object(
+            Bucket=BUCKET,
+            Key=key,
+            Body=stored,
+            ContentType=item["content_type"],
+            Metadata={"sha256": digests["sha256"]},
+            **extra_args,
+        )
+        encoded = f", {encoding} {len(stored)} bytes" if encoding else ""
+        logging.info(f"Uploaded s3://{BUCKET}/{key} ({len(body)} bytes{encoded})")
+    else:
+        logging.info(f"Unchanged, skipped s3://{BUCKET}/{key}")
+    results.append({"key": key, "changed": changed, "method": "put" if changed else "skip",
+                    "sha256": digests["sha256"], "size": len(stored), "content_type": item["content_type"]})
+
+    # Aliases are server-side copies of the primary object, with their own
+    # Cache-Control (a `_current` alias changes even when the primary won't)
+    for alias in item.get("aliases", []):
+        alias_args = dict(extra_args, CacheControl=item.get("extra_args", {}).get("CacheControl")
+                          or cache_control_for(alias))
+        alias_changed = changed or not _remote_matches(s3, alias, digests, expected_headers(alias_args))
+        if alias_changed:
+            s3.copy_object(
+                Bucket=BUCKET,
+                Key=alias,
+                CopySource={"Bucket": BUCKET, "Key": key},
+                MetadataDirective="REPLACE",
+                ContentType=item["content_type"],
+                Metadata={"sha256": digests["sha256"]},
+                **alias_args,
+            )
+            logging.info(f"Copied s3://{BUCKET}/{key} -> {alias}")
+        results.append({"key": alias, "changed": alias_changed, "method": "copy" if alias_changed else "skip",
+                        "sha256": digests["sha256"], "size": len(stored), "content_type": item["content_type"]})
+    return results
+
+
+def publish(items: Iterable[dict], max_workers: int = MAX_WORKERS) -> List[dict]:
+    """
+    Publish prepared items concurrently and record them in the change report
+
+    Each item is a dict with key, body (bytes) and content_type, plus
+    optional aliases (list of keys), extra_args (put_object kwargs, e.g. a
+    CacheControl overriding cache_control_for), compress (default True)
+    and profile_name.
+
+    Returns:
+        One result per key (primary and aliases): key, changed, method
+        ('put', 'copy' or 'skip'), sha256 (of the uncompressed content),
+        size (bytes as stored, i.e. after gzip, same as HEAD's
+        ContentLength), content_type, and error when the publish failed
+    """
+    items = list(items)
+
+    def run(item):
+        try:
+            return _publish_one(item)
+        except Exception as e:
+            logging.error(f"Failed to publish s3://{BUCKET}/{item['key']}: {e}")
+            return [{"key": k, "changed": False, "method": "error", "error": str(e)}
+                    for k in [item["key"]] + list(item.get("aliases", []))]
+
+    results = [r for batch in map_concurrent(run, items, max_workers=max_workers) if batch for r in batch]
+    record_changes(results)
+    changed = sum(r["changed"] for r in results)
+    logging.info(f"Published {len(results)} keys: {changed} changed, {len(results) - changed} unchanged or failed")
+    return results
+
+
+def publish_bytes(key: str, body: bytes, content_type: Optional[str] = None,
+                  aliases: Iterable[str] = (), **kwargs) -> List[dict]:
+    """Publish one in-memory object (and its aliases)"""
+    content_type = content_type or mimetypes.guess_type(key)[0] or "application/octet-stream"
+    return publish([{"key": key, "body": body, "content_type": content_type,
+                     "aliases": list(aliases), **kwargs}])
+
+
+def publish_file(path: str, key: str, content_type: Optional[str] = None,
+                 aliases: Iterable[str] = (), **kwargs) -> List[dict]:
+    """Publish a local file (and its aliases)"""
+    with open(path, "rb") as f:
+        body = f.read()
+    return publish_bytes(key, body, content_type or CONTENT_TYPES.get(path.rsplit(".", 1)[-1]), aliases, **kwargs)
+
+
+def publish_files(files: Dict[str, str], aliases: Optional[Dict[str, Iterable[str]]] = None,
+                  **kwargs) -> List[dict]:
+    """Publish several local files ({path: key}) concurrently"""
+    aliases = aliases or {}
+    items = []
+    for path, key in files.items():
+        with open(path, "rb") as f:
+            body = f.read()
+        content_type = CONTENT_TYPES.get(path.rsplit(".", 1)[-1]) or mimetypes.guess_type(path)[0]
+        items.append({"key": key, "body": body, "content_type": content_type or "application/octet-stream",
+                      "aliases": list(aliases.get(path, [])), **kwargs})
+    return publish(items)
+
+
+def publish_dataframe(df: pd.DataFrame, base_key: str, formats: Iterable[str],
+                      aliases: Iterable[str] = (), local_base: Optional[str] = None,
+                      json_indent: Optional[int] = 2, **kwargs) -> List[dict]:
+    """
+    Serialize a DataFrame once per format and publish {base_key}.{fmt}
+
+    Args:
+        df: Data to publish
+        base_key: S3 key without extension
+        formats: Any of csv, json, parquet
+        aliases: Other base keys that should hold the same content
+            (e.g. a `_current` alias); published with copy_object
+        local_base: Also write the same bytes to {local_base}.{fmt}
+        json_indent: Indent for the JSON format
+    """
+    telemetry.record_rows(base_key, len(df))
+    items = []
+    for fmt in formats:
+        body = serialize(df, fmt, json_indent=json_indent)
+        if local_base:
+            os.makedirs(os.path.dirname(local_base) or ".", exist_ok=True)
+            with open(f"{local_base}.{fmt}", "wb") as f:
+                f.write(body)
+        items.append({
+            "key": f"{base_key}.{fmt}",
+            "body": body,
+            "content_type": CONTENT_TYPES[fmt],
+            "aliases": [f"{alias}.{fmt}" for alias in aliases],
+            **kwargs,
+        })
+    return publish(items)
+
+
+def record_changes(results: List[dict]) -> None:
+    """Merge publish results into the change report (safe across processes)"""
+    if not results:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    try:
+        os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+        with open(REPORT_PATH + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            report = load_report()
+            for r in results:
+                if r.get("method") == "error":
+                    continue
+                entry = report.get(r["key"], {})
+                entry.update({k: r[k] for k in ("sha256", "size", "content_type")})
+                entry["checked_at"] = now
+                if r["changed"] or "changed_at" not in entry:
+                    entry["changed_at"] = now
+                report[r["key"]] = entry
+            tmp_path = f"{REPORT_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, REPORT_PATH)
+    except Exception as e:
+        logging.warning(f"Could not update publish change report: {e}")
+
+
+def load_report() -> Dict[str, dict]:
+    """Key -> {sha256, size, content_type, changed_at, checked_at}"""
+    try:
+        with open(REPORT_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+if __name__ == "__main__":
+    report = load_report()
+    print(f"Publish change report: {REPORT_PATH} ({len(report)} keys)")
+    for key, entry in sorted(report.items(), key=lambda kv: kv[1].get("changed_at", ""), reverse=True)[:20]:
+        print(f"  {entry.get('changed_at', '?')}  {key}")
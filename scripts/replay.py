@@ -0,0 +1,549 @@
+#!/usr/bin/env python
+"""
+Record/replay layer for running pipeline scripts without the network
+
+Two stand-ins are installed in the script's process:
+
+- HTTP: requests' HTTPAdapter.send and urllib.request.urlopen (which pandas
+  uses for read_parquet/read_json on URLs) are patched. In record mode,
+  live responses are saved under {fixtures}/http. In replay mode they are
+  served from there; a request with no fixture fails like a network error
+  and is counted as a miss.
+- S3: botocore S3 calls (clients, resources, upload_file) go to LocalBucket,
+  a directory-backed stand-in for the stilesdata.com bucket. Writes land in
+  a scratch directory, never in S3. Reads check the scratch directory
+  first, then {fixtures}/bucket. In record mode, objects missing there
+  are read from the real bucket once and saved. Public
+  https://stilesdata.com/... URLs are served from the same bucket.
+
+Usage (normally through benchmark_pipeline.py):
+    python scripts/replay.py --mode replay --fixtures benchmarks/fixtures/default \\
+        --bucket /tmp/work/bucket scripts/04_fetch_process_standings.py
+
+Set PIPELINE_TELEMETRY_FILE and PIPELINE_REPLAY_STATS to receive the
+script's telemetry snapshot and the replay counters (requests, misses and
+S3 operations) as JSON at exit.
+"""
+
+import os
+import io
+import sys
+import json
+import gzip
+import runpy
+import atexit
+import hashlib
+import logging
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from email.message import Message
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+BUCKET = "stilesdata.com"
+PUBLIC_HOST = "stilesdata.com"
+
+# Hop-by-hop / transfer headers that no longer apply to a stored, decoded body
+DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+_lock = threading.Lock()
+_stats = {"http": {}, "s3": {}}
+
+
+def _count(section: str, name: str, field: str = "requests", n: int = 1) -> None:
+    with _lock:
+        entry = _stats[section].setdefault(name, {})
+        entry[field] = entry.get(field, 0) + n
+
+
+def get_stats() -> dict:
+    with _lock:
+        return json.loads(json.dumps(_stats))
+
+
+# ---------------------------------------------------------------------------
+# Local bucket
+# ---------------------------------------------------------------------------
+
+class LocalBucket:
+    """
+    Directory-backed stand-in for the S3 bucket
+
+    Objects are files under {root}/objects/{key}; content type, metadata
+    and ETag live in {root}/meta/{key}.json. Reads fall back to `seed`
+    (another LocalBucket), then to `origin` (callable key -> (body, head)
+    or None) whose results are saved into the seed.
+    """
+
+    def __init__(self, root: str, seed: Optional["LocalBucket"] = None, origin=None):
+        self.root = root
+        self.seed = seed
+        self.origin = origin
+        self.uploads = {}
+
+    def _paths(self, key: str):
+        return (os.path.join(self.root, "objects", key),
+                os.path.join(self.root, "meta", key + ".json"))
+
+    def put(self, key: str, body: bytes, content_type: Optional[str] = None,
+            metadata: Optional[dict] = None, extra: Optional[dict] = None) -> dict:
+        obj_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(obj_path), exist_ok=True)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with open(obj_path, "wb") as f:
+            f.write(body)
+        head = {
+            "ContentType": content_type or "binary/octet-stream",
+            "Metadata": metadata or {},
+            "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+            "LastModified": datetime.now(timezone.utc).isoformat(),
+            **(extra or {}),
+        }
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(head, f)
+        return head
+
+    def _local(self, key: str):
+        obj_path, meta_path = self._paths(key)
+        if not os.path.exists(obj_path):
+            return None
+        with open(obj_path, "rb") as f:
+            body = f.read()
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                head = json.load(f)
+        except (OSError, ValueError):
+            head = {"ETag": f'"{hashlib.md5(body).hexdigest()}"', "Metadata": {}}
+        return body, head
+
+    def get(self, key: str):
+        """(body, head) or None"""
+        found = self._local(key)
+        if found is None and self.seed is not None:
+            found = self.seed.get(key)
+        if found is None and self.origin is not None:
+            fetched = self.origin(key)
+            if fetched is not None:
+                body, head = fetched
+                target = self.seed or self
+                target.put(key, body, head.get("ContentType"), head.get("Metadata"),
+                           {k: head[k] for k in ("CacheControl", "ContentEncoding") if head.get(k)})
+                found = target._local(key)
+        return found
+
+    def keys(self, prefix: str = "") -> list:
+        base = os.path.join(self.root, "objects")
+        found = set()
+        for dirpath, _, files in os.walk(base):
+            for name in files:
+                key = os.path.relpath(os.path.join(dirpath, name), base).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    found.add(key)
+        if self.seed is not None:
+            found |= set(self.seed.keys(prefix))
+        return sorted(found)
+
+
+def _client_error(code: str, operation: str, status: int = 404):
+    from botocore.exceptions import ClientError
+    return ClientError({"Error": {"Code": code, "Message": code},
+                        "ResponseMetadata": {"HTTPStatusCode": status}}, operation)
+
+
+def _read_body(body) -> bytes:
+    if body is None:
+        return b""
+    if hasattr(body, "read"):
+        body = body.read()
+    return body.encode("utf-8") if isinstance(body, str) else bytes(body)
+
+
+def _head_response(body: bytes, head: dict) -> dict:
+    response = {
+        "ContentLength": len(body),
+        "ContentType": head.get("ContentType", "binary/octet-stream"),
+        "ETag": head.get("ETag"),
+        "Metadata": head.get("Metadata", {}),
+        "LastModified": datetime.fromisoformat(head["LastModified"]) if head.get("LastModified")
+        else datetime.now(timezone.utc),
+    }
+    for field in ("CacheControl", "ContentEncoding"):
+        if head.get(field):
+            response[field] = head[field]
+    return response
+
+
+def handle_s3(bucket: LocalBucket, operation: str, params: dict, origin_list=None) -> dict:
+    """Serve one S3 API operation from the local bucket"""
+    from botocore.response import StreamingBody
+
+    _count("s3", operation)
+    key = params.get("Key")
+
+    if operation == "PutObject":
+        body = _read_body(params.get("Body"))
+        _count("s3", operation, "bytes_up", len(body))
+        extra = {f: params[f] for f in ("CacheControl", "ContentEncoding") if params.get(f)}
+        head = bucket.put(key, body, params.get("ContentType"), params.get("Metadata"), extra)
+        return {"ETag": head["ETag"]}
+
+    if operation in ("GetObject", "HeadObject"):
+        found = bucket.get(key)
+        if found is None:
+            raise _client_error("NoSuchKey" if operation == "GetObject" else "404", operation)
+        body, head = found
+        response = _head_response(body, head)
+        if operation == "GetObject":
+            _count("s3", operation, "bytes_down", len(body))
+            response["Body"] = StreamingBody(io.BytesIO(body), len(body))
+        return response
+
+    if operation == "CopyObject":
+        source = params["CopySource"]
+        if isinstance(source, str):
+            source_key = source.split("/", 1)[1] if "/" in source else source
+        else:
+            source_key = source["Key"]
+        found = bucket.get(source_key)
+        if found is None:
+            raise _client_error("NoSuchKey", operation)
+        body, head = found
+        if params.get("MetadataDirective") == "REPLACE":
+            content_type, metadata, headers = params.get("ContentType"), params.get("Metadata"), params
+        else:
+            content_type, metadata, headers = head.get("ContentType"), head.get("Metadata"), head
+        extra = {f: headers[f] for f in ("CacheControl", "ContentEncoding") if headers.get(f)}
+        new_head = bucket.put(key, body, content_type, metadata, extra)
+        return {"CopyObjectResult": {"ETag": new_head["ETag"]}}
+
+    if operation == "ListObjectsV2":
+        prefix = params.get("Prefix", "")
+        if origin_list is not None:
+            origin_list(prefix)
+        contents = []
+        for k in bucket.keys(prefix):
+            body, head = bucket.get(k)
+            contents.append({"Key": k, "ETag": head.get("ETag"), "Size": len(body),
+                             "LastModified": _head_response(body, head)["LastModified"]})
+        return {"Contents": contents, "KeyCount": len(contents), "IsTruncated": False, "Prefix": prefix}
+
+    if operation == "DeleteObject":
+        obj_path, meta_path = bucket._paths(key)
+        for path in (obj_path, meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return {}
+
+    if operation == "CreateMultipartUpload":
+        upload_id = hashlib.sha1(f"{key}{len(bucket.uploads)}".encode()).hexdigest()
+        bucket.uploads[upload_id] = {"key": key, "parts": {}, "ContentType": params.get("ContentType"),
+                                     "Metadata": params.get("Metadata")}
+        return {"UploadId": upload_id, "Key": key}
+
+    if operation == "UploadPart":
+        body = _read_body(params.get("Body"))
+        bucket.uploads[params["UploadId"]]["parts"][params["PartNumber"]] = body
+        return {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}
+
+    if operation == "CompleteMultipartUpload":
+        upload = bucket.uploads.pop(params["UploadId"])
+        body = b"".join(upload["parts"][n] for n in sorted(upload["parts"]))
+        _count("s3", "PutObject", "bytes_up", len(body))
+        head = bucket.put(upload["key"], body, upload["ContentType"], upload["Metadata"])
+        return {"ETag": head["ETag"], "Key": upload["key"]}
+
+    if operation == "AbortMultipartUpload":
+        bucket.uploads.pop(params.get("UploadId"), None)
+        return {}
+
+    raise _client_error("NotImplemented", operation, 501)
+
+
+# ---------------------------------------------------------------------------
+# HTTP fixtures
+# ---------------------------------------------------------------------------
+
+def normalize_url(url: str) -> str:
+    """URL with its query parameters sorted (fixture identity)"""
+    parts = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunparse(parts._replace(query=query, fragment=""))
+
+
+def fixture_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    digest = hashlib.sha256(f"{method.upper()} {normalize_url(url)}".encode("utf-8"))
+    if body:
+        digest.update(b"\n" + hashlib.sha256(body).digest())
+    return digest.hexdigest()
+
+
+class HttpFixtures:
+    """Responses stored as {dir}/{key}.json (status, headers) + {key}.body.gz"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _paths(self, key: str):
+        return os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.body.gz")
+
+    def save(self, method: str, url: str, req_body: Optional[bytes], status: int,
+             headers: dict, body: bytes) -> None:
+        meta_path, body_path = self._paths(fixture_key(method, url, req_body))
+        os.makedirs(self.directory, exist_ok=True)
+        headers = {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS}
+        with gzip.open(body_path, "wb") as f:
+            f.write(body)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"method": method.upper(), "url": url, "status": status, "headers": headers}, f)
+
+    def load(self, method: str, url: str, req_body: Optional[bytes]):
+        """(status, headers, body) or None"""
+        meta_path, body_path = self._paths(fixture_key(method, url, req_body))
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with gzip.open(body_path, "rb") as f:
+            body = f.read()
+        return meta["status"], meta["headers"], body
+
+
+def _public_key(url: str) -> Optional[str]:
+    """Bucket key for a public https://stilesdata.com/... URL"""
+    parts = urlparse(url)
+    if parts.netloc.lower() in (PUBLIC_HOST, f"www.{PUBLIC_HOST}"):
+        return parts.path.lstrip("/")
+    return None
+
+
+def _build_response(request, status: int, headers: dict, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response._content_consumed = True
+    response.raw = io.BytesIO(body)
+    response.url = request.url
+    response.request = request
+    response.reason = requests.status_codes._codes.get(status, ("",))[0].upper().replace("_", " ")
+    response.encoding = get_encoding_from_headers(response.headers)
+    return response
+
+
+class _UrlopenResponse(io.BytesIO):
+    """Just enough of http.client.HTTPResponse for pandas and friends"""
+
+    def __init__(self, url: str, status: int, headers: dict, body: bytes):
+        super().__init__(body)
+        self.url = url
+        self.status = self.code = status
+        self.headers = Message()
+        for k, v in headers.items():
+            self.headers[k] = v
+
+    def getcode(self):
+        return self.status
+
+    def geturl(self):
+        return self.url
+
+    def info(self):
+        return self.headers
+
+
+# ---------------------------------------------------------------------------
+# Installation
+# ---------------------------------------------------------------------------
+
+def install(mode: str, fixtures_dir: str, bucket_dir: str) -> LocalBucket:
+    """
+    Patch HTTP and S3 for this process
+
+    Args:
+        mode: 'record' (live network, responses saved) or 'replay'
+        fixtures_dir: Fixture directory (http/ and bucket/ inside)
+        bucket_dir: Scratch directory for objects written by the scripts
+    """
+    import botocore.client
+
+    if mode not in ("record", "replay"):
+        raise ValueError(f"Unknown replay mode: {mode}")
+    recording = mode == "record"
+    http = HttpFixtures(os.path.join(fixtures_dir, "http"))
+    original_send = HTTPAdapter.send
+    original_urlopen = urllib.request.urlopen
+    original_api_call = botocore.client.BaseClient._make_api_call
+    real_s3 = {}
+
+    def origin(key):
+        # Record mode only: read an object from the real bucket once
+        try:
+            client = real_s3.setdefault("client", _real_s3_client())
+            obj = original_api_call(client, "GetObject", {"Bucket": BUCKET, "Key": key})
+        except Exception:
+            return None
+        body = obj["Body"].read()
+        _count("s3", "origin_get", "bytes_down", len(body))
+        return body, {"ContentType": obj.get("ContentType"), "Metadata": obj.get("Metadata", {}),
+                      "CacheControl": obj.get("CacheControl"), "ContentEncoding": obj.get("ContentEncoding")}
+
+    def origin_list(prefix):
+        client = real_s3.setdefault("client", _real_s3_client())
+        token = None
+        while True:
+            params = {"Bucket": BUCKET, "Prefix": prefix}
+            if token:
+                params["ContinuationToken"] = token
+            page = original_api_call(client, "ListObjectsV2", params)
+            for obj in page.get("Contents", []):
+                bucket.get(obj["Key"])
+            if not page.get("IsTruncated"):
+                break
+            token = page.get("NextContinuationToken")
+
+    seed = LocalBucket(os.path.join(fixtures_dir, "bucket"))
+    bucket = LocalBucket(bucket_dir, seed=seed, origin=origin if recording else None)
+
+    def serve(method, url, req_body):
+        """(status, headers, body) from the bucket or fixtures; None on a replay miss"""
+        host = urlparse(url).netloc.lower()
+        key = _public_key(url)
+        if key is not None and method.upper() == "GET":
+            found = bucket.get(key)
+            _count("http", host)
+            if found is None:
+                return 404, {}, b""
+            body, head = found
+            if head.get("ContentEncoding") == "gzip":
+                # What an HTTP client sees after transparent decompression
+                body = gzip.decompress(body)
+            headers = {"Content-Type": head.get("ContentType", "application/octet-stream"), "ETag": head.get("ETag")}
+            _count("http", host, "bytes", len(body))
+            return 200, headers, body
+        if recording:
+            return None
+        stored = http.load(method, url, req_body)
+        _count("http", host)
+        if stored is None:
+            _count("http", host, "misses")
+            logging.warning(f"Replay miss: {method} {url}")
+            return None
+        _count("http", host, "bytes", len(stored[2]))
+        return stored
+
+    def send(adapter, request, **kwargs):
+        req_body = _read_body(request.body) if request.body is not None else None
+        served = serve(request.method, request.url, req_body)
+        if served is not None:
+            return _build_response(request, *served)
+        if not recording:
+            raise requests.exceptions.ConnectionError(f"No replay fixture for {request.method} {request.url}")
+        response = original_send(adapter, request, **kwargs)
+        body = response.content
+        host = urlparse(request.url).netloc.lower()
+        _count("http", host)
+        _count("http", host, "bytes", len(body))
+        http.save(request.method, request.url, req_body, response.status_code, dict(response.headers), body)
+        return response
+
+    def urlopen(url, *args, **kwargs):
+        if isinstance(url, urllib.request.Request):
+            full_url, method, data = url.full_url, url.get_method(), url.data
+        else:
+            data = kwargs.get("data", args[0] if args else None)
+            full_url, method = url, "POST" if data is not None else "GET"
+        req_body = _read_body(data) if data is not None else None
+        served = serve(method, full_url, req_body)
+        if served is not None:
+            status, headers, body = served
+            if status >= 400:
+                raise urllib.error.HTTPError(full_url, status, "Not Found", Message(), io.BytesIO(body))
+            return _UrlopenResponse(full_url, status, headers, body)
+        if not recording:
+            raise urllib.error.URLError(f"No replay fixture for {method} {full_url}")
+        with original_urlopen(url, *args, **kwargs) as response:
+            body = response.read()
+            status = response.status
+            headers = dict(response.headers.items())
+        if headers.get("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        host = urlparse(full_url).netloc.lower()
+        _count("http", host)
+        _count("http", host, "bytes", len(body))
+        http.save(method, full_url, req_body, status, headers, body)
+        return _UrlopenResponse(full_url, status, headers, body)
+
+    def make_api_call(client, operation_name, api_params):
+        if client.meta.service_model.service_name != "s3":
+            return original_api_call(client, operation_name, api_params)
+        return handle_s3(bucket, operation_name, api_params,
+                         origin_list if recording and operation_name == "ListObjectsV2" else None)
+
+    HTTPAdapter.send = send
+    urllib.request.urlopen = urlopen
+    botocore.client.BaseClient._make_api_call = make_api_call
+    return bucket
+
+
+def _real_s3_client():
+    import boto3
+    profile = os.environ.get("AWS_PROFILE")
+    session = boto3.session.Session(profile_name=profile) if profile else boto3.session.Session()
+    return session.client("s3")
+
+
+def _write_json_at_exit(path: str, getter) -> None:
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(getter(), f)
+    except Exception as e:
+        logging.warning(f"Could not write {path}: {e}")
+
+
+def _freeze_time(fixtures_dir: str) -> None:
+    """Replay at the recording's date so date-based URLs match (needs freezegun)"""
+    try:
+        with open(os.path.join(fixtures_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            recorded_at = json.load(f).get("recorded_at")
+    except (OSError, ValueError):
+        return
+    if not recorded_at:
+        return
+    try:
+        from freezegun import freeze_time
+    except ImportError:
+        logging.warning("freezegun not installed; replaying at today's date (date-based URLs may miss)")
+        return
+    freeze_time(recorded_at, tick=True).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a pipeline script against recorded HTTP/S3 fixtures")
+    parser.add_argument("--mode", choices=["record", "replay"], required=True)
+    parser.add_argument("--fixtures", required=True, help="Fixture directory")
+    parser.add_argument("--bucket", required=True, help="Scratch directory for bucket writes")
+    parser.add_argument("script")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    install(args.mode, args.fixtures, args.bucket)
+    if args.mode == "replay":
+        _freeze_time(args.fixtures)
+
+    import telemetry
+
+    if os.environ.get("PIPELINE_TELEMETRY_FILE"):
+        atexit.register(telemetry.write_snapshot, os.environ["PIPELINE_TELEMETRY_FILE"])
+    if os.environ.get("PIPELINE_REPLAY_STATS"):
+        atexit.register(_write_json_at_exit, os.environ["PIPELINE_REPLAY_STATS"], get_stats)
+
+    sys.argv = [args.script] + args.script_args
+    runpy.run_path(args.script, run_name="__main__")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+Historical ledger of pipeline runs, and the summary command that reads it
+
+run_phase_scripts.py appends one JSON line per script per run to
+data/pipeline/run_ledger.jsonl. Each line holds:
+- wall time, CPU time and peak RSS
+- HTTP requests and bytes down/up per host
+- cache hits and misses
+- rows written per dataset
+- the script's outcome
+
+The file is committed with the rest of data/, so the history survives
+between CI runs.
+
+The summary compares each script's latest run with its median over earlier
+runs and flags regressions (by default 3x the wall time or 10x the bytes
+downloaded). It also shows which scripts use most of the pipeline time and
+which come closest to the per-script timeout.
+
+Usage:
+    python scripts/run_ledger.py [--runs 30] [--phase regular_season]
+"""
+
+import os
+import json
+import logging
+import argparse
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from phase_config import SCRIPT_TIMEOUT
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEDGER_PATH = os.path.join(BASE_DIR, "data", "pipeline", "run_ledger.jsonl")
+
+WALL_FACTOR = 3.0
+BYTES_FACTOR = 10.0
+# Ignore ratios on very small baselines (a 0.2 s script taking 0.7 s is noise)
+MIN_BASELINE_SECONDS = 5.0
+MIN_BASELINE_BYTES = 1_000_000
+BASELINE_RUNS = 20
+
+
+def ledger_record(run_id: str, phase: str, mode: str, script: str, result: dict) -> dict:
+    """Flatten one script's result and telemetry into a ledger line"""
+    t = result.get("telemetry") or {}
+    hosts = t.get("hosts", {})
+    return {
+        "run_id": run_id,
+        "phase": phase,
+        "mode": mode,
+        "script": os.path.basename(script),
+        "started_at": datetime.fromtimestamp(result["started_at"], timezone.utc).isoformat(),
+        "success": bool(result["success"]),
+        "timed_out": bool(result.get("timed_out", False)),
+        "wall_seconds": round(result["duration"], 2),
+        "cpu_seconds": t.get("cpu_seconds"),
+        "peak_rss_mb": t.get("peak_rss_mb"),
+        "http_requests": sum(h.get("requests", 0) for h in hosts.values()),
+        "bytes_down": sum(h.get("bytes_down", 0) for h in hosts.values()),
+        "bytes_up": sum(h.get("bytes_up", 0) for h in hosts.values()),
+        "cache_hit_ratio": t.get("cache_hit_ratio"),
+        "hosts": hosts,
+        "caches": t.get("caches", {}),
+        "rows": t.get("rows", {}),
+    }
+
+
+def append_run(records: List[dict], path: str = LEDGER_PATH) -> None:
+    """Append a run's records to the ledger"""
+    if not records:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":"), sort_keys=True) + "\n")
+    except OSError as e:
+        logging.warning(f"Could not append to run ledger {path}: {e}")
+
+
+def load_ledger(path: str = LEDGER_PATH) -> pd.DataFrame:
+    """All ledger lines as a DataFrame (empty if there is no ledger yet)"""
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df["started_at"] = pd.to_datetime(df["started_at"], utc=True)
+    return df
+
+
+def find_regressions(ledger: pd.DataFrame, run_id: Optional[str] = None,
+                     wall_factor: float = WALL_FACTOR, bytes_factor: float = BYTES_FACTOR,
+                     baseline_runs: int = BASELINE_RUNS) -> List[Dict]:
+    """
+    Scripts whose run `run_id` (default: the latest) regressed against
+    their median over the previous `baseline_runs` successful runs
+    """
+    if ledger.empty:
+        return []
+    run_id = run_id or ledger.sort_values("started_at")["run_id"].iloc[-1]
+    current = ledger[ledger["run_id"] == run_id]
+    history = ledger[(ledger["run_id"] != run_id) & ledger["success"]]
+
+    regressions = []
+    for _, row in current.iterrows():
+        past = history[history["script"] == row["script"]].sort_values("started_at").tail(baseline_runs)
+        if past.empty:
+            continue
+        checks = [
+            ("wall_seconds", wall_factor, MIN_BASELINE_SECONDS),
+            ("bytes_down", bytes_factor, MIN_BASELINE_BYTES),
+        ]
+        for metric, factor, floor in checks:
+            baseline = past[metric].median()
+            value = row[metric]
+            if pd.isna(baseline) or pd.isna(value):
+                continue
+            if max(baseline, floor) * factor <= value:
+                regressions.append({
+                    "script": row["script"],
+                    "metric": metric,
+                    "value": value,
+                    "baseline": baseline,
+                    "ratio": value / baseline if baseline else float("inf"),
+                })
+    return regressions
+
+
+def summarize(ledger: pd.DataFrame, runs: int = 30) -> pd.DataFrame:
+    """Per-script trend table over the most recent `runs` runs"""
+    recent_ids = ledger.sort_values("started_at")["run_id"].drop_duplicates().tail(runs)
+    recent = ledger[ledger["run_id"].isin(recent_ids)].sort_values("started_at")
+    grouped = recent.groupby("script")
+    summary = pd.DataFrame({
+        "runs": grouped.size(),
+        "failures": grouped["success"].apply(lambda s: int((~s.astype(bool)).sum())),
+        "timeouts": grouped["timed_out"].sum().astype(int),
+        "median_wall_s": grouped["wall_seconds"].median().round(1),
+        "p90_wall_s": grouped["wall_seconds"].quantile(0.9).round(1),
+        "last_wall_s": grouped["wall_seconds"].last().round(1),
+        "median_cpu_s": grouped["cpu_seconds"].median().round(1),
+        "max_rss_mb": grouped["peak_rss_mb"].max().round(0),
+        "median_requests": grouped["http_requests"].median(),
+        "median_mb_down": (grouped["bytes_down"].median() / 1e6).round(2),
+        "median_mb_up": (grouped["bytes_up"].median() / 1e6).round(2),
+        "cache_hit_ratio": grouped["cache_hit_ratio"].median().round(2),
+    })
+    total_wall = recent["wall_seconds"].sum()
+    summary["share_of_time"] = (grouped["wall_seconds"].sum() / total_wall).round(3) if total_wall else 0.0
+    summary["near_timeout"] = grouped["wall_seconds"].apply(lambda s: int((s >= 0.5 * SCRIPT_TIMEOUT).sum()))
+    return summary.sort_values("share_of_time", ascending=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize pipeline run telemetry")
+    parser.add_argument("--ledger", default=LEDGER_PATH, help="Ledger file (JSONL)")
+    parser.add_argument("--runs", type=int, default=30, help="Recent runs to summarize")
+    parser.add_argument("--phase", help="Only runs of this phase")
+    parser.add_argument("--wall-factor", type=float, default=WALL_FACTOR)
+    parser.add_argument("--bytes-factor", type=float, default=BYTES_FACTOR)
+    args = parser.parse_args()
+
+    ledger = load_ledger(args.ledger)
+    if args.phase and not ledger.empty:
+        ledger = ledger[ledger["phase"] == args.phase]
+    if ledger.empty:
+        print(f"No runs recorded in {args.ledger}")
+        return
+
+    run_ids = ledger["run_id"].drop_duplicates()
+    print(f"Run ledger: {args.ledger}")
+    print(f"{len(run_ids)} runs, {ledger['started_at'].min():%Y-%m-%d} to {ledger['started_at'].max():%Y-%m-%d}\n")
+
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.max_columns", None):
+        print(summarize(ledger, runs=args.runs).to_string())
+
+    print(f"\nTimeouts and near-timeouts (>= 50% of the {SCRIPT_TIMEOUT} s limit):")
+    slow = ledger[ledger["timed_out"] | (ledger["wall_seconds"] >= 0.5 * SCRIPT_TIMEOUT)]
+    if slow.empty:
+        print("  none")
+    else:
+        for script, count in slow["script"].value_counts().items():
+            print(f"  {script}: {count} runs")
+
+    regressions = find_regressions(ledger, wall_factor=args.wall_factor, bytes_factor=args.bytes_factor)
+    print("\nRegressions in the latest run:")
+    if not regressions:
+        print("  none")
+    for r in regressions:
+        print(f"  {r['script']}: {r['metric']} {r['value']:,.1f} vs median {r['baseline']:,.1f} ({r['ratio']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,52 +4,236 @@ Phase-aware script runner
 
 Detects current season phase and runs appropriate scripts.
 Used by GitHub Actions workflow to eliminate commented-out scripts.
+
+Scripts run as a dependency graph (phase_config.SCRIPT_DEPENDENCIES) on a
+pool of workers: a script starts as soon as the scripts it depends on have
+finished, as long as no rate-limited host it uses is already at its
+HOST_SCRIPT_LIMITS. At the end the critical path (the chain of dependent
+scripts that determined the total run time) is reported.
+
+With --in-process, scripts run on warm long-lived workers
+(script_worker.WorkerPool) instead of a fresh interpreter each.
+
+Usage:
+    python scripts/run_phase_scripts.py [phase] [--workers N] [--in-process]
 """
 
+import os
 import sys
+import json
+import time
+import uuid
+import argparse
+import tempfile
 import subprocess
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from season_phase import detect_season_phase
-from phase_config import get_scripts_for_phase, get_phase_description
+from phase_config import (
+    DEFAULT_WORKERS,
+    HOST_SCRIPT_LIMITS,
+    SCRIPT_TIMEOUT,
+    get_dependencies,
+    get_phase_description,
+    get_script_hosts,
+    get_scripts_for_phase,
+    topological_order,
+)
+from script_worker import WorkerPool
+import run_ledger
+
+PHASES = ["regular_season", "postseason", "offseason"]
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def _log_result(script_path, success, stdout, stderr):
+    if success:
+        logging.info(f"✅ Success: {script_path}")
+        # Log stdout if it contains useful info
+        if stdout and stdout.strip():
+            for line in stdout.strip().split('\n')[-10:]:  # Last 10 lines
+                if 'Fetching game' in line or 'Successfully fetched' in line or 'Uploaded combined' in line:
+                    logging.info(f"   {line}")
+    else:
+        logging.error(f"❌ Failed: {script_path}")
+        logging.error(f"   stderr: {stderr}")
+
+def _read_telemetry(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
 def run_script(script_path):
-    """Run a single Python script and return success/failure"""
+    """
+    Run a single Python script in its own interpreter
+
+    The script is started through telemetry.py, which reports its
+    counters back in a temporary file.
+
+    Returns:
+        dict with success, timed_out and telemetry
+    """
+    fd, telemetry_path = tempfile.mkstemp(prefix="telemetry_", suffix=".json")
+    os.close(fd)
     try:
         logging.info(f"Running: {script_path}")
         result = subprocess.run(
-            ["python", script_path],
+            ["python", os.path.join(SCRIPTS_DIR, "telemetry.py"), script_path],
             capture_output=True,
             text=True,
-            timeout=600  # 10 minute timeout per script
+            timeout=SCRIPT_TIMEOUT,
+            env={**os.environ, "PIPELINE_TELEMETRY_FILE": telemetry_path},
         )
-        
-        if result.returncode == 0:
-            logging.info(f"✅ Success: {script_path}")
-            # Log stdout if it contains useful info
-            if result.stdout and result.stdout.strip():
-                for line in result.stdout.strip().split('\n')[-10:]:  # Last 10 lines
-                    if 'Fetching game' in line or 'Successfully fetched' in line or 'Uploaded combined' in line:
-                        logging.info(f"   {line}")
-            return True
-        else:
-            logging.error(f"❌ Failed: {script_path}")
-            logging.error(f"   stderr: {result.stderr}")
-            return False
+        _log_result(script_path, result.returncode == 0, result.stdout, result.stderr)
+        return {"success": result.returncode == 0, "telemetry": _read_telemetry(telemetry_path)}
     except subprocess.TimeoutExpired:
         logging.error(f"⏱️  Timeout: {script_path}")
-        return False
+        _read_telemetry(telemetry_path)
+        return {"success": False, "timed_out": True}
+    except Exception as e:
+        logging.error(f"❌ Error running {script_path}: {e}")
+        _read_telemetry(telemetry_path)
+        return {"success": False}
+
+def run_script_in_process(pool, script_path):
+    """Run a script on a warm worker from a script_worker.WorkerPool (same result as run_script)"""
+    try:
+        logging.info(f"Running (in-process): {script_path}")
+        result = pool.run(script_path, timeout=SCRIPT_TIMEOUT)
+        if result.get("timed_out"):
+            logging.error(f"⏱️  Timeout: {script_path}")
+            return {"success": False, "timed_out": True}
+        _log_result(script_path, result["success"], result["stdout"], result["stderr"])
+        return {"success": result["success"], "telemetry": result.get("telemetry")}
     except Exception as e:
         logging.error(f"❌ Error running {script_path}: {e}")
-        return False
+        return {"success": False}
+
+def _timed_run(runner, script_path):
+    started_at = time.time()
+    start = time.monotonic()
+    result = runner(script_path)
+    result.update({"start": start, "started_at": started_at, "duration": time.monotonic() - start})
+    return result
 
-def main(override_phase=None):
+def _host_available(script, hosts_in_use):
+    return all(
+        hosts_in_use[host] < HOST_SCRIPT_LIMITS.get(host, float("inf"))
+        for host in get_script_hosts(script)
+    )
+
+def run_dag(scripts, max_workers=DEFAULT_WORKERS, runner=run_script):
+    """
+    Run scripts as a dependency graph on a worker pool
+
+    Among ready scripts, the earlier one in the phase list starts first.
+    A script whose dependency failed still runs (against the previous
+    run's outputs), as it did when scripts ran one after another.
+
+    Args:
+        scripts: Script paths in phase order
+        max_workers: Scripts to run at once
+        runner: Callable(script_path) -> {success, ...} that runs one script
+
+    Returns:
+        dict script -> {success, start, started_at, duration, timed_out, telemetry}
+    """
+    deps = get_dependencies(scripts)
+    pending = list(scripts)
+    running = {}
+    results = {}
+    hosts_in_use = Counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while pending or running:
+            for script in list(pending):
+                if len(running) >= max_workers:
+                    break
+                if any(d not in results for d in deps[script]):
+                    continue
+                if not _host_available(script, hosts_in_use):
+                    continue
+                failed = [d for d in deps[script] if not results[d]["success"]]
+                if failed:
+                    logging.warning(f"⚠️  {script} runs after failed dependencies: {', '.join(failed)}")
+                hosts_in_use.update(get_script_hosts(script))
+                pending.remove(script)
+                running[pool.submit(_timed_run, runner, script)] = script
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                script = running.pop(future)
+                results[script] = future.result()
+                hosts_in_use.subtract(get_script_hosts(script))
+    return results
+
+def critical_path(results, deps):
+    """
+    Longest chain of dependent scripts by measured duration
+
+    Returns:
+        (list of scripts in run order, total seconds)
+    """
+    finish = {}
+    previous = {}
+    for script in topological_order(list(results), deps):
+        before = max(deps.get(script, []), key=lambda d: finish[d], default=None)
+        finish[script] = results[script]["duration"] + (finish[before] if before else 0)
+        previous[script] = before
+    if not finish:
+        return [], 0.0
+    end = max(finish, key=finish.get)
+    path = []
+    while end:
+        path.append(end)
+        end = previous[end]
+    return path[::-1], finish[path[0]]
+
+def log_timing_report(results, deps, wall_time):
+    """Per-script durations, serial total and the critical path"""
+    serial = sum(r["duration"] for r in results.values())
+    path, path_time = critical_path(results, deps)
+    logging.info(f"\n{'='*60}")
+    logging.info("Timing")
+    logging.info(f"{'='*60}")
+    for script, r in sorted(results.items(), key=lambda kv: kv[1]["duration"], reverse=True):
+        logging.info(f"   {r['duration']:7.1f}s  {script}")
+    logging.info(f"Wall time: {wall_time:.1f}s (scripts sum to {serial:.1f}s)")
+    logging.info(f"Critical path ({path_time:.1f}s):")
+    for script in path:
+        logging.info(f"   {results[script]['duration']:7.1f}s  {script}")
+
+def record_run(results, phase, mode):
+    """Append this run to the run ledger and log any regressions"""
+    run_id = uuid.uuid4().hex[:12]
+    records = [run_ledger.ledger_record(run_id, phase, mode, script, r) for script, r in results.items()]
+    run_ledger.append_run(records)
+    try:
+        for r in run_ledger.find_regressions(run_ledger.load_ledger(), run_id=run_id):
+            logging.warning(
+                f"📈 Regression: {r['script']} {r['metric']} {r['value']:,.1f} "
+                f"vs median {r['baseline']:,.1f} ({r['ratio']:.1f}x)"
+            )
+    except Exception as e:
+        logging.warning(f"Could not check run ledger for regressions: {e}")
+
+def main(override_phase=None, max_workers=DEFAULT_WORKERS, in_process=False):
     """
     Main runner that detects phase and executes appropriate scripts
     
     Args:
         override_phase: Optional manual phase override ('regular_season', 'postseason', 'offseason')
+        max_workers: Scripts to run at once (1 runs them one at a time)
+        in_process: Run scripts on warm long-lived workers instead of a
+            fresh interpreter each
     """
     # Detect phase (or use override)
     if override_phase:
@@ -69,19 +253,22 @@ def main(override_phase=None):
     logging.info(f"{'='*60}")
     logging.info(f"Phase: {phase}")
     logging.info(f"Description: {description}")
-    logging.info(f"Scripts to run: {len(scripts)}")
+    logging.info(f"Scripts to run: {len(scripts)} ({max_workers} at a time, {'in-process' if in_process else 'subprocess'})")
     logging.info(f"{'='*60}\n")
     
     # Run scripts
-    success_count = 0
-    fail_count = 0
+    started = time.monotonic()
+    if in_process:
+        with WorkerPool(max_workers) as pool:
+            results = run_dag(scripts, max_workers=max_workers,
+                              runner=lambda script: run_script_in_process(pool, script))
+    else:
+        results = run_dag(scripts, max_workers=max_workers)
+    log_timing_report(results, get_dependencies(scripts), time.monotonic() - started)
+    record_run(results, phase, "in-process" if in_process else "subprocess")
     
-    for script in scripts:
-        success = run_script(script)
-        if success:
-            success_count += 1
-        else:
-            fail_count += 1
+    success_count = sum(r["success"] for r in results.values())
+    fail_count = len(results) - success_count
     
     # Summary
     logging.info(f"\n{'='*60}")
@@ -101,12 +288,12 @@ def main(override_phase=None):
 
 if __name__ == "__main__":
     # Allow phase override via command line
-    override = None
-    if len(sys.argv) > 1:
-        override = sys.argv[1]
-        if override not in ["regular_season", "postseason", "offseason"]:
-            print(f"Invalid phase: {override}")
-            print("Usage: python run_phase_scripts.py [regular_season|postseason|offseason]")
-            sys.exit(1)
+    parser = argparse.ArgumentParser(description="Run the scripts for the current season phase")
+    parser.add_argument("phase", nargs="?", choices=PHASES, help="Override the detected phase")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Scripts to run at once (default {DEFAULT_WORKERS}; 1 runs them in order)")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run scripts on warm long-lived worker processes instead of one interpreter each")
+    args = parser.parse_args()
     
-    main(override_phase=override)
+    main(override_phase=args.phase, max_workers=args.workers, in_process=args.in_process)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+"""
+League-wide MLB schedule, fetched once and queried locally
+
+Standings, the schedule tables, umpire and ABS collection and season phase
+detection all need slices of the same MLB schedule. This module downloads
+the full season (every team, every game type, February through November)
+from /api/v1/schedule and answers their queries from memory:
+
+    from schedule_service import query_games
+    games = query_games(2026, team_id=119, game_types=["R"], completed=True)
+
+The season is cached at data/cache/schedule/{season}.json.gz. For
+SCHEDULE_TTL_SECONDS the cached copy is used as is. After that, days on
+which every game is already final are kept and only the rest of the
+season, from the first unfinished day on, is requested again.
+
+Each loaded season is indexed by team and date, so queries by team, date
+range, game type or status don't walk the whole league. They return the
+raw StatsAPI game dicts (hydrated with team), sorted by date, so existing
+parsing code keeps working.
+"""
+
+import os
+import gzip
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Union
+
+import telemetry
+from fetch_engine import fetch_json
+
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache", "schedule")
+
+# How long a cached schedule is trusted before unfinished days are refetched
+SCHEDULE_TTL_SECONDS = 600
+
+# Spring training through the end of the World Series
+SEASON_START = "{season}-02-01"
+SEASON_END = "{season}-11-30"
+
+# "P" in a query stands for every postseason round, as it does for the API
+POSTSEASON_GAME_TYPES = {"F", "D", "L", "W"}
+
+_memo = {}
+_lock = threading.Lock()
+
+DateLike = Union[str, date, datetime]
+
+
+def is_completed(game: dict) -> bool:
+    """True for games that were played to a result (not postponed/cancelled)"""
+    status = game.get("status", {})
+    return (
+        status.get("abstractGameState") == "Final"
+        and status.get("detailedState", "") not in ("Postponed", "Cancelled")
+    )
+
+
+def _day_is_final(day: dict) -> bool:
+    return all(g.get("status", {}).get("abstractGameState") == "Final" for g in day.get("games", []))
+
+
+def _cache_path(season: int) -> str:
+    return os.path.join(CACHE_DIR, f"{int(season)}.json.gz")
+
+
+def _read_cache(season: int) -> Optional[dict]:
+    path = _cache_path(season)
+    if not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"Discarding unreadable schedule cache {path}: {e}")
+        return None
+
+
+def _write_cache(season: int, cached: dict) -> None:
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _cache_path(season)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(cached, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.warning(f"Could not cache {season} schedule: {e}")
+
+
+def _fetch_dates(start_date: str, end_date: str) -> Optional[list]:
+    params = {
+        "sportId": 1,
+        "startDate": start_date,
+        "endDate": end_date,
+        "hydrate": "team",
+    }
+    payload = fetch_json(SCHEDULE_URL, params=params, timeout=60)
+    return None if payload is None else payload.get("dates", [])
+
+
+def _refresh(season: int, cached: Optional[dict]) -> dict:
+    start = SEASON_START.format(season=season)
+    end = SEASON_END.format(season=season)
+    days = cached.get("dates", []) if cached else []
+
+    # Keep the leading run of fully final days; refetch from the first open one
+    keep = []
+    for day in days:
+        if not _day_is_final(day):
+            break
+        keep.append(day)
+    today = date.today().isoformat()
+    fetch_from = start
+    if keep and len(keep) < len(days):
+        fetch_from = min(days[len(keep)]["date"], today)
+    elif keep:
+        # Every cached day is final; only days after the last one can change
+        fetch_from = min(keep[-1]["date"], today)
+        keep = keep[:-1]
+    keep = [d for d in keep if d["date"] < fetch_from]
+
+    fetched = _fetch_dates(max(fetch_from, start), end)
+    if fetched is None:
+        if cached:
+            logging.warning(f"Schedule refresh failed for {season}; using cached copy")
+            return cached
+        raise RuntimeError(f"Failed to fetch {season} MLB schedule")
+
+    logging.info(f"Fetched {season} schedule from {fetch_from} ({len(fetched)} days, {len(keep)} cached final days kept)")
+    refreshed = {"season": season, "fetched_at": time.time(), "dates": keep + fetched}
+    _write_cache(season, refreshed)
+    return refreshed
+
+
+def load_schedule(season: int, refresh: bool = False) -> List[dict]:
+    """
+    Return the season's schedule as StatsAPI `dates` entries ({date, games})
+
+    Args:
+        season: MLB season
+        refresh: Ignore the TTL and refetch unfinished days now
+    """
+    return _load(int(season), refresh)["dates"]
+
+
+def _load(season: int, refresh: bool = False) -> dict:
+    with _lock:
+        if season in _memo and not refresh:
+            return _memo[season]
+
+        cached = _read_cache(season)
+        fresh = cached and time.time() - cached.get("fetched_at", 0) < SCHEDULE_TTL_SECONDS
+        telemetry.record_cache("schedule", hit=bool(fresh and not refresh))
+        if not fresh or refresh:
+            cached = _refresh(season, cached)
+        _memo[season] = {"dates": cached["dates"], "index": _build_index(cached["dates"])}
+        return _memo[season]
+
+
+def _build_index(days: List[dict]) -> dict:
+    """Date-sorted (dates, games) lists for the whole league and for each team"""
+    rows = sorted(
+        ((day["date"], game) for day in days for game in day.get("games", [])),
+        key=lambda row: row[0],
+    )
+    by_team = {}
+    for row in rows:
+        teams = row[1].get("teams", {})
+        for side in ("home", "away"):
+            team_id = teams.get(side, {}).get("team", {}).get("id")
+            if team_id is not None:
+                by_team.setdefault(team_id, []).append(row)
+
+    def split(team_rows):
+        return [r[0] for r in team_rows], [r[1] for r in team_rows]
+
+    return {"all": split(rows), "by_team": {team_id: split(r) for team_id, r in by_team.items()}}
+
+
+def _as_iso(value: Optional[DateLike]) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+def query_games(season: Optional[int] = None, team_id: Optional[int] = None,
+                start_date: Optional[DateLike] = None, end_date: Optional[DateLike] = None,
+                game_types: Optional[Iterable[str]] = None, completed: Optional[bool] = None,
+                statuses: Optional[Iterable[str]] = None) -> List[dict]:
+    """
+    Games matching every filter given, in date order
+
+    Args:
+        season: Season to search; defaults to the seasons spanned by the dates
+        team_id: Only games this team plays in (home or away)
+        start_date, end_date: Inclusive local (official) date range
+        game_types: e.g. ["R"], or ["P"] for any postseason round
+        completed: True for games played to a result, False for the rest
+        statuses: Allowed status.detailedState values
+    """
+    start_iso, end_iso = _as_iso(start_date), _as_iso(end_date)
+    if season is not None:
+        seasons = [int(season)]
+    else:
+        first = int((start_iso or end_iso or date.today().isoformat())[:4])
+        last = int((end_iso or start_iso or date.today().isoformat())[:4])
+        seasons = list(range(first, last + 1))
+    if game_types:
+        game_types = set(game_types)
+        if "P" in game_types:
+            game_types |= POSTSEASON_GAME_TYPES
+    else:
+        game_types = None
+    statuses = set(statuses) if statuses else None
+
+    games = []
+    for s in seasons:
+        index = _load(s)["index"]
+        dates, day_games = index["all"] if team_id is None else index["by_team"].get(team_id, ([], []))
+        lo = bisect_left(dates, start_iso) if start_iso else 0
+        hi = bisect_right(dates, end_iso) if end_iso else len(dates)
+        for game in day_games[lo:hi]:
+            if game_types is not None and game.get("gameType") not in game_types:
+                continue
+            if completed is not None and is_completed(game) != completed:
+                continue
+            if statuses is not None and game.get("status", {}).get("detailedState") not in statuses:
+                continue
+            games.append(game)
+    return games
+
+
+def game_pks(**filters) -> List[int]:
+    """Unique gamePks from query_games(**filters), first occurrence order"""
+    seen = {}
+    for game in query_games(**filters):
+        if game.get("gamePk") is not None:
+            seen.setdefault(int(game["gamePk"]), None)
+    return list(seen)
+
+
+if __name__ == "__main__":
+    season = date.today().year
+    days = load_schedule(season)
+    games = [g for d in days for g in d.get("games", [])]
+    final_days = sum(_day_is_final(d) for d in days)
+    print(f"{season} schedule: {len(days)} days ({final_days} final), {len(games)} games")
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+"""
+Long-lived worker processes for running pipeline scripts in-process
+
+Starting `python script.py` for every script means importing pandas,
+pyarrow, boto3 and bs4 again each time and rebuilding HTTP sessions and S3
+clients. A WorkerPool instead keeps a few worker processes alive. Each one
+imports the heavy libraries and the shared modules (http_client, publisher,
+schedule_service, ...) once, then runs scripts one after another with
+runpy, as `__main__`, so a script's `if __name__ == "__main__": main()`
+block (or plain top-level code) runs just as it would from the command
+line. Pooled HTTP sessions, cached S3 clients and in-memory caches carry
+over from one script to the next in the same worker.
+
+Each script is still isolated:
+- exceptions and sys.exit() are caught and reported as a failure/exit code
+- stdout/stderr (including logging) are captured per script
+- cwd and sys.argv are restored afterwards
+- a script that exceeds its timeout, or kills its process, gets its worker
+  terminated and replaced
+- telemetry counters are reset before and snapshotted after each script
+- dataset_registry sources are revalidated by each script that reads them
+
+Usage:
+    with WorkerPool(4) as pool:
+        result = pool.run("scripts/13_fetch_process_schedule.py", timeout=600)
+"""
+
+import gc
+import io
+import os
+import sys
+import queue
+import runpy
+import logging
+import traceback
+import importlib
+import multiprocessing
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Imported once per worker before any script runs
+PRELOAD_MODULES = [
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "pyarrow.parquet",
+    "boto3",
+    "requests",
+    "bs4",
+    "http_client",
+    "fetch_engine",
+    "publisher",
+    "schedule_service",
+    "boxscores_archive",
+    "pitch_store",
+    "dataset_registry",
+    "archive_cache",
+    "telemetry",
+]
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+class _CurrentStderrHandler(logging.StreamHandler):
+    """StreamHandler that writes to whatever sys.stderr is at emit time"""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _setup_worker() -> None:
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    # Scripts' own logging.basicConfig() calls become no-ops; their records
+    # land in the per-script captured stderr instead
+    handler = _CurrentStderrHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO)
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def _exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_in_this_process(script_path: str) -> dict:
+    """
+    Run a script as __main__ in the current process
+
+    Returns:
+        dict with success, exit_code, stdout, stderr and telemetry (see
+        telemetry.snapshot)
+    """
+    import telemetry
+
+    telemetry.reset()
+    registry = sys.modules.get("dataset_registry")
+    if registry is not None:
+        registry.clear()
+    stdout, stderr = io.StringIO(), io.StringIO()
+    cwd, argv = os.getcwd(), sys.argv
+    sys.argv = [script_path]
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                runpy.run_path(script_path, run_name="__main__")
+                exit_code = 0
+            except SystemExit as e:
+                exit_code = _exit_code(e.code)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        os.chdir(cwd)
+        sys.argv = argv
+        pyplot = sys.modules.get("matplotlib.pyplot")
+        if pyplot is not None:
+            pyplot.close("all")
+        gc.collect()
+    return {
+        "success": exit_code == 0,
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "telemetry": telemetry.snapshot(),
+    }
+
+
+def _worker_main(conn) -> None:
+    _setup_worker()
+    while True:
+        try:
+            script_path = conn.recv()
+        except EOFError:
+            break
+        if script_path is None:
+            break
+        conn.send(run_in_this_process(script_path))
+
+
+class Worker:
+    """One long-lived worker process and its pipe"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def run(self, script_path: str, timeout: float) -> Optional[dict]:
+        """Result dict, or None if the script did not finish within timeout"""
+        self.conn.send(script_path)
+        if not self.conn.poll(timeout):
+            return None
+        return self.conn.recv()
+
+    def kill(self) -> None:
+        self.process.terminate()
+        self.process.join(5)
+        self.conn.close()
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    A fixed number of warm workers shared by the runner's threads
+
+    run() blocks until a worker is free, so the pool size caps how many
+    scripts run at once.
+    """
+
+    def __init__(self, size: int):
+        # spawn: the runner's threads make fork unsafe, and workers should
+        # not inherit the parent's sockets
+        self.context = multiprocessing.get_context("spawn")
+        self.workers = [Worker(self.context) for _ in range(max(1, size))]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+
+    def _replace(self, worker: Worker) -> Worker:
+        worker.kill()
+        replacement = Worker(self.context)
+        self.workers[self.workers.index(worker)] = replacement
+        return replacement
+
+    def run(self, script_path: str, timeout: float) -> dict:
+        """
+        Run a script on the next free worker
+
+        Returns:
+            dict with success, exit_code, stdout, stderr, plus timed_out
+            when the script was stopped for exceeding timeout
+        """
+        worker = self.idle.get()
+        try:
+            result = worker.run(script_path, timeout)
+            if result is None:
+                worker = self._replace(worker)
+                return {"success": False, "exit_code": None, "stdout": "", "stderr": "", "timed_out": True}
+            return result
+        except (EOFError, OSError) as e:
+            exit_code = worker.process.exitcode
+            worker = self._replace(worker)
+            return {"success": False, "exit_code": exit_code, "stdout": "",
+                    "stderr": f"Worker process exited while running {script_path}: {e!r}"}
+        finally:
+            self.idle.put(worker)
+
+    def close(self) -> None:
+        for worker in self.workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
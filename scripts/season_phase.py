@@ -10,10 +10,12 @@ Queries MLB StatsAPI to determine the current season phase:
 This replaces the simple date-based heuristic with real schedule data.
 """
 
-import requests
+import http_client
 from datetime import datetime, timedelta
 import logging
 
+from schedule_service import query_games
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 DODGERS_TEAM_ID = 119
@@ -21,7 +23,7 @@ BASE_URL = "https://statsapi.mlb.com/api/v1"
 
 def get_dodgers_schedule(start_date, end_date, game_type=None):
     """
-    Fetch Dodgers schedule from MLB StatsAPI
+    Dodgers games in a date range, from the shared league-wide schedule
     
     Args:
         start_date: datetime object for start of range
@@ -31,29 +33,13 @@ def get_dodgers_schedule(start_date, end_date, game_type=None):
     Returns:
         List of game dictionaries
     """
-    url = f"{BASE_URL}/schedule"
-    params = {
-        "sportId": 1,
-        "teamId": DODGERS_TEAM_ID,
-        "startDate": start_date.strftime("%Y-%m-%d"),
-        "endDate": end_date.strftime("%Y-%m-%d"),
-        "hydrate": "team,linescore"
-    }
-    
-    if game_type:
-        params["gameType"] = game_type
-    
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        games = []
-        for date_entry in data.get("dates", []):
-            for game in date_entry.get("games", []):
-                games.append(game)
-        
-        return games
+        return query_games(
+            team_id=DODGERS_TEAM_ID,
+            start_date=start_date,
+            end_date=end_date,
+            game_types=[game_type] if game_type else None,
+        )
     except Exception as e:
         logging.error(f"Failed to fetch schedule: {e}")
         return []
@@ -130,7 +116,7 @@ def get_postseason_series_status():
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Per-script performance counters for the pipeline
+
+The shared modules report what they do here:
+- cache lookups: record_cache("schedule", hit=True)
+- rows written per dataset: record_rows("dodgers/data/standings/dodgers_schedule", 162)
+- S3 traffic, through instrument_s3(client) on the cached publisher client
+
+snapshot() combines these with http_client's per-host request counters,
+CPU time and peak RSS into one JSON-serializable dict, which
+run_phase_scripts.py stores in the run ledger (see run_ledger.py).
+
+Scripts run by the phase runner get this for free:
+- in-process workers call reset() before and snapshot() after each script
+- subprocess runs go through `python scripts/telemetry.py <script>`, which
+  runs the script as __main__ and writes a snapshot to $PIPELINE_TELEMETRY_FILE
+  at exit
+"""
+
+import os
+import sys
+import json
+import time
+import runpy
+import atexit
+import logging
+import resource
+import threading
+from typing import Optional
+
+S3_HOST = "s3.amazonaws.com"
+
+_lock = threading.Lock()
+_caches = {}
+_rows = {}
+_transfers = {}
+_cpu_start = time.process_time()
+
+
+def record_cache(name: str, hit: bool, count: int = 1) -> None:
+    """Count lookups in a named cache"""
+    with _lock:
+        c = _caches.setdefault(name, {"hits": 0, "misses": 0})
+        c["hits" if hit else "misses"] += int(count)
+
+
+def record_rows(dataset: str, rows: int) -> None:
+    """Rows written to a dataset (latest write wins)"""
+    with _lock:
+        _rows[dataset] = int(rows)
+
+
+def record_transfer(host: str, downloaded: int = 0, uploaded: int = 0) -> None:
+    """Traffic that doesn't go through http_client (e.g. S3 via boto3)"""
+    with _lock:
+        t = _transfers.setdefault(host, {"requests": 0, "bytes_down": 0, "bytes_up": 0})
+        t["requests"] += 1
+        t["bytes_down"] += int(downloaded or 0)
+        t["bytes_up"] += int(uploaded or 0)
+
+
+def instrument_s3(client) -> None:
+    """Count requests and bytes for every call made with a boto3 S3 client"""
+
+    def before_send(request, **kwargs):
+        try:
+            uploaded = int(request.headers.get("Content-Length") or 0)
+        except (TypeError, ValueError):
+            uploaded = 0
+        # Requests are counted here; response bytes are added after the call
+        record_transfer(S3_HOST, uploaded=uploaded)
+
+    def after_call(http_response, parsed, model, **kwargs):
+        if model.has_streaming_output:
+            downloaded = parsed.get("ContentLength") or 0
+        else:
+            downloaded = len(getattr(http_response, "content", b"") or b"")
+        with _lock:
+            _transfers.setdefault(S3_HOST, {"requests": 0, "bytes_down": 0, "bytes_up": 0})["bytes_down"] += int(downloaded)
+
+    client.meta.events.register("before-send.s3", before_send)
+    client.meta.events.register("after-call.s3", after_call)
+
+
+def _reset_peak_rss() -> None:
+    # Linux only: writing 5 to clear_refs resets VmHWM (peak RSS)
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def reset() -> None:
+    """Start counting from zero (used between scripts in one process)"""
+    global _cpu_start
+    import http_client
+
+    with _lock:
+        _caches.clear()
+        _rows.clear()
+        _transfers.clear()
+    http_client.reset_stats()
+    _reset_peak_rss()
+    _cpu_start = time.process_time()
+
+
+def snapshot() -> dict:
+    """
+    Counters since the last reset() (or process start)
+
+    Returns:
+        dict with cpu_seconds, peak_rss_mb, hosts (host -> requests,
+        errors, not_modified, bytes_down, bytes_up), caches (name -> hits,
+        misses), cache_hit_ratio and rows (dataset -> rows written)
+    """
+    import http_client
+
+    hosts = {}
+    for host, s in http_client.get_stats().items():
+        hosts[host] = {
+            "requests": s["requests"],
+            "errors": s["errors"],
+            "not_modified": s["not_modified"],
+            "bytes_down": s["bytes"],
+            "bytes_up": 0,
+        }
+    with _lock:
+        for host, t in _transfers.items():
+            h = hosts.setdefault(host, {"requests": 0, "errors": 0, "not_modified": 0, "bytes_down": 0, "bytes_up": 0})
+            for field in ("requests", "bytes_down", "bytes_up"):
+                h[field] += t[field]
+        caches = {name: dict(c) for name, c in _caches.items()}
+        rows = dict(_rows)
+
+    hits = sum(c["hits"] for c in caches.values())
+    lookups = hits + sum(c["misses"] for c in caches.values())
+    return {
+        "cpu_seconds": round(time.process_time() - _cpu_start, 3),
+        "peak_rss_mb": round(_peak_rss_mb() or 0, 1),
+        "hosts": hosts,
+        "caches": caches,
+        "cache_hit_ratio": round(hits / lookups, 3) if lookups else None,
+        "rows": rows,
+    }
+
+
+def write_snapshot(path: str) -> None:
+    """Write snapshot() as JSON (registered at exit by the wrappers)"""
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot(), f)
+    except Exception as e:
+        logging.warning(f"Could not write telemetry to {path}: {e}")
+
+
+if __name__ == "__main__":
+    # python scripts/telemetry.py <script> [args...]
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/telemetry.py <script> [args...]")
+        sys.exit(2)
+    telemetry_file = os.environ.get("PIPELINE_TELEMETRY_FILE")
+    if telemetry_file:
+        atexit.register(write_snapshot, telemetry_file)
+    # Make counters recorded by the script's imports land in this module,
+    # not in a second copy loaded under the name "telemetry"
+    sys.modules["telemetry"] = sys.modules[__name__]
+    sys.argv = sys.argv[1:]
+    runpy.run_path(sys.argv[0], run_name="__main__")